@@ -0,0 +1,276 @@
+"""Throughput/latency benchmarks for the ping clients against a local stub server.
+
+    python benchmarks/run.py --requests 2000 --latency-ms 1 --output results.json
+
+Each mode sends ``--requests`` pings to ``benchmarks/stub_server.py`` (started as a subprocess so
+its CPU time is not charged to the client) and reports requests/sec, p50/p99 latency, client CPU
+per ping and tracemalloc allocation figures. Output is JSON with stable keys so runs from two
+releases can be diffed directly.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from time import perf_counter_ns
+from typing import Any, Callable, Dict, List, Optional
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), "src"))
+
+from cronbeats_python import ApiError, AsyncPingClient, PingClient  # noqa: E402
+from cronbeats_python.async_http import AsyncioHttpClient  # noqa: E402
+from cronbeats_python.http import PooledHttpClient, UrllibHttpClient  # noqa: E402
+
+JOB_KEY = "bench001"
+MODES = ("sync", "pooled", "async", "background")
+
+
+def start_server(latency_ms: float, jitter_ms: float, error_rate: float) -> "tuple[subprocess.Popen, str]":
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            os.path.join(HERE, "stub_server.py"),
+            "--latency-ms",
+            str(latency_ms),
+            "--jitter-ms",
+            str(jitter_ms),
+            "--error-rate",
+            str(error_rate),
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    line = process.stdout.readline() if process.stdout else ""
+    if not line.startswith("listening "):
+        process.kill()
+        raise RuntimeError("stub server failed to start")
+    return process, "http://" + line.split(" ", 1)[1].strip()
+
+
+def client_options(base_url: str, args: argparse.Namespace, **extra: Any) -> Dict[str, Any]:
+    # Limiter, breaker and retry budget are disabled so the numbers reflect the request path itself.
+    return {
+        "base_url": base_url,
+        "max_retries": args.max_retries,
+        "retry_backoff_ms": 0,
+        "retry_jitter_ms": 0,
+        "rate_limiter": None,
+        "circuit_breaker": None,
+        "retry_budget": None,
+        **extra,
+    }
+
+
+def percentile(sorted_ns: List[int], p: float) -> float:
+    if not sorted_ns:
+        return 0.0
+    index = min(len(sorted_ns) - 1, max(0, int(round(p / 100.0 * len(sorted_ns))) - 1))
+    return sorted_ns[index] / 1e6
+
+
+def summarize(latencies: List[int], errors: int, wall_s: float, cpu_s: float) -> Dict[str, Any]:
+    latencies.sort()
+    count = len(latencies)
+    return {
+        "requests": count,
+        "errors": errors,
+        "wall_s": round(wall_s, 4),
+        "requests_per_s": round(count / wall_s, 1) if wall_s else 0.0,
+        "p50_ms": round(percentile(latencies, 50), 4),
+        "p99_ms": round(percentile(latencies, 99), 4),
+        "cpu_us_per_ping": round(cpu_s / count * 1e6, 2) if count else 0.0,
+    }
+
+
+def run_sync(client: PingClient, count: int, finish: Optional[Callable[[], Any]] = None) -> Dict[str, Any]:
+    latencies: List[int] = []
+    errors = 0
+    cpu_started = time.process_time()
+    wall_started = time.perf_counter()
+    for _ in range(count):
+        started = perf_counter_ns()
+        try:
+            client.ping()
+        except ApiError:
+            errors += 1
+        latencies.append(perf_counter_ns() - started)
+    if finish is not None:
+        finish()
+    return summarize(latencies, errors, time.perf_counter() - wall_started, time.process_time() - cpu_started)
+
+
+async def run_async(client: AsyncPingClient, count: int, concurrency: int) -> Dict[str, Any]:
+    latencies: List[int] = []
+    errors = 0
+    remaining = count
+
+    async def worker() -> None:
+        nonlocal errors, remaining
+        while remaining > 0:
+            remaining -= 1
+            started = perf_counter_ns()
+            try:
+                await client.ping()
+            except ApiError:
+                errors += 1
+            latencies.append(perf_counter_ns() - started)
+
+    cpu_started = time.process_time()
+    wall_started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - wall_started, time.process_time() - cpu_started)
+
+
+def measure_allocations(
+    send: Callable[[], Any], count: int, finish: Optional[Callable[[], Any]] = None
+) -> Dict[str, Any]:
+    send()  # warm caches and connections outside the traced window
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for _ in range(count):
+            try:
+                send()
+            except ApiError:
+                pass
+        if finish is not None:
+            finish()
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        "alloc_peak_kib": round((peak - baseline) / 1024.0, 2),
+        "retained_bytes_per_ping": round((current - baseline) / count, 1),
+    }
+
+
+def bench_mode(mode: str, base_url: str, args: argparse.Namespace) -> Dict[str, Any]:
+    if mode == "async":
+        transport = AsyncioHttpClient()
+        client = AsyncPingClient(JOB_KEY, client_options(base_url, args, http_client=transport))
+
+        async def session() -> Dict[str, Any]:
+            for _ in range(args.warmup):
+                try:
+                    await client.ping()
+                except ApiError:
+                    pass
+            result = await run_async(client, args.requests, args.concurrency)
+
+            async def one() -> None:
+                try:
+                    await client.ping()
+                except ApiError:
+                    pass
+
+            # tracemalloc pass: await sequentially inside the loop to keep the sample comparable.
+            tracemalloc.start()
+            try:
+                baseline, _ = tracemalloc.get_traced_memory()
+                tracemalloc.reset_peak()
+                for _ in range(args.alloc_requests):
+                    await one()
+                current, peak = tracemalloc.get_traced_memory()
+            finally:
+                tracemalloc.stop()
+            result["alloc_peak_kib"] = round((peak - baseline) / 1024.0, 2)
+            result["retained_bytes_per_ping"] = round((current - baseline) / args.alloc_requests, 1)
+            await transport.aclose()
+            return result
+
+        return asyncio.run(session())
+
+    if mode == "sync":
+        client = PingClient(JOB_KEY, client_options(base_url, args, http_client=UrllibHttpClient()))
+    elif mode == "pooled":
+        client = PingClient(JOB_KEY, client_options(base_url, args, http_client=PooledHttpClient()))
+    else:
+        client = PingClient(
+            JOB_KEY,
+            client_options(
+                base_url, args, http_client=PooledHttpClient(), background=True, queue_size=args.requests + 1
+            ),
+        )
+
+    for _ in range(args.warmup):
+        try:
+            client.ping()
+        except ApiError:
+            pass
+    client.flush()
+    # For background mode latency is the enqueue cost; wall time includes draining the queue.
+    failed_before = client.sender.failed if client.sender is not None else 0
+    result = run_sync(client, args.requests, finish=client.flush)
+    if client.sender is not None:
+        result["errors"] = client.sender.failed - failed_before
+    result.update(measure_allocations(client.ping, args.alloc_requests, finish=client.flush))
+    client.close()
+    if isinstance(client.http_client, PooledHttpClient):
+        client.http_client.close()
+    return result
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the CronBeats ping clients.")
+    parser.add_argument("--modes", default=",".join(MODES), help="comma-separated subset of " + ", ".join(MODES))
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--warmup", type=int, default=50)
+    parser.add_argument("--alloc-requests", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=16, help="in-flight requests for async mode")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="server-side delay per request")
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with 503")
+    parser.add_argument("--max-retries", type=int, default=0)
+    parser.add_argument("--base-url", help="benchmark an already running server instead of spawning one")
+    parser.add_argument("--output", help="write JSON results to this file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    modes = [mode.strip() for mode in args.modes.split(",") if mode.strip()]
+    unknown = [mode for mode in modes if mode not in MODES]
+    if unknown:
+        parser.error(f"unknown modes: {', '.join(unknown)}")
+
+    process = None
+    base_url = args.base_url
+    if base_url is None:
+        process, base_url = start_server(args.latency_ms, args.jitter_ms, args.error_rate)
+    try:
+        results = {mode: bench_mode(mode, base_url, args) for mode in modes}
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "config": {
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "latency_ms": args.latency_ms,
+            "jitter_ms": args.jitter_ms,
+            "error_rate": args.error_rate,
+            "max_retries": args.max_retries,
+        },
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
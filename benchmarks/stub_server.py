@@ -0,0 +1,115 @@
+"""Local stand-in for the CronBeats ping API used by the benchmarks.
+
+Speaks just enough HTTP/1.1 (keep-alive, Content-Length bodies) to answer
+``POST /ping/{key}[/start|/end/{status}|/progress[/{seq}]]`` like the real service.
+
+    python benchmarks/stub_server.py --port 8765 --latency-ms 2 --error-rate 0.01
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import random
+import re
+import sys
+import time
+from typing import Optional, Tuple
+
+_PATH_RE = re.compile(r"^/ping/([A-Za-z0-9]{8})(?:/(start|end/(?:success|fail)|progress(?:/\d+)?))?$")
+
+
+class StubServer:
+    def __init__(self, latency_ms: float = 0.0, jitter_ms: float = 0.0, error_rate: float = 0.0) -> None:
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.requests = 0
+
+    def respond(self, method: str, path: str) -> Tuple[int, bytes]:
+        match = _PATH_RE.match(path)
+        if method != "POST" or match is None:
+            return 404, b'{"status":"error","message":"Not found"}'
+        if self.error_rate and random.random() < self.error_rate:
+            return 503, b'{"status":"error","message":"Service unavailable"}'
+        action = (match.group(2) or "ping").split("/", 1)[0]
+        payload = {
+            "status": "success",
+            "message": "OK",
+            "action": action,
+            "job_key": match.group(1),
+            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "processing_time_ms": 0.4,
+        }
+        return 200, json.dumps(payload).encode()
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                length = 0
+                keep_alive = True
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    name = name.strip().lower()
+                    if name == "content-length":
+                        length = int(value.strip() or 0)
+                    elif name == "connection" and value.strip().lower() == "close":
+                        keep_alive = False
+                if length:
+                    await reader.readexactly(length)
+                self.requests += 1
+
+                delay = self.latency_ms + (random.uniform(0, self.jitter_ms) if self.jitter_ms else 0.0)
+                if delay > 0:
+                    await asyncio.sleep(delay / 1000.0)
+                status, body = self.respond(method, path)
+                reason = {200: "OK", 404: "Not Found", 503: "Service Unavailable"}[status]
+                head = (
+                    f"HTTP/1.1 {status} {reason}\r\n"
+                    "Content-Type: application/json\r\n"
+                    f"Content-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+                )
+                writer.write(head.encode("latin-1") + body)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host: str, port: int, server: StubServer) -> None:
+    listener = await asyncio.start_server(server.handle, host, port, backlog=1024)
+    bound_port = listener.sockets[0].getsockname()[1]
+    print(f"listening {host}:{bound_port}", flush=True)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main(argv: Optional[list] = None) -> int:
+    parser = argparse.ArgumentParser(description="Local stub of the CronBeats ping API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    args = parser.parse_args(argv)
+    server = StubServer(args.latency_ms, args.jitter_ms, args.error_rate)
+    try:
+        asyncio.run(serve(args.host, args.port, server))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,91 @@
+"""Per-item overhead of ``client.track()`` compared with a bare loop.
+
+    python benchmarks/track.py --items 5000000 --output track.json
+
+No server is involved: progress updates go to an in-memory transport, and with the default
+``--every-ms`` only a handful are sent, so the figure is the tracker's own per-item cost.
+The target is under 100 ns per item.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import sys
+from time import perf_counter_ns
+from typing import Any, Dict, Iterable, List, Optional
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(HERE), "src"))
+
+from cronbeats_python import PingClient  # noqa: E402
+from cronbeats_python.http import HttpResponse  # noqa: E402
+
+JOB_KEY = "bench001"
+TARGET_NS = 100.0
+
+
+class NullHttpClient:
+    def __init__(self) -> None:
+        self.requests = 0
+
+    def request(self, method: str, url: str, headers: Dict[str, str], body: Any, timeout_ms: int) -> HttpResponse:
+        self.requests += 1
+        return HttpResponse(status=200, body=b"{}", headers={})
+
+
+def loop_ns(iterable: Iterable[Any]) -> int:
+    started = perf_counter_ns()
+    for _ in iterable:
+        pass
+    return perf_counter_ns() - started
+
+
+def best_of(repeat: int, make: Any) -> int:
+    return min(loop_ns(make()) for _ in range(repeat))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark client.track() per-item overhead.")
+    parser.add_argument("--items", type=int, default=2_000_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--every-ms", type=int, default=1000)
+    parser.add_argument("--output", help="write JSON results to this file (default: stdout)")
+    args = parser.parse_args(argv)
+
+    transport = NullHttpClient()
+    client = PingClient(JOB_KEY, {"http_client": transport})
+    data = range(args.items)
+
+    bare = best_of(args.repeat, lambda: data)
+    sized = best_of(args.repeat, lambda: client.track(data, every_ms=args.every_ms))
+    unsized = best_of(args.repeat, lambda: client.track(iter(data), every_ms=args.every_ms))
+    results = {
+        "bare_ns_per_item": round(bare / args.items, 2),
+        "track_overhead_ns_per_item": round((sized - bare) / args.items, 2),
+        "track_unsized_overhead_ns_per_item": round((unsized - bare) / args.items, 2),
+        "progress_requests": transport.requests,
+    }
+    results["within_target"] = max(
+        results["track_overhead_ns_per_item"], results["track_unsized_overhead_ns_per_item"]
+    ) < TARGET_NS
+
+    report = {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "config": {"items": args.items, "repeat": args.repeat, "every_ms": args.every_ms, "target_ns": TARGET_NS},
+        "results": results,
+    }
+    text = json.dumps(report, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as handle:
+            handle.write(text + "\n")
+    else:
+        print(text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,47 @@
-from .client import PingClient
+from typing import TYPE_CHECKING, Any
+
 from .errors import ApiError, SdkError, ValidationError
 
-__all__ = ["PingClient", "ApiError", "SdkError", "ValidationError"]
+if TYPE_CHECKING:
+    from .async_client import AsyncPingClient
+    from .client import PingClient
+    from .heartbeat import HeartbeatScheduler
+    from .monitor import monitor
+    from .registry import PingRegistry, bulk_ping
+    from .result import PingResult
+
+__all__ = [
+    "PingClient",
+    "AsyncPingClient",
+    "PingRegistry",
+    "HeartbeatScheduler",
+    "PingResult",
+    "bulk_ping",
+    "monitor",
+    "ApiError",
+    "SdkError",
+    "ValidationError",
+]
+
+# Clients are imported on first access so that ``import cronbeats_python`` does not pull in
+# asyncio and friends for programs (and the CLI) that never use them.
+_LAZY = {
+    "PingClient": ".client",
+    "AsyncPingClient": ".async_client",
+    "PingRegistry": ".registry",
+    "HeartbeatScheduler": ".heartbeat",
+    "PingResult": ".result",
+    "bulk_ping": ".registry",
+    "monitor": ".monitor",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module_name = _LAZY.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,179 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING, Any, Dict, Generator, Optional, TypeVar
+
+from .async_http import AsyncHttpClient, default_async_http_client
+from .client import _SLEEP, _STORE, ProgressInput, RequestStep, _BaseClient, _DeferredStart, _JobState
+from .errors import SdkError
+from .result import PingResult
+
+if TYPE_CHECKING:
+    from .monitor import AsyncRun
+    from .tracker import AsyncTracker
+
+
+_T = TypeVar("_T")
+
+
+class AsyncPingClient(_BaseClient):
+    def __init__(self, job_key: str, options: Optional[Dict[str, Any]] = None) -> None:
+        opts = options or {}
+        super().__init__(job_key, opts)
+        self.http_client: AsyncHttpClient = opts.get("http_client") or default_async_http_client()
+
+    def run(self) -> AsyncRun:
+        return self._run(self._state)
+
+    def track(self, iterable: Any, total: Optional[int] = None, every_ms: int = 1000) -> AsyncTracker:
+        return self._track(self, iterable, total, every_ms)
+
+    async def ping(self, deadline_ms: Optional[int] = None) -> PingResult:
+        return await self._ping(self._state, deadline_ms)
+
+    async def start(self, deadline_ms: Optional[int] = None) -> PingResult:
+        return await self._start(self._state, deadline_ms)
+
+    async def end(self, status: str = "success", deadline_ms: Optional[int] = None) -> PingResult:
+        return await self._end(self._state, status, deadline_ms)
+
+    async def success(self, deadline_ms: Optional[int] = None) -> PingResult:
+        return await self._end(self._state, "success", deadline_ms)
+
+    async def fail(self, deadline_ms: Optional[int] = None) -> PingResult:
+        return await self._end(self._state, "fail", deadline_ms)
+
+    async def progress(
+        self,
+        seq_or_options: ProgressInput = None,
+        message: Optional[str] = None,
+        deadline_ms: Optional[int] = None,
+    ) -> PingResult:
+        return await self._progress(self._state, seq_or_options, message, deadline_ms)
+
+    # The operations behind the public methods, for any job key's state; PingHandle calls these.
+
+    async def _ping(self, state: _JobState, deadline_ms: Optional[int]) -> PingResult:
+        return await self._request(state, "ping", state.ping_path, deadline_ms=deadline_ms)
+
+    async def _start(self, state: _JobState, deadline_ms: Optional[int]) -> PingResult:
+        if self.defer_start_ms > 0:
+            return await self._defer_start(state, deadline_ms)
+        return await self._request(state, "start", state.start_path, deadline_ms=deadline_ms)
+
+    async def _end(self, state: _JobState, status: str, deadline_ms: Optional[int]) -> PingResult:
+        path = state.end_path(status)
+        return await self._request(state, "end", path, await self._settle_deferred_start(state), deadline_ms)
+
+    async def _progress(
+        self,
+        state: _JobState,
+        seq_or_options: ProgressInput,
+        message: Optional[str],
+        deadline_ms: Optional[int],
+    ) -> PingResult:
+        seq, msg = self._parse_progress(seq_or_options, message)
+        if self._throttle_progress and not self._allow_progress(state, seq, msg):
+            self._record_throttled()
+            return self._local_result(state, "progress", skipped=True)
+        return await self._request(state, "progress", state.progress_path(seq), {"message": msg}, deadline_ms)
+
+    def _run(self, state: _JobState) -> AsyncRun:
+        from .monitor import AsyncRun
+
+        return AsyncRun(self, state)
+
+    def _track(self, reporter: Any, iterable: Any, total: Optional[int], every_ms: int) -> AsyncTracker:
+        from .tracker import AsyncTracker
+
+        return AsyncTracker(reporter, iterable, total, every_ms)
+
+    async def _defer_start(self, state: _JobState, deadline_ms: Optional[int]) -> PingResult:
+        await self._settle_deferred_start(state)
+        deferred = _DeferredStart()
+        deferred.timer = asyncio.get_running_loop().call_later(
+            self.defer_start_ms / 1000.0, self._fire_deferred_start, state, deferred, deadline_ms
+        )
+        state.deferred_start = deferred
+        return self._local_result(state, "start", deferred=True)
+
+    def _fire_deferred_start(self, state: _JobState, deferred: _DeferredStart, deadline_ms: Optional[int]) -> None:
+        deferred.fired = True
+        deferred.task = asyncio.ensure_future(self._send_deferred_start(state, deferred, deadline_ms))
+
+    async def _send_deferred_start(
+        self, state: _JobState, deferred: _DeferredStart, deadline_ms: Optional[int]
+    ) -> None:
+        try:
+            await self._request(state, "start", state.start_path, {"started_at": deferred.started_at}, deadline_ms)
+        except SdkError:
+            pass
+
+    async def _settle_deferred_start(self, state: _JobState) -> Optional[Dict[str, Any]]:
+        deferred = state.deferred_start
+        if deferred is None:
+            return None
+        state.deferred_start = None
+        if deferred.fired:
+            await deferred.task
+        else:
+            deferred.timer.cancel()
+        return deferred.report()
+
+    async def drain_outbox(self, limit: Optional[int] = None, deadline_ms: Optional[int] = None) -> int:
+        return (await self._drive(self._drain_flow(limit, deadline_ms)))[0]
+
+    async def _request(
+        self,
+        state: _JobState,
+        action: str,
+        path: str,
+        body: Optional[Dict[str, Any]] = None,
+        deadline_ms: Optional[int] = None,
+    ) -> PingResult:
+        if self._outbox_dirty:
+            return await self._drive(self._outbox_first_flow(state, action, path, body, deadline_ms))
+        return await self._drive(self._request_flow(state, action, path, body, deadline_ms=deadline_ms))
+
+    async def _drive(self, flow: Generator[RequestStep, Any, _T]) -> _T:
+        try:
+            step, arg = next(flow)
+            while True:
+                if step == _SLEEP:
+                    await asyncio.sleep(arg)
+                    step, arg = flow.send(None)
+                    continue
+                if step == _STORE:
+                    method, args = arg
+                    # Outbox calls block on SQLite, so they run in a worker thread. A cancelled
+                    # caller still waits for one: a claimed batch must reach the flow to be put back.
+                    call = asyncio.ensure_future(asyncio.to_thread(method, *args))
+                    try:
+                        stored = await asyncio.shield(call)
+                    except SdkError as exc:
+                        step, arg = flow.throw(exc)
+                        continue
+                    except asyncio.CancelledError:
+                        await asyncio.wait((call,))
+                        if not call.cancelled() and call.exception() is None:
+                            try:
+                                flow.send(call.result())
+                            except Exception:
+                                # Whatever the flow does next (e.g. raise the spooled event's
+                                # ApiError), the caller was cancelled and must see that.
+                                pass
+                        raise
+                    step, arg = flow.send(stored)
+                    continue
+                url, headers, encoded_body, timeout_ms = arg
+                try:
+                    outcome: Any = await self.http_client.request("POST", url, headers, encoded_body, timeout_ms)
+                except SdkError as exc:
+                    outcome = exc
+                step, arg = flow.send(outcome)
+        except StopIteration as stop:
+            return stop.value
+        except asyncio.CancelledError:
+            # Closing the flow lets a drain put its unsent events back in the outbox.
+            flow.close()
+            raise
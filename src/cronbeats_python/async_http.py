@@ -0,0 +1,353 @@
+from __future__ import annotations
+
+import asyncio
+import socket
+import ssl
+import time
+import weakref
+from time import perf_counter_ns
+from typing import Any, Dict, List, Optional, Protocol, Tuple
+from urllib.parse import unquote, urlsplit
+
+from . import forksafe
+from .errors import SdkError
+from .http import Body, HttpResponse, _proxy_for, _to_bytes
+from .transport_cache import DnsCache, shared_dns_cache, shared_ssl_context
+
+
+class AsyncHttpClient(Protocol):
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        body: Optional[Body],
+        timeout_ms: int,
+    ) -> HttpResponse:
+        ...
+
+
+PoolKey = Tuple[str, str, int]
+Connection = Tuple[asyncio.StreamReader, asyncio.StreamWriter]
+# Host, port and Proxy-Authorization value of the HTTP proxy a URL goes through.
+Proxy = Tuple[str, int, Optional[str]]
+Target = Tuple[PoolKey, str, Optional[Proxy]]
+
+
+class _StaleConnection(Exception):
+    pass
+
+
+class _LoopPool:
+    def __init__(self, max_connections_per_host: int) -> None:
+        self.max_connections_per_host = max_connections_per_host
+        self.idle: Dict[PoolKey, List[Tuple[float, Connection]]] = {}
+        self.limits: Dict[PoolKey, asyncio.Semaphore] = {}
+
+    def limit(self, key: PoolKey) -> asyncio.Semaphore:
+        sem = self.limits.get(key)
+        if sem is None:
+            sem = self.limits[key] = asyncio.Semaphore(self.max_connections_per_host)
+        return sem
+
+
+class AsyncioHttpClient:
+    def __init__(
+        self,
+        max_connections_per_host: int = 32,
+        max_idle_per_host: int = 32,
+        idle_timeout_s: float = 30.0,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        dns_cache: Optional[DnsCache] = None,
+    ) -> None:
+        self.max_connections_per_host = max(1, int(max_connections_per_host))
+        self.max_idle_per_host = max(0, int(max_idle_per_host))
+        self.idle_timeout_s = float(idle_timeout_s)
+        # Streams are bound to the loop that opened them, so each loop gets its own pool.
+        self._pools: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, _LoopPool]" = weakref.WeakKeyDictionary()
+        self._ssl_context = ssl_context
+        self.dns_cache = dns_cache or shared_dns_cache()
+        forksafe.track(self)
+        self._targets: Dict[str, Target] = {}
+
+    async def request(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        body: Optional[Body],
+        timeout_ms: int,
+    ) -> HttpResponse:
+        cached = self._targets.get(url)
+        if cached is None:
+            cached = self._split_target(url)
+        key, target, proxy = cached
+
+        data = _to_bytes(body) or b""
+        head = self._build_head(method, target, key, headers, data, proxy)
+        timeout_seconds = max(1, timeout_ms) / 1000.0
+
+        pool = self._pool()
+        try:
+            # The wait for a connection slot counts against the timeout too.
+            return await asyncio.wait_for(self._limited_exchange(pool, key, proxy, head + data), timeout_seconds)
+        except SdkError:
+            raise
+        except asyncio.TimeoutError as exc:
+            raise SdkError("timed out") from exc
+        except (OSError, asyncio.IncompleteReadError, ValueError) as exc:
+            raise SdkError(str(exc)) from exc
+
+    def _split_target(self, url: str) -> Target:
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https") or not parts.hostname:
+            raise SdkError(f"Unsupported URL: {url}")
+        key: PoolKey = (scheme, parts.hostname, parts.port or (443 if scheme == "https" else 80))
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        proxy = _parse_proxy(_proxy_for(scheme, parts.hostname))
+        if proxy is not None and scheme == "http":
+            # A forwarding proxy takes the absolute URL; https goes through a CONNECT tunnel.
+            target = f"http://{parts.netloc}{target}"
+        if len(self._targets) >= 1024:
+            self._targets.clear()
+        cached = self._targets[url] = (key, target, proxy)
+        return cached
+
+    def _reset_after_fork(self) -> None:
+        # Connections belong to the parent's event loops; the child starts with no pools.
+        self._pools = weakref.WeakKeyDictionary()
+
+    async def aclose(self) -> None:
+        pools = list(self._pools.values())
+        self._pools = weakref.WeakKeyDictionary()
+        for pool in pools:
+            for conns in pool.idle.values():
+                for _, (_, writer) in conns:
+                    writer.close()
+
+    async def _limited_exchange(
+        self, pool: _LoopPool, key: PoolKey, proxy: Optional[Proxy], request_bytes: bytes
+    ) -> HttpResponse:
+        async with pool.limit(key):
+            return await self._exchange(pool, key, proxy, request_bytes)
+
+    async def _exchange(
+        self, pool: _LoopPool, key: PoolKey, proxy: Optional[Proxy], request_bytes: bytes
+    ) -> HttpResponse:
+        while True:
+            timings: Dict[str, int] = {}
+            conn, reused = await self._acquire(pool, key, proxy, timings)
+            reader, writer = conn
+            try:
+                started = perf_counter_ns()
+                writer.write(request_bytes)
+                await writer.drain()
+                sent = perf_counter_ns()
+                status, response_headers, payload, keep_alive = await self._read_response(reader, timings, sent)
+                done = perf_counter_ns()
+            except (_StaleConnection, ConnectionResetError, BrokenPipeError) as exc:
+                # A reused keep-alive socket may have been closed by the server while idle.
+                writer.close()
+                if reused:
+                    continue
+                raise SdkError(str(exc) or "Server closed connection without response") from exc
+            except BaseException:
+                writer.close()
+                raise
+
+            timings["send_ns"] = sent - started
+            timings["read_ns"] = done - sent - timings["first_byte_ns"]
+            timings["reused"] = int(reused)
+            if keep_alive:
+                self._release(pool, key, conn)
+            else:
+                writer.close()
+            return HttpResponse(status=status, body=payload, headers=response_headers, timings=timings)
+
+    async def _read_response(
+        self, reader: asyncio.StreamReader, timings: Dict[str, int], sent: int
+    ) -> Tuple[int, Dict[str, str], bytes, bool]:
+        status_line = await reader.readline()
+        if not status_line:
+            raise _StaleConnection()
+        timings["first_byte_ns"] = perf_counter_ns() - sent
+
+        parts = status_line.decode("latin-1").split(None, 2)
+        if len(parts) < 2 or not parts[0].startswith("HTTP/"):
+            raise SdkError(f"Malformed status line: {status_line!r}")
+        version, status = parts[0], int(parts[1])
+
+        response_headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            response_headers[name.strip().lower()] = value.strip()
+
+        connection = response_headers.get("connection", "").lower()
+        keep_alive = version != "HTTP/1.0" and connection != "close"
+
+        if response_headers.get("transfer-encoding", "").lower() == "chunked":
+            payload = await self._read_chunked(reader)
+        elif "content-length" in response_headers:
+            payload = await reader.readexactly(int(response_headers["content-length"]))
+        elif status in (204, 304) or 100 <= status < 200:
+            payload = b""
+        else:
+            payload = await reader.read()
+            keep_alive = False
+
+        return status, response_headers, payload, keep_alive
+
+    async def _read_chunked(self, reader: asyncio.StreamReader) -> bytes:
+        chunks: List[bytes] = []
+        while True:
+            size_line = await reader.readline()
+            size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                while (await reader.readline()) not in (b"\r\n", b"\n", b""):
+                    pass
+                return b"".join(chunks)
+            chunks.append(await reader.readexactly(size))
+            await reader.readexactly(2)
+
+    def _build_head(
+        self,
+        method: str,
+        target: str,
+        key: PoolKey,
+        headers: Dict[str, str],
+        data: bytes,
+        proxy: Optional[Proxy] = None,
+    ) -> bytes:
+        scheme, host, port = key
+        default_port = 443 if scheme == "https" else 80
+        host_header = host if port == default_port else f"{host}:{port}"
+        lines = [f"{method} {target} HTTP/1.1", f"Host: {host_header}", f"Content-Length: {len(data)}"]
+        if proxy is not None and proxy[2] is not None and scheme == "http":
+            lines.append(f"Proxy-Authorization: {proxy[2]}")
+        for name, value in headers.items():
+            lines.append(f"{name}: {value}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1")
+
+    def _pool(self) -> _LoopPool:
+        loop = asyncio.get_running_loop()
+        pool = self._pools.get(loop)
+        if pool is None:
+            pool = self._pools[loop] = _LoopPool(self.max_connections_per_host)
+        return pool
+
+    async def _acquire(
+        self, pool: _LoopPool, key: PoolKey, proxy: Optional[Proxy], timings: Dict[str, int]
+    ) -> Tuple[Connection, bool]:
+        now = time.monotonic()
+        conns = pool.idle.get(key)
+        while conns:
+            idle_since, conn = conns.pop()
+            reader, writer = conn
+            if now - idle_since > self.idle_timeout_s or reader.at_eof() or writer.is_closing():
+                writer.close()
+                continue
+            return conn, True
+
+        scheme, host, port = key
+        # Through a proxy the TCP connection goes to the proxy instead.
+        connect_host, connect_port = (host, port) if proxy is None else (proxy[0], proxy[1])
+        started = perf_counter_ns()
+        addresses = await self.dns_cache.resolve_async(
+            connect_host, connect_port, asyncio.get_running_loop().getaddrinfo
+        )
+        if not addresses:
+            raise SdkError(f"Could not resolve {connect_host}")
+        resolved = perf_counter_ns()
+
+        # open_connection does TCP connect and TLS handshake in one step; connect_ns covers both.
+        last_error: Optional[OSError] = None
+        for family, _, _, _, address in addresses:
+            try:
+                if proxy is not None and scheme == "https":
+                    conn = await self._open_tunnel(family, address, host, port, proxy[2])
+                elif scheme == "https":
+                    conn = await asyncio.open_connection(
+                        address[0], address[1], ssl=self._get_ssl_context(), server_hostname=host, family=family
+                    )
+                else:
+                    conn = await asyncio.open_connection(address[0], address[1], family=family)
+                break
+            except OSError as exc:
+                last_error = exc
+        else:
+            self.dns_cache.invalidate(connect_host, connect_port)
+            raise last_error or OSError(f"Could not connect to {connect_host}:{connect_port}")
+        timings["dns_ns"] = resolved - started
+        timings["connect_ns"] = perf_counter_ns() - resolved
+        return conn, False
+
+    async def _open_tunnel(
+        self, family: int, address: Tuple[Any, ...], host: str, port: int, authorization: Optional[str]
+    ) -> Connection:
+        # CONNECT through the proxy, then TLS to the real host inside the tunnel.
+        loop = asyncio.get_running_loop()
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            sock.setblocking(False)
+            await loop.sock_connect(sock, address)
+            lines = [f"CONNECT {host}:{port} HTTP/1.1", f"Host: {host}:{port}"]
+            if authorization is not None:
+                lines.append(f"Proxy-Authorization: {authorization}")
+            await loop.sock_sendall(sock, ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+            response = b""
+            while b"\r\n\r\n" not in response:
+                chunk = await loop.sock_recv(sock, 4096)
+                if not chunk or len(response) > 65536:
+                    raise SdkError(f"Proxy closed the connection during CONNECT to {host}:{port}")
+                response += chunk
+            status_line = response.split(b"\r\n", 1)[0].decode("latin-1")
+            parts = status_line.split(None, 2)
+            if len(parts) < 2 or parts[1] != "200":
+                raise SdkError(f"Proxy refused CONNECT to {host}:{port}: {status_line}")
+            return await asyncio.open_connection(sock=sock, ssl=self._get_ssl_context(), server_hostname=host)
+        except BaseException:
+            sock.close()
+            raise
+
+    def _release(self, pool: _LoopPool, key: PoolKey, conn: Connection) -> None:
+        conns = pool.idle.setdefault(key, [])
+        if len(conns) < self.max_idle_per_host:
+            conns.append((time.monotonic(), conn))
+        else:
+            conn[1].close()
+
+    def _get_ssl_context(self) -> ssl.SSLContext:
+        if self._ssl_context is None:
+            self._ssl_context = shared_ssl_context()
+        return self._ssl_context
+
+
+def _parse_proxy(url: Optional[str]) -> Optional[Proxy]:
+    if url is None:
+        return None
+    parts = urlsplit(url if "://" in url else f"http://{url}")
+    if parts.scheme.lower() != "http" or not parts.hostname:
+        raise SdkError(f"Unsupported proxy {url}: only http:// proxies are supported.")
+    authorization = None
+    if parts.username is not None:
+        from base64 import b64encode
+
+        credentials = f"{unquote(parts.username)}:{unquote(parts.password or '')}"
+        authorization = "Basic " + b64encode(credentials.encode("utf-8")).decode("ascii")
+    return parts.hostname, parts.port or 80, authorization
+
+
+_default_async_http_client: Optional[AsyncioHttpClient] = None
+
+
+def default_async_http_client() -> AsyncioHttpClient:
+    global _default_async_http_client
+    if _default_async_http_client is None:
+        _default_async_http_client = AsyncioHttpClient()
+    return _default_async_http_client
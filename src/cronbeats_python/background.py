@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+import atexit
+import threading
+import time
+import weakref
+from collections import deque
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Tuple
+
+from . import forksafe
+from .errors import SdkError, ValidationError
+
+if TYPE_CHECKING:
+    from .client import PingClient, _JobState
+
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop_newest", "block")
+
+# [client, job state, action, path, body, deadline_ms]; a list so a pending progress event can be
+# updated in place.
+Event = List[Any]
+JobId = Tuple[str, str]
+
+_live_senders: "weakref.WeakSet[BackgroundSender]" = weakref.WeakSet()
+
+
+class BackgroundSender:
+    def __init__(
+        self,
+        queue_size: int = 1000,
+        overflow: str = "drop_oldest",
+        exit_timeout_s: float = 2.0,
+        coalesce_progress: bool = True,
+    ) -> None:
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValidationError(f"overflow must be one of {', '.join(OVERFLOW_POLICIES)}.")
+        if int(queue_size) < 1:
+            raise ValidationError("queue_size must be at least 1.")
+        self.queue_size = int(queue_size)
+        self.overflow = overflow
+        self.exit_timeout_s = float(exit_timeout_s)
+        self.coalesce_progress = bool(coalesce_progress)
+        self.dropped = 0
+        self.coalesced = 0
+        self.failed = 0
+        self._queue: Deque[Event] = deque()
+        self._pending_progress: Dict[JobId, Event] = {}
+        self._cond = threading.Condition()
+        self._unfinished = 0
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        _live_senders.add(self)
+        forksafe.track(self)
+
+    def submit(
+        self,
+        client: "PingClient",
+        state: "_JobState",
+        action: str,
+        path: str,
+        body: Optional[Dict[str, Any]] = None,
+        deadline_ms: Optional[int] = None,
+    ) -> bool:
+        with self._cond:
+            if self._closed:
+                raise SdkError("Background sender is closed.")
+            job: JobId = (client.base_url, state.job_key)
+            if action == "progress" and self.coalesce_progress:
+                pending = self._pending_progress.get(job)
+                if pending is not None:
+                    # Latest wins: the queued update is rewritten, keeping its place in line
+                    # so it is still delivered before any later start/end for the job.
+                    pending[3] = path
+                    pending[4] = body
+                    pending[5] = deadline_ms
+                    self.coalesced += 1
+                    return True
+            while len(self._queue) >= self.queue_size:
+                if self.overflow == "drop_newest":
+                    self.dropped += 1
+                    client._record_dropped()
+                    return False
+                if self.overflow == "drop_oldest":
+                    evicted = self._queue.popleft()
+                    self._forget(evicted)
+                    self._unfinished -= 1
+                    self.dropped += 1
+                    evicted[0]._record_dropped()
+                    continue
+                self._cond.wait()
+                if self._closed:
+                    raise SdkError("Background sender is closed.")
+            event: Event = [client, state, action, path, body, deadline_ms]
+            self._queue.append(event)
+            if action == "progress" and self.coalesce_progress:
+                self._pending_progress[job] = event
+            else:
+                # start/end act as a barrier: later progress must not jump ahead of them.
+                self._pending_progress.pop(job, None)
+            self._unfinished += 1
+            self._ensure_thread()
+            self._cond.notify_all()
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while self._unfinished > 0:
+                if self._thread is None or not self._thread.is_alive():
+                    return False
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        flushed = self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+            thread = self._thread
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        return flushed
+
+    def _forget(self, event: Event) -> None:
+        if event[2] == "progress":
+            job = (event[0].base_url, event[1].job_key)
+            if self._pending_progress.get(job) is event:
+                del self._pending_progress[job]
+
+    def _reset_after_fork(self) -> None:
+        # Queued events are the parent's to deliver; the child starts empty and its sender
+        # thread is started again on the next submit.
+        self._cond = threading.Condition()
+        self._queue.clear()
+        self._pending_progress.clear()
+        self._unfinished = 0
+        self._thread = None
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="cronbeats-sender", daemon=True)
+            self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._queue and not self._closed:
+                    self._cond.wait()
+                if not self._queue:
+                    return
+                event = self._queue.popleft()
+                self._forget(event)
+                self._cond.notify_all()
+            client, state, action, path, body, deadline_ms = event
+
+            try:
+                client._deliver(state, action, path, body, deadline_ms)
+            except Exception:
+                self.failed += 1
+
+            with self._cond:
+                self._unfinished -= 1
+                self._cond.notify_all()
+
+
+@atexit.register
+def _flush_live_senders() -> None:
+    for sender in list(_live_senders):
+        sender.flush(sender.exit_timeout_s)
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict
+
+from . import forksafe
+
+
+class RetryBudget:
+    def __init__(self, ratio: float = 0.1, min_retries: int = 10, window_s: float = 10.0) -> None:
+        self.ratio = float(ratio)
+        self.min_retries = int(min_retries)
+        self.window_s = float(window_s)
+        self._window_start = time.monotonic()
+        self._requests = 0
+        self._retries = 0
+        self._prev_requests = 0
+        self._prev_retries = 0
+        self._lock = threading.Lock()
+        forksafe.track(self)
+
+    def record_request(self) -> None:
+        with self._lock:
+            self._rotate(time.monotonic())
+            self._requests += 1
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            now = time.monotonic()
+            self._rotate(now)
+            # Sliding window: the previous window counts in proportion to how much of it overlaps.
+            weight = max(0.0, 1.0 - (now - self._window_start) / self.window_s)
+            requests = self._requests + self._prev_requests * weight
+            retries = self._retries + self._prev_retries * weight
+            if retries + 1 > self.min_retries + self.ratio * requests:
+                return False
+            self._retries += 1
+            return True
+
+    def _rotate(self, now: float) -> None:
+        elapsed = now - self._window_start
+        if elapsed < self.window_s:
+            return
+        if elapsed < 2 * self.window_s:
+            self._prev_requests, self._prev_retries = self._requests, self._retries
+        else:
+            self._prev_requests = self._prev_retries = 0
+        self._requests = self._retries = 0
+        self._window_start = now - (elapsed % self.window_s)
+
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int = 5, reset_timeout_s: float = 30.0, half_open_probes: int = 1) -> None:
+        self.failure_threshold = max(1, int(failure_threshold))
+        self.reset_timeout_s = float(reset_timeout_s)
+        self.half_open_probes = max(1, int(half_open_probes))
+        self.state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+        self._probe_started = 0.0
+        self._lock = threading.Lock()
+        forksafe.track(self)
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self.state == CLOSED:
+                return True
+            now = time.monotonic()
+            if self.state == OPEN:
+                if now - self._opened_at < self.reset_timeout_s:
+                    return False
+                self.state = HALF_OPEN
+                self._probes = 0
+            # A probe that never reported back (e.g. cancelled) must not wedge the breaker.
+            if self._probes >= self.half_open_probes and now - self._probe_started < self.reset_timeout_s:
+                return False
+            if self._probes >= self.half_open_probes:
+                self._probes = 0
+            self._probes += 1
+            self._probe_started = now
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self.state = CLOSED
+            self._failures = 0
+            self._probes = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self.state == HALF_OPEN or self._failures >= self.failure_threshold:
+                self.state = OPEN
+                self._opened_at = time.monotonic()
+                self._probes = 0
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_budgets: Dict[str, RetryBudget] = {}
+_registry_lock = threading.Lock()
+forksafe.reset_locks(globals(), "_registry_lock")
+
+
+def shared_breaker(base_url: str) -> CircuitBreaker:
+    breaker = _breakers.get(base_url)
+    if breaker is None:
+        with _registry_lock:
+            breaker = _breakers.setdefault(base_url, CircuitBreaker())
+    return breaker
+
+
+def shared_retry_budget(base_url: str) -> RetryBudget:
+    budget = _budgets.get(base_url)
+    if budget is None:
+        with _registry_lock:
+            budget = _budgets.setdefault(base_url, RetryBudget())
+    return budget
@@ -0,0 +1,178 @@
+# Startup matters here: the child command is spawned before the client, the HTTP stack or json
+# are imported, so the SDK loads and sends ``start`` while the job is already running.
+from __future__ import annotations
+
+import os
+import sys
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import subprocess
+
+    from .client import PingClient
+
+USAGE = """usage: cronbeats run [options] <job_key> -- <command> [args...]
+
+Sends start, runs the command, then reports success (exit 0) or fail and
+exits with the command's status.
+
+options:
+  --base-url URL      CronBeats base URL (default: https://cronbeats.io)
+  --timeout-ms N      per-request timeout in milliseconds (default: 5000)
+  --max-retries N     retries per ping (default: 2)
+  -q, --quiet         do not print telemetry warnings
+"""
+
+_VALUE_OPTIONS = {"--base-url": "base_url", "--timeout-ms": "timeout_ms", "--max-retries": "max_retries"}
+
+
+def _warn(message: object, quiet: bool) -> None:
+    if not quiet:
+        sys.stderr.write(f"cronbeats: {message}\n")
+
+
+def _parse_run_args(args: list[str]) -> tuple[str, dict[str, object], bool, list[str]]:
+    options: dict[str, object] = {}
+    quiet = False
+    job_key = None
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg == "--":
+            command = args[i + 1:]
+            break
+        if arg in ("-q", "--quiet"):
+            quiet = True
+        elif arg in _VALUE_OPTIONS:
+            if i + 1 >= len(args):
+                raise ValueError(f"{arg} requires a value")
+            value = args[i + 1]
+            options[_VALUE_OPTIONS[arg]] = value if arg == "--base-url" else int(value)
+            i += 1
+        elif arg.startswith("-"):
+            raise ValueError(f"unknown option {arg}")
+        elif job_key is None:
+            job_key = arg
+        else:
+            raise ValueError("expected -- before the command")
+        i += 1
+    else:
+        command = []
+
+    if job_key is None:
+        raise ValueError("missing job key")
+    if not command:
+        raise ValueError("missing command after --")
+    return job_key, options, quiet, command
+
+
+def _spawn(command: list[str]) -> tuple[int, subprocess.Popen | None]:
+    if hasattr(os, "posix_spawnp"):
+        # Python ignores SIGPIPE/SIGXFSZ; give the child the defaults back, as
+        # Popen(restore_signals=True) does. _signal avoids importing enum before the spawn,
+        # where the interpreter has it.
+        try:
+            import _signal as signals
+        except ImportError:
+            import signal as signals  # type: ignore[no-redef]
+
+        defaults = [getattr(signals, name) for name in ("SIGPIPE", "SIGXFSZ") if hasattr(signals, name)]
+        pid = os.posix_spawnp(command[0], command, os.environ, setsigdef=defaults)
+        return pid, None
+    import subprocess
+
+    proc = subprocess.Popen(command)
+    return proc.pid, proc
+
+
+def _wait(pid: int, proc: subprocess.Popen | None) -> int:
+    if proc is not None:
+        return proc.wait()
+    while True:
+        try:
+            _, status = os.waitpid(pid, 0)
+        except InterruptedError:
+            continue
+        code = os.waitstatus_to_exitcode(status)
+        # Mirror the shell: a child killed by signal N exits with 128 + N.
+        return 128 - code if code < 0 else code
+
+
+def _forward_signals(pid: int) -> None:
+    import signal
+
+    def forward(signum: int, frame: object) -> None:
+        try:
+            os.kill(pid, signum)
+        except OSError:
+            pass
+
+    for name in ("SIGTERM", "SIGHUP"):
+        sig = getattr(signal, name, None)
+        if sig is not None:
+            signal.signal(sig, forward)
+    # Ctrl-C reaches the child directly through the terminal's process group.
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _make_client(job_key: str, options: dict[str, object]) -> PingClient | None:
+    from .client import PingClient
+    from .errors import SdkError
+
+    try:
+        return PingClient(job_key, options)
+    except SdkError as exc:
+        _warn(f"not monitoring: {exc}", False)
+        return None
+
+
+def _send(client: PingClient | None, action: str, quiet: bool) -> None:
+    if client is None:
+        return
+    from .errors import SdkError
+
+    try:
+        if action == "start":
+            client.start()
+        else:
+            client.end(action)
+    except SdkError as exc:
+        _warn(f"{action} ping failed: {exc}", quiet)
+
+
+def run(args: list[str]) -> int:
+    try:
+        job_key, options, quiet, command = _parse_run_args(args)
+    except ValueError as exc:
+        sys.stderr.write(f"cronbeats: {exc}\n\n{USAGE}")
+        return 2
+
+    try:
+        pid, proc = _spawn(command)
+    except OSError as exc:
+        _warn(f"{command[0]}: {exc.strerror or exc}", False)
+        _send(_make_client(job_key, options), "fail", quiet)
+        return 127
+
+    # A telemetry problem (bad key, unreachable API) never changes the job's outcome.
+    _forward_signals(pid)
+    client = _make_client(job_key, options)
+    _send(client, "start", quiet)
+    code = _wait(pid, proc)
+    _send(client, "success" if code == 0 else "fail", quiet)
+    return code
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = list(sys.argv[1:] if argv is None else argv)
+    if not args or args[0] in ("-h", "--help"):
+        sys.stdout.write(USAGE)
+        return 0 if args else 2
+    if args[0] != "run":
+        sys.stderr.write(f"cronbeats: unknown command {args[0]!r}\n\n{USAGE}")
+        return 2
+    return run(args[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
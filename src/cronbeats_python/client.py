@@ -1,51 +1,222 @@
 from __future__ import annotations
 
-import json
-import random
-import re
+import sys
+import threading
 import time
-from typing import Any, Dict, Optional, Union
+from time import perf_counter, perf_counter_ns
+from typing import TYPE_CHECKING, Any, Dict, Generator, Iterable, Optional, Tuple, TypeVar, Union
 
 from .errors import ApiError, SdkError, ValidationError
-from .http import HttpClient, UrllibHttpClient
+from . import forksafe
+from .circuit import CircuitBreaker, RetryBudget, shared_breaker, shared_retry_budget
+from .codec import JsonCodec, get_codec
+from .http import HttpClient, HttpResponse, default_http_client
+from .instrumentation import AttemptTiming, RequestEvent, RequestHook
+from .ratelimit import TokenBucketLimiter, parse_retry_after, shared_limiter
+from .result import PingResult, decode_object
+from .stats import GLOBAL_STATS, ClientStats
+
+if TYPE_CHECKING:
+    import random
+
+    from .background import BackgroundSender
+    from .monitor import Run
+    from .outbox import OutboxEvent, SqliteOutbox
+    from .registry import PingHandle
+    from .tracker import Tracker
 
 
 ProgressInput = Union[int, Dict[str, Any], None]
 
+# Steps yielded by ``_BaseClient._request_flow``. The flow holds the retry policy and
+# response handling; the sync and async clients only drive the I/O it asks for.
+_SEND = "send"
+_SLEEP = "sleep"
+# ``(method, args)`` on the outbox. SQLite blocks, so the async client runs these off the loop;
+# an SdkError they raise is thrown back into the flow.
+_STORE = "store"
+
+RequestStep = Tuple[str, Any]
+RequestFlow = Generator[RequestStep, Any, PingResult]
+DrainFlow = Generator[RequestStep, Any, Tuple[int, Optional[ApiError]]]
+
+_T = TypeVar("_T")
+
+
+_jitter_rng: Optional[random.Random] = None
+
+
+def _jitter_random() -> random.Random:
+    global _jitter_rng
+    if _jitter_rng is None:
+        import random
+
+        _jitter_rng = random.Random()
+    return _jitter_rng
+
+
+@forksafe.on_fork
+def _reseed_jitter() -> None:
+    # Forked workers would otherwise back off in lockstep with their siblings.
+    if _jitter_rng is not None:
+        _jitter_rng.seed()
+
+
+class _DeferredStart:
+    # A start held back by ``defer_start_ms``; ``fired`` is claimed by whichever of the timer and
+    # end() gets there first.
+    __slots__ = ("started_at", "started", "timer", "task", "fired", "lock")
+
+    def __init__(self) -> None:
+        self.started_at = time.time()
+        self.started = perf_counter()
+        self.timer: Any = None
+        self.task: Any = None
+        self.fired = False
+        self.lock: Optional[threading.Lock] = None
+
+    def report(self) -> Dict[str, Any]:
+        return {"started_at": self.started_at, "duration_ms": round((perf_counter() - self.started) * 1000.0, 3)}
 
-class PingClient:
+
+_NEVER = float("-inf")
+
+
+def _assert_job_key(job_key: str) -> None:
+    if not (isinstance(job_key, str) and len(job_key) == 8 and job_key.isascii() and job_key.isalnum()):
+        raise ValidationError("jobKey must be exactly 8 Base62 characters.")
+
+
+class _JobState:
+    # Everything that belongs to one job key: its interned ping path and its progress throttle
+    # and deferred-start state. A client owns one for its own key; registry handles each carry
+    # one and pass it to the shared client, so config and transport exist once. The other paths
+    # are the ping path plus a constant suffix and are built per request, which keeps a handle
+    # at a few hundred bytes.
+    __slots__ = (
+        "job_key",
+        "ping_path",
+        "last_progress_at",
+        "last_progress_seq",
+        "last_progress_message",
+        "deferred_start",
+    )
+
+    def __init__(self, job_key: str) -> None:
+        self.job_key = job_key
+        self.ping_path = sys.intern(f"/ping/{job_key}")
+        self.last_progress_at = _NEVER
+        self.last_progress_seq: Optional[int] = None
+        self.last_progress_message: Optional[str] = None
+        self.deferred_start: Optional[_DeferredStart] = None
+
+    @property
+    def start_path(self) -> str:
+        return self.ping_path + "/start"
+
+    def end_path(self, status: str) -> str:
+        if status != "success" and status != "fail":
+            status = status.strip().lower()
+            if status != "success" and status != "fail":
+                raise ValidationError('Status must be "success" or "fail".')
+        return f"{self.ping_path}/end/{status}"
+
+    def progress_path(self, seq: Optional[int]) -> str:
+        if seq is not None:
+            return f"{self.ping_path}/progress/{seq}"
+        return self.ping_path + "/progress"
+
+
+class _BaseClient:
     def __init__(self, job_key: str, options: Optional[Dict[str, Any]] = None) -> None:
         opts = options or {}
         self._assert_job_key(job_key)
 
-        self.job_key = job_key
+        self._state = _JobState(job_key)
+        self.job_key = self._state.job_key
         self.base_url = str(opts.get("base_url", "https://cronbeats.io")).rstrip("/")
         self.timeout_ms = int(opts.get("timeout_ms", 5000))
         self.max_retries = int(opts.get("max_retries", 2))
         self.retry_backoff_ms = int(opts.get("retry_backoff_ms", 250))
         self.retry_jitter_ms = int(opts.get("retry_jitter_ms", 100))
         self.user_agent = str(opts.get("user_agent", "cronbeats-python-sdk/0.1.0"))
-        self.http_client: HttpClient = opts.get("http_client") or UrllibHttpClient()
-
-    def ping(self) -> Dict[str, Any]:
-        return self._request("ping", f"/ping/{self.job_key}")
-
-    def start(self) -> Dict[str, Any]:
-        return self._request("start", f"/ping/{self.job_key}/start")
-
-    def end(self, status: str = "success") -> Dict[str, Any]:
-        status_value = status.strip().lower()
-        if status_value not in ("success", "fail"):
-            raise ValidationError('Status must be "success" or "fail".')
-        return self._request("end", f"/ping/{self.job_key}/end/{status_value}")
-
-    def success(self) -> Dict[str, Any]:
-        return self.end("success")
-
-    def fail(self) -> Dict[str, Any]:
-        return self.end("fail")
-
-    def progress(self, seq_or_options: ProgressInput = None, message: Optional[str] = None) -> Dict[str, Any]:
+        # "auto" (orjson when installed, else stdlib json), "orjson", "ujson", "json" or a codec object.
+        self.codec: JsonCodec = get_codec(opts.get("json_codec"))
+        # With return_result=False success bodies are dropped unread and results carry defaults.
+        self.return_result = bool(opts.get("return_result", True))
+        # Built once and shared by every request; transports must not mutate it.
+        self._headers = {
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+            "User-Agent": self.user_agent,
+        }
+        state = self._state
+        self._urls = {
+            path: f"{self.base_url}{path}"
+            for path in (
+                state.ping_path,
+                state.start_path,
+                state.progress_path(None),
+                state.end_path("success"),
+                state.end_path("fail"),
+            )
+        }
+        self.progress_min_interval_ms = int(opts.get("progress_min_interval_ms", 0))
+        self.progress_min_delta = int(opts.get("progress_min_delta", 0))
+        self._throttle_progress = self.progress_min_interval_ms > 0 or self.progress_min_delta > 0
+
+        # Jobs that finish within defer_start_ms send only end (with started_at and duration_ms).
+        self.defer_start_ms = int(opts.get("defer_start_ms", 0))
+
+        self.deadline_ms = int(opts.get("deadline_ms") or 0)
+        self.max_retry_after_ms = int(opts.get("max_retry_after_ms", 30000))
+        # Shared per base_url across the process unless a limiter (or None to disable) is given.
+        self.rate_limiter: Optional[TokenBucketLimiter] = (
+            opts["rate_limiter"] if "rate_limiter" in opts else shared_limiter(self.base_url)
+        )
+
+        self.circuit_breaker: Optional[CircuitBreaker] = (
+            opts["circuit_breaker"] if "circuit_breaker" in opts else shared_breaker(self.base_url)
+        )
+        self.retry_budget: Optional[RetryBudget] = (
+            opts["retry_budget"] if "retry_budget" in opts else shared_retry_budget(self.base_url)
+        )
+
+        instrumentation = opts.get("instrumentation")
+        self._on_request_complete: Optional[RequestHook] = (
+            instrumentation.on_request_complete if instrumentation is not None else opts.get("on_request_complete")
+        )
+
+        # Pass a shared ClientStats to aggregate several clients into one snapshot.
+        self._stats: ClientStats = opts.get("stats") or ClientStats()
+
+        outbox = opts.get("outbox")
+        if outbox is None and opts.get("outbox_dir"):
+            from .outbox import SqliteOutbox
+
+            outbox = SqliteOutbox(str(opts["outbox_dir"]))
+        self.outbox: Optional[SqliteOutbox] = outbox
+        # Events may have been spooled by an earlier process; check once on the first success.
+        self._outbox_dirty = outbox is not None
+
+    def stats(self) -> Dict[str, Any]:
+        return self._stats.snapshot()
+
+    def for_key(self, job_key: str) -> PingHandle:
+        # A cheap handle for another job key that shares this client's configuration and transport.
+        from .registry import PingHandle
+
+        return PingHandle(self, job_key)
+
+    def _record_throttled(self) -> None:
+        self._stats.record_throttled()
+        GLOBAL_STATS.record_throttled()
+
+    def _record_dropped(self) -> None:
+        self._stats.record_dropped()
+        GLOBAL_STATS.record_dropped()
+
+    def _parse_progress(self, seq_or_options: ProgressInput, message: Optional[str]) -> Tuple[Optional[int], str]:
         seq: Optional[int] = None
         msg = message
 
@@ -62,67 +233,234 @@ class PingClient:
         safe_msg = str(msg or "")
         if len(safe_msg) > 255:
             safe_msg = safe_msg[:255]
-
-        if seq is not None:
-            return self._request(
-                "progress",
-                f"/ping/{self.job_key}/progress/{seq}",
-                {"message": safe_msg},
+        return seq, safe_msg
+
+    def _allow_progress(self, state: _JobState, seq: Optional[int], message: str) -> bool:
+        now = time.monotonic()
+        if seq is None:
+            allowed = message != state.last_progress_message
+        else:
+            allowed = seq in (0, 100)
+        if not allowed:
+            too_soon = now - state.last_progress_at < self.progress_min_interval_ms / 1000.0
+            too_small = (
+                seq is not None
+                and state.last_progress_seq is not None
+                and abs(seq - state.last_progress_seq) < self.progress_min_delta
             )
+            if too_soon or too_small:
+                return False
 
-        body: Dict[str, Any] = {"message": safe_msg}
-        if isinstance(seq_or_options, int):
-            body["progress"] = seq_or_options
+        state.last_progress_at = now
+        state.last_progress_message = message
+        if seq is not None:
+            state.last_progress_seq = seq
+        return True
+
+    def _request_flow(
+        self,
+        state: _JobState,
+        action: str,
+        path: str,
+        body: Optional[Dict[str, Any]] = None,
+        base_url: Optional[str] = None,
+        spool: bool = True,
+        deadline_ms: Optional[int] = None,
+    ) -> RequestFlow:
+        hook = self._on_request_complete
+        event = None
+        if hook is not None:
+            event = RequestEvent(action, state.job_key, f"{base_url or self.base_url}{path}", perf_counter_ns())
+        return self._measured_flow(hook, event, state, action, path, body, base_url, spool, deadline_ms)
+
+    def _measured_flow(
+        self,
+        hook: Optional[RequestHook],
+        event: Optional[RequestEvent],
+        state: _JobState,
+        action: str,
+        path: str,
+        body: Optional[Dict[str, Any]],
+        base_url: Optional[str],
+        spool: bool,
+        deadline_ms: Optional[int],
+    ) -> RequestFlow:
+        started = perf_counter_ns() if event is None else event._started_ns
+        outcome = ""
+        try:
+            result = yield from self._attempt_flow(state, action, path, body, base_url, spool, deadline_ms, event)
+            outcome = "ok"
+            return result
+        except ApiError as exc:
+            outcome = exc.code
+            raise
+        except SdkError:
+            outcome = "SDK_ERROR"
+            raise
+        finally:
+            elapsed_ns = perf_counter_ns() - started
+            ok = outcome == "ok"
+            self._stats.record_request(action, elapsed_ns, ok)
+            GLOBAL_STATS.record_request(action, elapsed_ns, ok)
+            if hook is not None and event is not None:
+                event.outcome = outcome or "CANCELLED"
+                event.total_ns = elapsed_ns
+                try:
+                    hook(event)
+                except Exception:
+                    # Instrumentation must never break telemetry delivery.
+                    pass
+
+    def _attempt_flow(
+        self,
+        state: _JobState,
+        action: str,
+        path: str,
+        body: Optional[Dict[str, Any]],
+        base_url: Optional[str],
+        spool: bool,
+        deadline_ms: Optional[int],
+        event: Optional[RequestEvent],
+    ) -> RequestFlow:
+        url = self._urls.get(path) if base_url is None else None
+        if url is None:
+            url = f"{base_url or self.base_url}{path}"
+        attempt = 0
+        client_timestamp = time.time()
+        budget_ms = self.deadline_ms if deadline_ms is None else int(deadline_ms)
+        deadline = time.monotonic() + budget_ms / 1000.0 if budget_ms > 0 else None
 
-        return self._request("progress", f"/ping/{self.job_key}/progress", body)
+        encode_started = perf_counter_ns() if event is not None else 0
+        encoded_body: Optional[bytes] = None
+        if body:
+            try:
+                encoded_body = self.codec.dumps(body)
+            except Exception as exc:
+                raise SdkError("Failed to encode request payload.") from exc
+        if event is not None:
+            event.encode_ns = perf_counter_ns() - encode_started
 
-    def _request(self, action: str, path: str, body: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-        payload = body or {}
-        url = f"{self.base_url}{path}"
-        attempt = 0
+        headers = self._headers
 
-        try:
-            encoded_body = None if len(payload) == 0 else json.dumps(payload, separators=(",", ":"))
-        except Exception as exc:
-            raise SdkError("Failed to encode request payload.") from exc
+        breaker = self.circuit_breaker
+        if self.retry_budget is not None:
+            self.retry_budget.record_request()
 
         while True:
-            try:
-                response = self.http_client.request(
-                    "POST",
-                    url,
-                    {
-                        "Content-Type": "application/json",
-                        "Accept": "application/json",
-                        "User-Agent": self.user_agent,
-                    },
-                    encoded_body,
-                    self.timeout_ms,
+            if breaker is not None and not breaker.allow():
+                if spool:
+                    yield from self._spool(state, action, path, body, client_timestamp)
+                raise ApiError(
+                    code="CIRCUIT_OPEN",
+                    http_status=None,
+                    retryable=True,
+                    message=f"Circuit breaker is open for {base_url or self.base_url}.",
                 )
-            except SdkError as exc:
-                if attempt >= self.max_retries:
-                    raise ApiError(
-                        code="NETWORK_ERROR",
-                        http_status=None,
-                        retryable=True,
-                        message=str(exc),
-                        raw=exc,
-                    ) from exc
-                attempt += 1
-                self._sleep_with_backoff(attempt)
-                continue
-
-            decoded = self._safe_json(response.body)
+            if self.rate_limiter is not None:
+                delay = self.rate_limiter.reserve()
+                if delay > 0:
+                    if delay * 1000 > self.max_retry_after_ms:
+                        # Another client's 429 blocked the shared bucket for longer than we wait.
+                        if spool:
+                            yield from self._spool(state, action, path, body, client_timestamp)
+                        raise ApiError(
+                            code="RATE_LIMITED",
+                            http_status=None,
+                            retryable=True,
+                            message=f"Rate limited for another {delay:.0f}s.",
+                        )
+                    if not self._fits_deadline(deadline, delay):
+                        if spool:
+                            yield from self._spool(state, action, path, body, client_timestamp)
+                        raise self._deadline_error()
+                    yield _SLEEP, delay
+
+            timeout_ms = self.timeout_ms
+            if deadline is not None:
+                remaining_ms = int((deadline - time.monotonic()) * 1000)
+                if remaining_ms <= 0:
+                    if spool:
+                        yield from self._spool(state, action, path, body, client_timestamp)
+                    raise self._deadline_error()
+                timeout_ms = min(timeout_ms, remaining_ms)
+
+            sent_at = perf_counter_ns() if event is not None else 0
+            outcome = yield _SEND, (url, headers, encoded_body, timeout_ms)
+            timing: Optional[AttemptTiming] = None
+            if event is not None:
+                timing = AttemptTiming(attempt + 1, perf_counter_ns() - sent_at)
+                event.attempts.append(timing)
+            status_seen = None if isinstance(outcome, SdkError) else int(outcome.status)
+            self._stats.record_attempt(status_seen, attempt > 0)
+            GLOBAL_STATS.record_attempt(status_seen, attempt > 0)
+
+            if isinstance(outcome, SdkError):
+                if timing is not None:
+                    timing.error = str(outcome)
+                if breaker is not None:
+                    breaker.record_failure()
+                backoff = self._backoff_seconds(attempt + 1)
+                if attempt < self.max_retries and self._fits_deadline(deadline, backoff) and self._may_retry():
+                    if timing is not None:
+                        timing.retry_reason = "NETWORK_ERROR"
+                    attempt += 1
+                    yield _SLEEP, backoff
+                    continue
+                if spool:
+                    yield from self._spool(state, action, path, body, client_timestamp)
+                raise ApiError(
+                    code="NETWORK_ERROR",
+                    http_status=None,
+                    retryable=True,
+                    message=str(outcome),
+                    raw=outcome,
+                ) from outcome
+
+            response: HttpResponse = outcome
             status = int(response.status)
+            if timing is not None:
+                timing.status = status
+                timing.apply_transport_timings(getattr(response, "timings", None))
+            response_headers = response.headers or {}
+            if self.rate_limiter is not None:
+                retry_after = self.rate_limiter.observe(status, response_headers, self.max_retry_after_ms / 1000.0)
+            else:
+                retry_after = parse_retry_after(response_headers.get("retry-after"))
+
+            if breaker is not None:
+                # Only outages count against the breaker; 4xx answers prove the service is up.
+                if status >= 500:
+                    breaker.record_failure()
+                else:
+                    breaker.record_success()
 
             if 200 <= status < 300:
-                return self._normalize_success(action, decoded)
+                # Success bodies are parsed lazily, on first access to a result field.
+                if not self.return_result:
+                    return PingResult(action, state.job_key)
+                return PingResult(action, state.job_key, response.body, codec=self.codec)
 
+            decode_started = perf_counter_ns() if timing is not None else 0
+            decoded = self._safe_json(response.body)
+            if timing is not None:
+                timing.decode_ns = perf_counter_ns() - decode_started
             mapped = self._map_error(status)
-            if mapped["retryable"] and attempt < self.max_retries:
-                attempt += 1
-                self._sleep_with_backoff(attempt)
-                continue
+            if mapped["retryable"]:
+                backoff = max(self._backoff_seconds(attempt + 1), retry_after or 0.0)
+                honor_retry_after = retry_after is None or retry_after * 1000 <= self.max_retry_after_ms
+                if (
+                    attempt < self.max_retries
+                    and honor_retry_after
+                    and self._fits_deadline(deadline, backoff)
+                    and self._may_retry()
+                ):
+                    if timing is not None:
+                        timing.retry_reason = mapped["code"]
+                    attempt += 1
+                    yield _SLEEP, backoff
+                    continue
+                if spool:
+                    yield from self._spool(state, action, path, body, client_timestamp)
 
             raise ApiError(
                 code=mapped["code"],
@@ -132,23 +470,121 @@ class PingClient:
                 raw=decoded,
             )
 
-    def _normalize_success(self, action: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-        processing = payload.get("processing_time_ms", 0.0)
+    def _fits_deadline(self, deadline: Optional[float], wait_seconds: float) -> bool:
+        # Waiting is pointless unless some budget is left for the attempt that follows.
+        return deadline is None or time.monotonic() + wait_seconds < deadline
+
+    def _deadline_error(self) -> ApiError:
+        return ApiError(
+            code="DEADLINE_EXCEEDED",
+            http_status=None,
+            retryable=True,
+            message="Deadline exceeded before the request could be sent.",
+        )
+
+    def _may_retry(self) -> bool:
+        return self.retry_budget is None or self.retry_budget.try_spend()
+
+    def _spool(
+        self, state: _JobState, action: str, path: str, body: Optional[Dict[str, Any]], client_timestamp: float
+    ) -> Generator[RequestStep, Any, None]:
+        if self.outbox is None:
+            return
         try:
-            processing_ms = float(processing)
-        except (TypeError, ValueError):
-            processing_ms = 0.0
-
-        next_expected = payload.get("next_expected")
-        return {
-            "ok": True,
-            "action": str(payload.get("action", action)),
-            "jobKey": str(payload.get("job_key", self.job_key)),
-            "timestamp": str(payload.get("timestamp", "")),
-            "processingTimeMs": processing_ms,
-            "nextExpected": str(next_expected) if next_expected is not None else None,
-            "raw": payload,
-        }
+            yield _STORE, (self.outbox.append, (self.base_url, state.job_key, action, path, body, client_timestamp))
+        except SdkError:
+            # The delivery error is what the caller needs to see, not the spool failure.
+            return
+        self._outbox_dirty = True
+
+    def _replay_flow(self, event: OutboxEvent, deadline_ms: Optional[int] = None) -> RequestFlow:
+        body = dict(event.body)
+        body["client_timestamp"] = event.client_timestamp
+        # The outbox may hold events of other keys sharing this directory.
+        state = self._state if event.job_key == self.job_key else _JobState(event.job_key)
+        return self._request_flow(
+            state, event.action, event.path, body, base_url=event.base_url, spool=False, deadline_ms=deadline_ms
+        )
+
+    def _remaining_budget_ms(self, started: float, deadline_ms: Optional[int]) -> Optional[int]:
+        budget_ms = self.deadline_ms if deadline_ms is None else int(deadline_ms)
+        if budget_ms <= 0:
+            return None
+        # At least 1 ms: zero would read as "no deadline" further down.
+        return max(1, budget_ms - int((time.monotonic() - started) * 1000))
+
+    def _queue_behind_outbox(
+        self, state: _JobState, action: str, path: str, body: Optional[Dict[str, Any]]
+    ) -> Generator[RequestStep, Any, bool]:
+        # While this job still has spooled events, a new one is appended behind them instead of
+        # overtaking them; the error that stopped the replay is what the caller sees.
+        if self.outbox is None:
+            return False
+        try:
+            pending = yield _STORE, (self.outbox.has_pending, (self.base_url, state.job_key))
+        except SdkError:
+            return False
+        if not pending:
+            return False
+        yield from self._spool(state, action, path, body, time.time())
+        return True
+
+    def _drain_flow(self, limit: Optional[int], deadline_ms: Optional[int]) -> DrainFlow:
+        # Returns the number replayed and the error that stopped the replay early, if any.
+        outbox = self.outbox
+        if outbox is None:
+            return 0, None
+        stop_at = time.monotonic() + deadline_ms / 1000.0 if deadline_ms else None
+        delivered = 0
+        while limit is None or delivered < limit:
+            batch = yield _STORE, (outbox.claim, (100 if limit is None else min(100, limit - delivered),))
+            if not batch:
+                self._outbox_dirty = False
+                break
+            for index, event in enumerate(batch):
+                remaining_ms = None if stop_at is None else int((stop_at - time.monotonic()) * 1000)
+                if remaining_ms is not None and remaining_ms <= 0:
+                    yield _STORE, (outbox.restore, (batch[index:],))
+                    return delivered, self._deadline_error()
+                try:
+                    yield from self._replay_flow(event, remaining_ms)
+                except ApiError as exc:
+                    if exc.retryable:
+                        yield _STORE, (outbox.restore, (batch[index:],))
+                        return delivered, exc
+                    # Rejected outright (e.g. unknown job); retrying later cannot help.
+                    continue
+                except GeneratorExit:
+                    # Closed mid-replay (a cancelled async caller): claimed events must not be lost.
+                    outbox.restore(batch[index:])
+                    raise
+                delivered += 1
+        return delivered, None
+
+    def _outbox_first_flow(
+        self,
+        state: _JobState,
+        action: str,
+        path: str,
+        body: Optional[Dict[str, Any]],
+        deadline_ms: Optional[int],
+    ) -> RequestFlow:
+        # Spooled events go out first so an outage cannot reorder a job's lifecycle.
+        started = time.monotonic()
+        try:
+            _, error = yield from self._drain_flow(None, self._remaining_budget_ms(started, deadline_ms))
+        except SdkError:
+            error = None
+        if error is not None:
+            queued = yield from self._queue_behind_outbox(state, action, path, body)
+            if queued:
+                raise error
+        deadline_ms = self._remaining_budget_ms(started, deadline_ms)
+        return (yield from self._request_flow(state, action, path, body, deadline_ms=deadline_ms))
+
+    def _local_result(self, state: _JobState, action: str, ok: bool = True, **flags: Any) -> PingResult:
+        # Result for calls answered without a round trip (queued, dropped, ...).
+        return PingResult(action, state.job_key, None, ok, flags or None)
 
     def _map_error(self, status: int) -> Dict[str, Any]:
         if status == 400:
@@ -162,19 +598,196 @@ class PingClient:
         return {"code": "UNKNOWN_ERROR", "retryable": False}
 
     def _assert_job_key(self, job_key: str) -> None:
-        if not re.fullmatch(r"[a-zA-Z0-9]{8}", job_key):
-            raise ValidationError("jobKey must be exactly 8 Base62 characters.")
+        _assert_job_key(job_key)
 
-    def _sleep_with_backoff(self, attempt: int) -> None:
+    def _backoff_seconds(self, attempt: int) -> float:
         base_ms = self.retry_backoff_ms * (2 ** max(0, attempt - 1))
-        jitter_ms = random.randint(0, max(0, self.retry_jitter_ms))
-        time.sleep((base_ms + jitter_ms) / 1000.0)
+        jitter_ms = _jitter_random().randint(0, max(0, self.retry_jitter_ms))
+        return (base_ms + jitter_ms) / 1000.0
 
-    def _safe_json(self, raw: str) -> Dict[str, Any]:
+    def _safe_json(self, raw: Union[str, bytes]) -> Dict[str, Any]:
+        return decode_object(raw, self.codec)
+
+
+class PingClient(_BaseClient):
+    def __init__(self, job_key: str, options: Optional[Dict[str, Any]] = None) -> None:
+        opts = options or {}
+        super().__init__(job_key, opts)
+        self.http_client: HttpClient = opts.get("http_client") or default_http_client()
+        self.sender: Optional[BackgroundSender] = opts.get("sender")
+        if self.sender is None and opts.get("background"):
+            from .background import BackgroundSender
+
+            self.sender = BackgroundSender(
+                queue_size=int(opts.get("queue_size", 1000)),
+                overflow=str(opts.get("overflow", "drop_oldest")),
+                coalesce_progress=bool(opts.get("coalesce_progress", True)),
+            )
+
+    def ping(self, deadline_ms: Optional[int] = None) -> PingResult:
+        return self._ping(self._state, deadline_ms)
+
+    def start(self, deadline_ms: Optional[int] = None) -> PingResult:
+        return self._start(self._state, deadline_ms)
+
+    def end(self, status: str = "success", deadline_ms: Optional[int] = None) -> PingResult:
+        return self._end(self._state, status, deadline_ms)
+
+    def success(self, deadline_ms: Optional[int] = None) -> PingResult:
+        return self._end(self._state, "success", deadline_ms)
+
+    def fail(self, deadline_ms: Optional[int] = None) -> PingResult:
+        return self._end(self._state, "fail", deadline_ms)
+
+    def progress(
+        self,
+        seq_or_options: ProgressInput = None,
+        message: Optional[str] = None,
+        deadline_ms: Optional[int] = None,
+    ) -> PingResult:
+        return self._progress(self._state, seq_or_options, message, deadline_ms)
+
+    def run(self) -> Run:
+        return self._run(self._state)
+
+    def track(self, iterable: Iterable[Any], total: Optional[int] = None, every_ms: int = 1000) -> Tracker:
+        return self._track(self, iterable, total, every_ms)
+
+    # The operations behind the public methods, for any job key's state; PingHandle calls these.
+
+    def _ping(self, state: _JobState, deadline_ms: Optional[int]) -> PingResult:
+        return self._request(state, "ping", state.ping_path, deadline_ms=deadline_ms)
+
+    def _start(self, state: _JobState, deadline_ms: Optional[int]) -> PingResult:
+        if self.defer_start_ms > 0:
+            return self._defer_start(state, deadline_ms)
+        return self._request(state, "start", state.start_path, deadline_ms=deadline_ms)
+
+    def _end(self, state: _JobState, status: str, deadline_ms: Optional[int]) -> PingResult:
+        path = state.end_path(status)
+        return self._request(state, "end", path, self._settle_deferred_start(state), deadline_ms)
+
+    def _progress(
+        self,
+        state: _JobState,
+        seq_or_options: ProgressInput,
+        message: Optional[str],
+        deadline_ms: Optional[int],
+    ) -> PingResult:
+        seq, msg = self._parse_progress(seq_or_options, message)
+        if self._throttle_progress and not self._allow_progress(state, seq, msg):
+            self._record_throttled()
+            return self._local_result(state, "progress", skipped=True)
+        return self._request(state, "progress", state.progress_path(seq), {"message": msg}, deadline_ms)
+
+    def _run(self, state: _JobState) -> Run:
+        from .monitor import Run
+
+        return Run(self, state)
+
+    def _track(self, reporter: Any, iterable: Iterable[Any], total: Optional[int], every_ms: int) -> Tracker:
+        # ``reporter`` is this client or a handle; the tracker calls its progress().
+        from .tracker import Tracker
+
+        return Tracker(reporter, iterable, total, every_ms)
+
+    def _defer_start(self, state: _JobState, deadline_ms: Optional[int]) -> PingResult:
+        self._settle_deferred_start(state)
+        deferred = _DeferredStart()
+        deferred.lock = threading.Lock()
+        deferred.timer = threading.Timer(
+            self.defer_start_ms / 1000.0, self._send_deferred_start, args=(state, deferred, deadline_ms)
+        )
+        deferred.timer.daemon = True
+        state.deferred_start = deferred
+        deferred.timer.start()
+        return self._local_result(state, "start", deferred=True)
+
+    def _send_deferred_start(self, state: _JobState, deferred: _DeferredStart, deadline_ms: Optional[int]) -> None:
+        with deferred.lock:  # type: ignore[union-attr]
+            if deferred.fired:
+                return
+            deferred.fired = True
+        try:
+            self._request(state, "start", state.start_path, {"started_at": deferred.started_at}, deadline_ms)
+        except SdkError:
+            pass
+
+    def _settle_deferred_start(self, state: _JobState) -> Optional[Dict[str, Any]]:
+        deferred = state.deferred_start
+        if deferred is None:
+            return None
+        state.deferred_start = None
+        with deferred.lock:  # type: ignore[union-attr]
+            fired = deferred.fired
+            deferred.fired = True
+        if fired:
+            # The start is (being) sent; let it land before end.
+            deferred.timer.join()
+        else:
+            deferred.timer.cancel()
+        return deferred.report()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        if self.sender is None:
+            return True
+        return self.sender.flush(timeout)
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        if self.sender is None:
+            return True
+        return self.sender.close(timeout)
+
+    def _request(
+        self,
+        state: _JobState,
+        action: str,
+        path: str,
+        body: Optional[Dict[str, Any]] = None,
+        deadline_ms: Optional[int] = None,
+    ) -> PingResult:
+        if self.sender is not None:
+            accepted = self.sender.submit(self, state, action, path, body, deadline_ms)
+            return self._local_result(state, action, ok=accepted, queued=accepted)
+        return self._deliver(state, action, path, body, deadline_ms)
+
+    def drain_outbox(self, limit: Optional[int] = None, deadline_ms: Optional[int] = None) -> int:
+        return self._drive(self._drain_flow(limit, deadline_ms))[0]
+
+    def _deliver(
+        self,
+        state: _JobState,
+        action: str,
+        path: str,
+        body: Optional[Dict[str, Any]] = None,
+        deadline_ms: Optional[int] = None,
+    ) -> PingResult:
+        if self._outbox_dirty:
+            return self._drive(self._outbox_first_flow(state, action, path, body, deadline_ms))
+        return self._drive(self._request_flow(state, action, path, body, deadline_ms=deadline_ms))
+
+    def _drive(self, flow: Generator[RequestStep, Any, _T]) -> _T:
         try:
-            decoded = json.loads(raw)
-            if isinstance(decoded, dict):
-                return decoded
-            return {"message": "Invalid JSON response"}
-        except json.JSONDecodeError:
-            return {"message": "Invalid JSON response"}
+            step, arg = next(flow)
+            while True:
+                if step == _SLEEP:
+                    time.sleep(arg)
+                    step, arg = flow.send(None)
+                    continue
+                if step == _STORE:
+                    method, args = arg
+                    try:
+                        stored = method(*args)
+                    except SdkError as exc:
+                        step, arg = flow.throw(exc)
+                        continue
+                    step, arg = flow.send(stored)
+                    continue
+                url, headers, encoded_body, timeout_ms = arg
+                try:
+                    outcome: Any = self.http_client.request("POST", url, headers, encoded_body, timeout_ms)
+                except SdkError as exc:
+                    outcome = exc
+                step, arg = flow.send(outcome)
+        except StopIteration as stop:
+            return stop.value
@@ -0,0 +1,100 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Optional, Protocol, Union
+
+from . import forksafe
+from .errors import SdkError
+
+# Codec modules are imported on first use so that importing the SDK (and the ``cronbeats`` CLI)
+# never pays for json/orjson.
+
+
+class JsonCodec(Protocol):
+    name: str
+
+    def dumps(self, obj: Any) -> bytes:
+        ...
+
+    def loads(self, raw: Union[str, bytes]) -> Any:
+        # Must raise ValueError (or a subclass) for malformed input.
+        ...
+
+
+class StdlibJsonCodec:
+    name = "json"
+
+    def __init__(self) -> None:
+        import json
+
+        self._dumps = json.JSONEncoder(separators=(",", ":")).encode
+        self.loads = json.loads
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._dumps(obj).encode("utf-8")
+
+
+class OrjsonCodec:
+    name = "orjson"
+
+    def __init__(self) -> None:
+        import orjson
+
+        # orjson already produces compact UTF-8 bytes, and its JSONDecodeError is a ValueError.
+        self.dumps = orjson.dumps
+        self.loads = orjson.loads
+
+
+class UjsonCodec:
+    name = "ujson"
+
+    def __init__(self) -> None:
+        import ujson
+
+        self._dumps = ujson.dumps
+        self.loads = ujson.loads
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._dumps(obj, ensure_ascii=False, escape_forward_slashes=False).encode("utf-8")
+
+
+_CODECS = {
+    "json": StdlibJsonCodec,
+    "orjson": OrjsonCodec,
+    "ujson": UjsonCodec,
+}
+
+_instances: dict = {}
+_lock = threading.Lock()
+forksafe.reset_locks(globals(), "_lock")
+
+
+def get_codec(spec: Union[str, JsonCodec, None] = None) -> JsonCodec:
+    # ``spec`` is a codec name ("auto" picks orjson when installed, else stdlib json) or a codec object.
+    if spec is not None and not isinstance(spec, str):
+        return spec
+    name = spec or "auto"
+    codec: Optional[JsonCodec] = _instances.get(name)
+    if codec is not None:
+        return codec
+    with _lock:
+        codec = _instances.get(name)
+        if codec is None:
+            codec = _create(name)
+            _instances[name] = codec
+    return codec
+
+
+def _create(name: str) -> JsonCodec:
+    if name == "auto":
+        try:
+            return OrjsonCodec()
+        except ImportError:
+            return StdlibJsonCodec()
+    factory = _CODECS.get(name)
+    if factory is None:
+        raise SdkError(f"Unknown JSON codec {name!r}; expected one of auto, {', '.join(_CODECS)}.")
+    try:
+        return factory()
+    except ImportError as exc:
+        raise SdkError(f"JSON codec {name!r} is not installed.") from exc
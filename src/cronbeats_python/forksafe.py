@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import os
+import threading
+import weakref
+from typing import Any, Callable, Dict, List
+
+# A forked child inherits locks that may be held by parent threads that no longer exist, keep-alive
+# sockets shared with the parent and sender queues without their thread. Stateful objects register
+# here and get fresh state in the child: ``_reset_after_fork()`` when they define it, otherwise a
+# new ``_lock``.
+
+_objects: "weakref.WeakSet[Any]" = weakref.WeakSet()
+_hooks: List[Callable[[], None]] = []
+
+
+def track(obj: Any) -> None:
+    _objects.add(obj)
+
+
+def on_fork(hook: Callable[[], None]) -> Callable[[], None]:
+    _hooks.append(hook)
+    return hook
+
+
+def reset_locks(namespace: Dict[str, Any], *names: str) -> None:
+    # For module-level locks: ``reset_locks(globals(), "_registry_lock")``.
+    def reset() -> None:
+        for name in names:
+            namespace[name] = threading.Lock()
+
+    on_fork(reset)
+
+
+def _after_fork_in_child() -> None:
+    for hook in list(_hooks):
+        try:
+            hook()
+        except Exception:
+            pass
+    for obj in list(_objects):
+        try:
+            reset = getattr(obj, "_reset_after_fork", None)
+            if reset is not None:
+                reset()
+            else:
+                obj._lock = threading.Lock()
+        except Exception:
+            # One broken object must not leave the rest of the SDK in the parent's state.
+            pass
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_after_fork_in_child)
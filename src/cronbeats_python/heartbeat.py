@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional
+
+from . import forksafe
+from .errors import SdkError, ValidationError
+
+if TYPE_CHECKING:
+    import asyncio
+    import random
+
+    from .registry import PingHandle, PingRegistry
+
+
+class _Heartbeat:
+    __slots__ = ("handle", "interval_s", "timer", "paused", "in_flight")
+
+    def __init__(self, handle: PingHandle, interval_s: float) -> None:
+        self.handle = handle
+        self.interval_s = interval_s
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.paused = False
+        self.in_flight = False
+
+
+class HeartbeatScheduler:
+    # Periodic ping() for any number of job keys from one thread: an event loop whose timer heap
+    # (loop.call_at) orders the beats, sending through an AsyncPingClient registry so every key
+    # shares one pooled transport. Each beat is rescheduled with +/- ``jitter`` (a fraction of
+    # the interval) and the first beat lands at a random point in the first interval, so a
+    # fleet started together spreads out. A beat whose previous ping is still in flight is
+    # skipped rather than queued.
+    def __init__(
+        self,
+        options: Optional[Dict[str, Any]] = None,
+        interval_s: float = 30.0,
+        jitter: float = 0.1,
+        max_in_flight: int = 100,
+    ) -> None:
+        if interval_s <= 0:
+            raise ValidationError("interval_s must be positive.")
+        from .registry import PingRegistry
+
+        self.registry: PingRegistry = PingRegistry(options, asyncio=True)
+        self.interval_s = float(interval_s)
+        self.jitter = min(max(float(jitter), 0.0), 1.0)
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.sent = 0
+        self.failed = 0
+        self.skipped = 0
+        self._beats: Dict[str, _Heartbeat] = {}
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._rng: Optional[random.Random] = None
+        forksafe.track(self)
+
+    def add(self, job_key: str, interval_s: Optional[float] = None) -> None:
+        interval = self.interval_s if interval_s is None else float(interval_s)
+        if interval <= 0:
+            raise ValidationError("interval_s must be positive.")
+        handle = self.registry.get(job_key)
+        self._call(self._add, handle, interval)
+
+    def remove(self, job_key: str) -> None:
+        self._call(self._remove, job_key)
+
+    def pause(self, job_key: str) -> None:
+        self._call(self._pause, job_key)
+
+    def resume(self, job_key: str) -> None:
+        self._call(self._resume, job_key)
+
+    def __len__(self) -> int:
+        return len(self._beats)
+
+    def __contains__(self, job_key: object) -> bool:
+        return job_key in self._beats
+
+    def stats(self) -> Dict[str, Any]:
+        return self.registry.stats()
+
+    def start(self) -> None:
+        # Only needed to restart after stop(); add() starts the thread on first use.
+        with self._lock:
+            if self._loop is None:
+                self._start_loop()
+
+    def stop(self, timeout: Optional[float] = None) -> bool:
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+        if loop is None or thread is None:
+            return True
+        loop.call_soon_threadsafe(lambda: loop.create_task(self._shutdown(timeout)))
+        thread.join(None if timeout is None else timeout + 1.0)
+        return not thread.is_alive()
+
+    def _call(self, func: Callable[..., None], *args: Any) -> None:
+        with self._lock:
+            loop = self._loop
+            if loop is None:
+                loop = self._start_loop()
+        loop.call_soon_threadsafe(func, *args)
+
+    def _start_loop(self) -> asyncio.AbstractEventLoop:
+        import asyncio
+        import random
+
+        loop = asyncio.new_event_loop()
+        ready = threading.Event()
+        self._rng = random.Random()
+        self._loop = loop
+        self._thread = threading.Thread(target=self._run, args=(loop, ready), name="cronbeats-heartbeat", daemon=True)
+        self._thread.start()
+        ready.wait()
+        # Keys kept across a stop()/start or a fork get their timers back.
+        for beat in self._beats.values():
+            beat.timer = None
+            beat.in_flight = False
+            loop.call_soon_threadsafe(self._schedule, beat, True)
+        return loop
+
+    def _run(self, loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        import asyncio
+
+        asyncio.set_event_loop(loop)
+        self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        ready.set()
+        try:
+            loop.run_forever()
+        finally:
+            loop.close()
+
+    async def _shutdown(self, timeout: Optional[float]) -> None:
+        import asyncio
+
+        loop = asyncio.get_running_loop()
+        for beat in self._beats.values():
+            if beat.timer is not None:
+                beat.timer.cancel()
+                beat.timer = None
+        pending = [task for task in asyncio.all_tasks(loop) if task is not asyncio.current_task()]
+        if pending:
+            await asyncio.wait(pending, timeout=timeout)
+        loop.stop()
+
+    def _add(self, handle: PingHandle, interval_s: float) -> None:
+        beat = self._beats.get(handle.job_key)
+        if beat is not None:
+            beat.interval_s = interval_s
+            return
+        beat = self._beats[handle.job_key] = _Heartbeat(handle, interval_s)
+        self._schedule(beat, True)
+
+    def _remove(self, job_key: str) -> None:
+        beat = self._beats.pop(job_key, None)
+        if beat is not None and beat.timer is not None:
+            beat.timer.cancel()
+        self.registry.discard(job_key)
+
+    def _pause(self, job_key: str) -> None:
+        beat = self._beats.get(job_key)
+        if beat is not None and not beat.paused:
+            beat.paused = True
+            if beat.timer is not None:
+                beat.timer.cancel()
+                beat.timer = None
+
+    def _resume(self, job_key: str) -> None:
+        beat = self._beats.get(job_key)
+        if beat is not None and beat.paused:
+            beat.paused = False
+            # Report liveness right away; the worker may have been paused for a while.
+            self._schedule(beat, False, 0.0)
+
+    def _schedule(self, beat: _Heartbeat, first: bool, delay: Optional[float] = None) -> None:
+        loop = self._loop
+        if loop is None or beat.paused:
+            return
+        if delay is None:
+            rng = self._rng
+            if first:
+                delay = rng.uniform(0.0, beat.interval_s)  # type: ignore[union-attr]
+            else:
+                spread = beat.interval_s * self.jitter
+                delay = beat.interval_s + rng.uniform(-spread, spread)  # type: ignore[union-attr]
+        beat.timer = loop.call_at(loop.time() + delay, self._fire, beat)
+
+    def _fire(self, beat: _Heartbeat) -> None:
+        beat.timer = None
+        if self._beats.get(beat.handle.job_key) is not beat or beat.paused:
+            return
+        self._schedule(beat, False)
+        if beat.in_flight:
+            self.skipped += 1
+            return
+        beat.in_flight = True
+        self._loop.create_task(self._beat(beat))  # type: ignore[union-attr]
+
+    async def _beat(self, beat: _Heartbeat) -> None:
+        try:
+            async with self._semaphore:  # type: ignore[union-attr]
+                await beat.handle.ping()
+            self.sent += 1
+        except SdkError:
+            self.failed += 1
+        finally:
+            beat.in_flight = False
+
+    def _reset_after_fork(self) -> None:
+        # The loop thread did not survive the fork; the next add/pause/resume starts a new one
+        # and reschedules every key.
+        self._lock = threading.Lock()
+        self._loop = None
+        self._thread = None
@@ -1,19 +1,42 @@
 from __future__ import annotations
 
-import socket
+import threading
+import time
 from dataclasses import dataclass
-from typing import Dict, Optional, Protocol
-from urllib.error import HTTPError, URLError
-from urllib.request import Request, urlopen
+from time import perf_counter_ns
+from typing import TYPE_CHECKING, Dict, List, Optional, Protocol, Tuple, Union
 
+from . import forksafe
 from .errors import SdkError
+from .transport_cache import DnsCache, shared_dns_cache, shared_ssl_context
+
+if TYPE_CHECKING:
+    import ssl
+    from http.client import HTTPConnection
+
+# http.client, ssl, socket and urllib are imported on first use rather than at import time;
+# together they are most of the SDK's import cost, which matters for the ``cronbeats`` CLI.
+
+
+# Request and response bodies may be text or raw bytes; the built-in transports send and return
+# bytes so nothing is decoded or re-encoded on the way through.
+Body = Union[str, bytes]
+
+
+def _to_bytes(body: Optional[Body]) -> Optional[bytes]:
+    if body is None or isinstance(body, bytes):
+        return body
+    return body.encode("utf-8")
 
 
 @dataclass
 class HttpResponse:
     status: int
-    body: str
+    body: Body
     headers: Dict[str, str]
+    # Per-phase durations in nanoseconds (dns_ns, connect_ns, tls_ns, send_ns, first_byte_ns,
+    # read_ns, reused) for transports that measure them.
+    timings: Optional[Dict[str, int]] = None
 
 
 class HttpClient(Protocol):
@@ -22,7 +45,7 @@ class HttpClient(Protocol):
         method: str,
         url: str,
         headers: Dict[str, str],
-        body: Optional[str],
+        body: Optional[Body],
         timeout_ms: int,
     ) -> HttpResponse:
         ...
@@ -34,23 +57,295 @@ class UrllibHttpClient:
         method: str,
         url: str,
         headers: Dict[str, str],
-        body: Optional[str],
+        body: Optional[Body],
         timeout_ms: int,
     ) -> HttpResponse:
-        data = body.encode("utf-8") if body is not None else None
-        req = Request(url=url, data=data, method=method)
-        for key, value in headers.items():
-            req.add_header(key, value)
+        import socket
+        from urllib.error import HTTPError, URLError
+        from urllib.request import Request, urlopen
+
+        req = Request(url=url, data=_to_bytes(body), headers=headers, method=method)
+        context = shared_ssl_context() if url.startswith("https:") else None
 
         timeout_seconds = max(1, timeout_ms) / 1000.0
         try:
-            with urlopen(req, timeout=timeout_seconds) as res:
-                text = res.read().decode("utf-8")
+            with urlopen(req, timeout=timeout_seconds, context=context) as res:
+                payload = res.read()
                 response_headers = {k.lower(): v for k, v in res.headers.items()}
-                return HttpResponse(status=res.status, body=text, headers=response_headers)
+                return HttpResponse(status=res.status, body=payload, headers=response_headers)
         except HTTPError as exc:
-            error_text = exc.read().decode("utf-8") if exc.fp else ""
+            error_text = exc.read() if exc.fp else b""
             error_headers = {k.lower(): v for k, v in exc.headers.items()} if exc.headers else {}
             return HttpResponse(status=exc.code, body=error_text, headers=error_headers)
         except (URLError, socket.timeout, TimeoutError, OSError) as exc:
             raise SdkError(str(exc)) from exc
+
+
+PoolKey = Tuple[str, str, int]
+# Pool key and request target for a URL, or None when the URL goes through a proxy.
+Target = Optional[Tuple[PoolKey, str]]
+_UNSPLIT = (("", "", 0), "")
+
+
+def _proxy_for(scheme: str, host: str) -> Optional[str]:
+    # Same rules urlopen() applies: *_proxy from the environment (or the OS settings) unless
+    # no_proxy excludes the host.
+    from urllib.request import getproxies, proxy_bypass
+
+    proxy = getproxies().get(scheme)
+    if proxy is None or proxy_bypass(host):
+        return None
+    return proxy
+
+
+def _uses_proxy(scheme: str, host: str) -> bool:
+    return _proxy_for(scheme, host) is not None
+
+
+class PooledHttpClient:
+    def __init__(
+        self,
+        max_idle_per_host: int = 4,
+        idle_timeout_s: float = 30.0,
+        ssl_context: Optional[ssl.SSLContext] = None,
+        dns_cache: Optional[DnsCache] = None,
+    ) -> None:
+        self.max_idle_per_host = max(0, int(max_idle_per_host))
+        self.idle_timeout_s = float(idle_timeout_s)
+        self._lock = threading.Lock()
+        self._idle: Dict[PoolKey, List[Tuple[float, HTTPConnection]]] = {}
+        # Both default to the process-wide caches shared with every other transport.
+        self._ssl_context = ssl_context
+        self.dns_cache = dns_cache or shared_dns_cache()
+        forksafe.track(self)
+        # Clients hit the same handful of URLs over and over; remember how each one splits.
+        self._targets: Dict[str, Target] = {}
+        # Proxied URLs are left to urllib, which speaks to HTTP proxies and CONNECT tunnels.
+        self._proxy_client = UrllibHttpClient()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        body: Optional[Body],
+        timeout_ms: int,
+    ) -> HttpResponse:
+        from http.client import HTTPException, RemoteDisconnected
+
+        cached = self._targets.get(url, _UNSPLIT)
+        if cached is _UNSPLIT:
+            cached = self._split_target(url)
+        if cached is None:
+            return self._proxy_client.request(method, url, headers, body, timeout_ms)
+        key, target = cached
+
+        data = _to_bytes(body)
+        timeout_seconds = max(1, timeout_ms) / 1000.0
+
+        while True:
+            timings: Dict[str, int] = {}
+            conn: Optional[HTTPConnection] = None
+            reused = False
+            try:
+                conn, reused = self._acquire(key, timeout_seconds, timings)
+                started = perf_counter_ns()
+                conn.request(method, target, body=data, headers=headers)
+                sent = perf_counter_ns()
+                res = conn.getresponse()
+                first_byte = perf_counter_ns()
+                payload = res.read()
+                done = perf_counter_ns()
+            except (RemoteDisconnected, BrokenPipeError, ConnectionResetError, ConnectionAbortedError) as exc:
+                # A reused keep-alive socket may have been closed by the server while idle.
+                if conn is not None:
+                    conn.close()
+                if reused:
+                    continue
+                raise SdkError(str(exc)) from exc
+            except (HTTPException, OSError) as exc:
+                if conn is not None:
+                    conn.close()
+                raise SdkError(str(exc)) from exc
+
+            timings["send_ns"] = sent - started
+            timings["first_byte_ns"] = first_byte - sent
+            timings["read_ns"] = done - first_byte
+            timings["reused"] = int(reused)
+
+            if res.will_close:
+                conn.close()
+            else:
+                self._release(key, conn)
+
+            response_headers = {k.lower(): v for k, v in res.getheaders()}
+            return HttpResponse(status=res.status, body=payload, headers=response_headers, timings=timings)
+
+    def _split_target(self, url: str) -> Target:
+        from urllib.parse import urlsplit
+
+        parts = urlsplit(url)
+        scheme = parts.scheme.lower()
+        if scheme not in ("http", "https") or not parts.hostname:
+            raise SdkError(f"Unsupported URL: {url}")
+        cached: Target = None
+        if not _uses_proxy(scheme, parts.hostname):
+            key: PoolKey = (scheme, parts.hostname, parts.port or (443 if scheme == "https" else 80))
+            target = parts.path or "/"
+            if parts.query:
+                target = f"{target}?{parts.query}"
+            cached = (key, target)
+        if len(self._targets) >= 1024:
+            self._targets.clear()
+        self._targets[url] = cached
+        return cached
+
+    def close(self) -> None:
+        with self._lock:
+            pools = list(self._idle.values())
+            self._idle.clear()
+        for pool in pools:
+            for _, conn in pool:
+                conn.close()
+
+    def _reset_after_fork(self) -> None:
+        # The idle sockets are shared with the parent; close the child's copies and start over.
+        idle = self._idle
+        self._lock = threading.Lock()
+        self._idle = {}
+        for pool in idle.values():
+            for _, conn in pool:
+                conn.close()
+
+    def _acquire(
+        self, key: PoolKey, timeout_seconds: float, timings: Dict[str, int]
+    ) -> Tuple[HTTPConnection, bool]:
+        now = time.monotonic()
+        expired: List[HTTPConnection] = []
+        found: Optional[HTTPConnection] = None
+
+        with self._lock:
+            pool = self._idle.get(key)
+            while pool:
+                idle_since, conn = pool.pop()
+                if now - idle_since > self.idle_timeout_s:
+                    expired.append(conn)
+                    continue
+                found = conn
+                break
+            # Everything left below the popped entry is older still; reap it too.
+            if pool:
+                stale = [c for since, c in pool if now - since > self.idle_timeout_s]
+                if stale:
+                    pool[:] = [(since, c) for since, c in pool if now - since <= self.idle_timeout_s]
+                    expired.extend(stale)
+
+        for conn in expired:
+            conn.close()
+
+        if found is not None:
+            if self._is_dropped(found):
+                found.close()
+            else:
+                if found.sock is not None:
+                    found.sock.settimeout(timeout_seconds)
+                found.timeout = timeout_seconds
+                return found, True
+
+        return self._connect(key, timeout_seconds, timings), False
+
+    def _connect(self, key: PoolKey, timeout_seconds: float, timings: Dict[str, int]) -> HTTPConnection:
+        # Resolve, connect and handshake by hand (rather than in HTTPConnection.connect) so each
+        # phase can be timed separately.
+        import socket
+        from http.client import HTTPConnection, HTTPSConnection
+
+        scheme, host, port = key
+        started = perf_counter_ns()
+        addresses = self.dns_cache.resolve(host, port)
+        resolved = perf_counter_ns()
+
+        sock: Optional[socket.socket] = None
+        last_error: Optional[OSError] = None
+        for family, socktype, proto, _, address in addresses:
+            candidate = socket.socket(family, socktype, proto)
+            candidate.settimeout(timeout_seconds)
+            try:
+                candidate.connect(address)
+            except OSError as exc:
+                candidate.close()
+                last_error = exc
+                continue
+            sock = candidate
+            break
+        if sock is None:
+            # The cached addresses may be stale; resolve afresh next time.
+            self.dns_cache.invalidate(host, port)
+            raise last_error or OSError(f"Could not connect to {host}:{port}")
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        connected = perf_counter_ns()
+
+        conn: HTTPConnection
+        if scheme == "https":
+            context = self._get_ssl_context()
+            try:
+                sock = context.wrap_socket(sock, server_hostname=host)
+            except OSError:
+                sock.close()
+                raise
+            conn = HTTPSConnection(host, port, timeout=timeout_seconds, context=context)
+        else:
+            conn = HTTPConnection(host, port, timeout=timeout_seconds)
+        conn.sock = sock
+        handshaken = perf_counter_ns()
+
+        timings["dns_ns"] = resolved - started
+        timings["connect_ns"] = connected - resolved
+        timings["tls_ns"] = handshaken - connected if scheme == "https" else 0
+        return conn
+
+    def _get_ssl_context(self) -> ssl.SSLContext:
+        if self._ssl_context is None:
+            self._ssl_context = shared_ssl_context()
+        return self._ssl_context
+
+    def _release(self, key: PoolKey, conn: HTTPConnection) -> None:
+        with self._lock:
+            pool = self._idle.setdefault(key, [])
+            if len(pool) < self.max_idle_per_host:
+                pool.append((time.monotonic(), conn))
+                return
+        conn.close()
+
+    def _is_dropped(self, conn: HTTPConnection) -> bool:
+        # An idle keep-alive socket that polls readable has either been closed by
+        # the server (EOF) or received unsolicited data; both make it unusable.
+        import select
+
+        sock = conn.sock
+        if sock is None:
+            return True
+        try:
+            if hasattr(select, "poll"):
+                # select.select() cannot take fds >= FD_SETSIZE (1024), which busy processes reach.
+                poller = select.poll()
+                poller.register(sock, select.POLLIN)
+                return bool(poller.poll(0))
+            readable, _, _ = select.select([sock], [], [], 0)
+        except (OSError, ValueError):
+            return True
+        return bool(readable)
+
+
+_default_http_client: Optional[PooledHttpClient] = None
+_default_lock = threading.Lock()
+forksafe.reset_locks(globals(), "_default_lock")
+
+
+def default_http_client() -> PooledHttpClient:
+    global _default_http_client
+    if _default_http_client is None:
+        with _default_lock:
+            if _default_http_client is None:
+                _default_http_client = PooledHttpClient()
+    return _default_http_client
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+from typing import Callable, Dict, List, Optional
+
+
+class AttemptTiming:
+    __slots__ = (
+        "attempt",
+        "status",
+        "error",
+        "retry_reason",
+        "duration_ns",
+        "dns_ns",
+        "connect_ns",
+        "tls_ns",
+        "send_ns",
+        "first_byte_ns",
+        "read_ns",
+        "decode_ns",
+        "reused_connection",
+    )
+
+    def __init__(self, attempt: int, duration_ns: int) -> None:
+        self.attempt = attempt
+        self.duration_ns = duration_ns
+        self.status: Optional[int] = None
+        self.error: Optional[str] = None
+        self.retry_reason: Optional[str] = None
+        self.dns_ns: Optional[int] = None
+        self.connect_ns: Optional[int] = None
+        self.tls_ns: Optional[int] = None
+        self.send_ns: Optional[int] = None
+        self.first_byte_ns: Optional[int] = None
+        self.read_ns: Optional[int] = None
+        self.decode_ns: Optional[int] = None
+        self.reused_connection: Optional[bool] = None
+
+    def apply_transport_timings(self, timings: Optional[Dict[str, int]]) -> None:
+        if not timings:
+            return
+        self.dns_ns = timings.get("dns_ns")
+        self.connect_ns = timings.get("connect_ns")
+        self.tls_ns = timings.get("tls_ns")
+        self.send_ns = timings.get("send_ns")
+        self.first_byte_ns = timings.get("first_byte_ns")
+        self.read_ns = timings.get("read_ns")
+        if "reused" in timings:
+            self.reused_connection = bool(timings["reused"])
+
+
+class RequestEvent:
+    __slots__ = ("action", "job_key", "url", "outcome", "encode_ns", "total_ns", "attempts", "_started_ns")
+
+    def __init__(self, action: str, job_key: str, url: str, started_ns: int) -> None:
+        self.action = action
+        self.job_key = job_key
+        self.url = url
+        # "ok", or the ApiError code the call ended with.
+        self.outcome = ""
+        self.encode_ns = 0
+        self.total_ns = 0
+        self.attempts: List[AttemptTiming] = []
+        self._started_ns = started_ns
+
+    @property
+    def retries(self) -> int:
+        return max(0, len(self.attempts) - 1)
+
+
+class Instrumentation:
+    def on_request_complete(self, event: RequestEvent) -> None:
+        pass
+
+
+RequestHook = Callable[[RequestEvent], None]
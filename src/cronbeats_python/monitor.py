@@ -0,0 +1,182 @@
+from __future__ import annotations
+
+import functools
+import inspect
+import threading
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, TypeVar, Union
+
+from .errors import SdkError
+
+if TYPE_CHECKING:
+    import asyncio
+
+    from .async_client import AsyncPingClient
+    from .client import PingClient, _JobState
+    from .registry import PingHandle
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+
+def _end_body(duration_ms: float, deferred: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    # A held-back start contributes its started_at; the run's own duration wins.
+    body = dict(deferred) if deferred else {}
+    body["duration_ms"] = round(duration_ms, 3)
+    return body
+
+
+def _succeeded(exc_type: Any, exc: Any) -> bool:
+    # sys.exit() / sys.exit(0) is a clean finish, as is a generator closed early.
+    if exc_type is None or issubclass(exc_type, GeneratorExit):
+        return True
+    return issubclass(exc_type, SystemExit) and getattr(exc, "code", None) in (None, 0)
+
+
+class Run:
+    # ``with client.run():`` sends start (off the job's critical path) on entry and
+    # end/success or end/fail with the measured duration on exit. Telemetry errors are kept in
+    # ``error`` and never raised into the job; the job's own exceptions always propagate.
+    def __init__(self, client: PingClient, state: _JobState) -> None:
+        self.client = client
+        self.state = state
+        self.started: Optional[float] = None
+        self.duration_ms: Optional[float] = None
+        self.error: Optional[SdkError] = None
+        self._start_thread: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "Run":
+        self.started = perf_counter()
+        if self.client.sender is not None or self.client.defer_start_ms > 0:
+            # Background mode and deferred starts already return immediately.
+            self._send_start()
+        else:
+            self._start_thread = threading.Thread(target=self._send_start, name="cronbeats-start", daemon=True)
+            self._start_thread.start()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.finish(_succeeded(exc_type, exc))
+
+    def finish(self, ok: bool) -> None:
+        self.duration_ms = (perf_counter() - (self.started or perf_counter())) * 1000.0
+        if self._start_thread is not None:
+            # start must reach the server before end does.
+            self._start_thread.join()
+            self._start_thread = None
+        client = self.client
+        try:
+            body = _end_body(self.duration_ms, client._settle_deferred_start(self.state))
+            client._request(self.state, "end", self.state.end_path("success" if ok else "fail"), body)
+        except SdkError as exc:
+            self.error = exc
+
+    def _send_start(self) -> None:
+        try:
+            self.client._start(self.state, None)
+        except SdkError as exc:
+            self.error = exc
+
+
+class AsyncRun:
+    # ``async with client.run():`` for AsyncPingClient; start runs as a task alongside the job.
+    def __init__(self, client: AsyncPingClient, state: _JobState) -> None:
+        self.client = client
+        self.state = state
+        self.started: Optional[float] = None
+        self.duration_ms: Optional[float] = None
+        self.error: Optional[SdkError] = None
+        self._start_task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self) -> "AsyncRun":
+        import asyncio
+
+        self.started = perf_counter()
+        self._start_task = asyncio.ensure_future(self._send_start())
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        await self.finish(_succeeded(exc_type, exc))
+
+    async def finish(self, ok: bool) -> None:
+        self.duration_ms = (perf_counter() - (self.started or perf_counter())) * 1000.0
+        if self._start_task is not None:
+            await self._start_task
+            self._start_task = None
+        client = self.client
+        try:
+            body = _end_body(self.duration_ms, await client._settle_deferred_start(self.state))
+            await client._request(self.state, "end", self.state.end_path("success" if ok else "fail"), body)
+        except SdkError as exc:
+            self.error = exc
+
+    async def _send_start(self) -> None:
+        try:
+            await self.client._start(self.state, None)
+        except SdkError as exc:
+            self.error = exc
+
+
+def monitor(
+    job_key: Union[str, PingClient, AsyncPingClient, PingHandle], options: Optional[Dict[str, Any]] = None
+) -> Callable[[F], F]:
+    # Decorates sync/async functions and generators. The client is created on first call (a
+    # PingClient, or an AsyncPingClient for coroutines and async generators) unless a client or
+    # registry handle is passed. A malformed key is rejected here, at decoration time, rather
+    # than on a call where it would stop the job from running.
+    if isinstance(job_key, str):
+        from .client import _assert_job_key
+
+        _assert_job_key(job_key)
+
+    def decorate(func: F) -> F:
+        is_async = inspect.iscoroutinefunction(func) or inspect.isasyncgenfunction(func)
+        clients: list = [] if isinstance(job_key, str) else [job_key]
+
+        def get_client() -> Any:
+            if not clients:
+                if is_async:
+                    from .async_client import AsyncPingClient
+
+                    clients.append(AsyncPingClient(str(job_key), options))
+                else:
+                    from .client import PingClient
+
+                    clients.append(PingClient(str(job_key), options))
+            return clients[0]
+
+        if inspect.isasyncgenfunction(func):
+
+            @functools.wraps(func)
+            async def async_gen_wrapper(*args: Any, **kwargs: Any) -> Any:
+                async with get_client().run():
+                    async for item in func(*args, **kwargs):
+                        yield item
+
+            return async_gen_wrapper  # type: ignore[return-value]
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                async with get_client().run():
+                    return await func(*args, **kwargs)
+
+            return async_wrapper  # type: ignore[return-value]
+
+        if inspect.isgeneratorfunction(func):
+
+            @functools.wraps(func)
+            def gen_wrapper(*args: Any, **kwargs: Any) -> Any:
+                with get_client().run():
+                    return (yield from func(*args, **kwargs))
+
+            return gen_wrapper  # type: ignore[return-value]
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            with get_client().run():
+                return func(*args, **kwargs)
+
+        return wrapper  # type: ignore[return-value]
+
+    return decorate
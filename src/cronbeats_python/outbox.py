@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+from . import forksafe
+from .errors import SdkError
+
+# Connections inherited across fork(), kept referenced so they are never closed in the child.
+_abandoned: List[sqlite3.Connection] = []
+
+
+@dataclass
+class OutboxEvent:
+    id: int
+    base_url: str
+    job_key: str
+    action: str
+    path: str
+    body: Dict[str, Any]
+    client_timestamp: float
+
+
+class SqliteOutbox:
+    def __init__(self, directory: str, max_events: int = 10000) -> None:
+        self.directory = directory
+        self.path = os.path.join(directory, "outbox.sqlite3")
+        self.max_events = max(1, int(max_events))
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        forksafe.track(self)
+
+    def append(
+        self,
+        base_url: str,
+        job_key: str,
+        action: str,
+        path: str,
+        body: Optional[Dict[str, Any]],
+        client_timestamp: float,
+    ) -> None:
+        encoded = json.dumps(body or {}, separators=(",", ":"))
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO events (base_url, job_key, action, path, body, client_ts) VALUES (?, ?, ?, ?, ?, ?)",
+                (base_url, job_key, action, path, encoded, client_timestamp),
+            )
+            # Bound the spool during long outages by discarding the oldest events.
+            conn.execute(
+                "DELETE FROM events WHERE id <= (SELECT MAX(id) FROM events) - ?",
+                (self.max_events,),
+            )
+
+    def claim(self, limit: int = 100) -> List[OutboxEvent]:
+        # Claimed rows are deleted in the same transaction, so concurrent processes sharing
+        # the directory never replay the same event twice. Undelivered ones go back via restore().
+        with self._transaction() as conn:
+            rows = conn.execute(
+                "SELECT id, base_url, job_key, action, path, body, client_ts FROM events ORDER BY id LIMIT ?",
+                (max(1, int(limit)),),
+            ).fetchall()
+            if rows:
+                conn.execute("DELETE FROM events WHERE id <= ?", (rows[-1][0],))
+        return [
+            OutboxEvent(
+                id=row[0],
+                base_url=row[1],
+                job_key=row[2],
+                action=row[3],
+                path=row[4],
+                body=json.loads(row[5]),
+                client_timestamp=row[6],
+            )
+            for row in rows
+        ]
+
+    def restore(self, events: List[OutboxEvent]) -> None:
+        if not events:
+            return
+        with self._transaction() as conn:
+            conn.executemany(
+                "INSERT OR IGNORE INTO events (id, base_url, job_key, action, path, body, client_ts)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        e.id,
+                        e.base_url,
+                        e.job_key,
+                        e.action,
+                        e.path,
+                        json.dumps(e.body, separators=(",", ":")),
+                        e.client_timestamp,
+                    )
+                    for e in events
+                ],
+            )
+
+    def has_pending(self, base_url: str, job_key: str) -> bool:
+        with self._transaction() as conn:
+            row = conn.execute(
+                "SELECT 1 FROM events WHERE base_url = ? AND job_key = ? LIMIT 1", (base_url, job_key)
+            ).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        with self._transaction() as conn:
+            return int(conn.execute("SELECT COUNT(*) FROM events").fetchone()[0])
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def _reset_after_fork(self) -> None:
+        # SQLite connections must not cross fork(); closing the inherited one could checkpoint or
+        # unlink the parent's WAL, so it is parked unused and the child opens its own.
+        if self._conn is not None:
+            _abandoned.append(self._conn)
+        self._conn = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        with self._lock:
+            conn = self._connect()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+            except sqlite3.Error as exc:
+                raise SdkError(f"Outbox is unavailable: {exc}") from exc
+            try:
+                yield conn
+                conn.execute("COMMIT")
+            except sqlite3.Error as exc:
+                conn.execute("ROLLBACK")
+                raise SdkError(f"Outbox write failed: {exc}") from exc
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            try:
+                os.makedirs(self.directory, exist_ok=True)
+                conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None, check_same_thread=False)
+                conn.execute("PRAGMA journal_mode=WAL")
+                conn.execute("PRAGMA synchronous=NORMAL")
+                conn.execute(
+                    "CREATE TABLE IF NOT EXISTS events ("
+                    "id INTEGER PRIMARY KEY AUTOINCREMENT, base_url TEXT NOT NULL, job_key TEXT NOT NULL,"
+                    " action TEXT NOT NULL, path TEXT NOT NULL, body TEXT NOT NULL, client_ts REAL NOT NULL)"
+                )
+            except (OSError, sqlite3.Error) as exc:
+                raise SdkError(f"Failed to open outbox at {self.path}: {exc}") from exc
+            self._conn = conn
+        return self._conn
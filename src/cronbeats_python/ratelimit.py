@@ -0,0 +1,121 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict, Mapping, Optional
+
+from . import forksafe
+
+
+def parse_retry_after(value: Optional[str], now: Optional[float] = None) -> Optional[float]:
+    if value is None:
+        return None
+    value = value.strip()
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    from email.utils import parsedate_to_datetime
+
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if when is None:
+        return None
+    return max(0.0, when.timestamp() - (time.time() if now is None else now))
+
+
+def _header_number(headers: Mapping[str, str], *names: str) -> Optional[float]:
+    for name in names:
+        raw = headers.get(name)
+        if raw is None:
+            continue
+        try:
+            return float(raw.strip())
+        except ValueError:
+            continue
+    return None
+
+
+class TokenBucketLimiter:
+    def __init__(self, burst: float = 10.0) -> None:
+        self.burst = float(burst)
+        # Until the server advertises a quota the bucket does not limit anything.
+        self.rate: Optional[float] = None
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._rate_expires = 0.0
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+        forksafe.track(self)
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            wait = max(0.0, self._blocked_until - now)
+            if self.rate is not None and now >= self._rate_expires:
+                self.rate = None
+                self._tokens = self.burst
+            if self.rate is None:
+                return wait
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1.0
+            if self._tokens < 0:
+                wait = max(wait, -self._tokens / self.rate)
+            return wait
+
+    def observe(
+        self, status: int, headers: Mapping[str, str], max_block_s: Optional[float] = None
+    ) -> Optional[float]:
+        # ``max_block_s`` caps how long one answer may hold back every client sharing the bucket.
+        retry_after = parse_retry_after(headers.get("retry-after"))
+        remaining = _header_number(headers, "x-ratelimit-remaining", "ratelimit-remaining")
+        reset = _header_number(headers, "x-ratelimit-reset", "ratelimit-reset")
+        if reset is not None and reset > 1_000_000_000:
+            # Some servers send the reset as an epoch timestamp rather than a delay.
+            reset = max(0.0, reset - time.time())
+
+        with self._lock:
+            now = time.monotonic()
+            if retry_after is not None and (status == 429 or status == 503):
+                self._block(now, retry_after, max_block_s)
+            if remaining is not None and reset is not None:
+                window = max(reset, 1.0)
+                if remaining <= 0:
+                    self._block(now, reset, max_block_s)
+                # Spread what is left of the window evenly instead of bursting into the limit.
+                self.rate = max(remaining, 1.0) / window
+                self._tokens = min(self._tokens, max(remaining, 0.0), self.burst)
+                self._updated = now
+                self._rate_expires = now + window
+            elif status == 429 and retry_after is None:
+                # Throttled without guidance: halve the pace we were allowed so far.
+                current = self.rate if self.rate is not None else self.burst
+                self.rate = max(current / 2.0, 0.1)
+                self._tokens = min(self._tokens, 0.0)
+                self._updated = now
+                self._rate_expires = now + 60.0
+        return retry_after
+
+
+    def _block(self, now: float, seconds: float, max_block_s: Optional[float]) -> None:
+        if max_block_s is not None:
+            seconds = min(seconds, max_block_s)
+        self._blocked_until = max(self._blocked_until, now + seconds)
+
+
+_limiters: Dict[str, TokenBucketLimiter] = {}
+_limiters_lock = threading.Lock()
+forksafe.reset_locks(globals(), "_limiters_lock")
+
+
+def shared_limiter(base_url: str) -> TokenBucketLimiter:
+    limiter = _limiters.get(base_url)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.setdefault(base_url, TokenBucketLimiter())
+    return limiter
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Any, Awaitable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from . import forksafe
+from .errors import SdkError, ValidationError
+
+if TYPE_CHECKING:
+    from .async_client import AsyncPingClient
+    from .client import PingClient, ProgressInput
+    from .monitor import AsyncRun, Run
+    from .result import PingResult
+
+# (job_key, action, payload): action is ping, start, progress, end, success or fail. The payload
+# is the progress argument (seq, {"seq", "message"} or a message string) or the end status.
+BulkItem = Tuple[str, str, Any]
+BulkOutcome = Union["PingResult", SdkError]
+
+# Key of the registry's core client; handles always pass their own state.
+_CORE_KEY = "00000000"
+
+
+class PingHandle:
+    # Flyweight for one job key: a shared client plus the key's _JobState (interned paths,
+    # progress throttle and deferred start), which every call hands to the client. With an
+    # AsyncPingClient the methods return awaitables. Other attributes (stats(), flush(),
+    # base_url, ...) are the shared client's.
+    __slots__ = ("_client", "_state")
+
+    def __init__(self, client: Union[PingClient, AsyncPingClient], job_key: str) -> None:
+        from .client import _JobState
+
+        client._assert_job_key(job_key)
+        self._client = client
+        self._state = _JobState(job_key)
+
+    @property
+    def job_key(self) -> str:
+        return self._state.job_key
+
+    def ping(self, deadline_ms: Optional[int] = None) -> Any:
+        return self._client._ping(self._state, deadline_ms)
+
+    def start(self, deadline_ms: Optional[int] = None) -> Any:
+        return self._client._start(self._state, deadline_ms)
+
+    def end(self, status: str = "success", deadline_ms: Optional[int] = None) -> Any:
+        return self._client._end(self._state, status, deadline_ms)
+
+    def success(self, deadline_ms: Optional[int] = None) -> Any:
+        return self._client._end(self._state, "success", deadline_ms)
+
+    def fail(self, deadline_ms: Optional[int] = None) -> Any:
+        return self._client._end(self._state, "fail", deadline_ms)
+
+    def progress(
+        self, seq_or_options: ProgressInput = None, message: Optional[str] = None, deadline_ms: Optional[int] = None
+    ) -> Any:
+        return self._client._progress(self._state, seq_or_options, message, deadline_ms)
+
+    def run(self) -> Union[Run, AsyncRun]:
+        return self._client._run(self._state)
+
+    def track(self, iterable: Iterable[Any], total: Optional[int] = None, every_ms: int = 1000) -> Any:
+        return self._client._track(self, iterable, total, every_ms)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._client, name)
+
+    def __repr__(self) -> str:
+        return f"PingHandle({self.job_key!r})"
+
+
+class PingRegistry:
+    # One set of options, transport, limiter, breaker, stats, sender and outbox for any number
+    # of job keys; handles are created on first use and cached.
+    def __init__(self, options: Optional[Dict[str, Any]] = None, asyncio: bool = False) -> None:
+        self._asyncio = asyncio
+        if asyncio:
+            from .async_client import AsyncPingClient
+
+            self.client: Union[PingClient, AsyncPingClient] = AsyncPingClient(_CORE_KEY, options)
+        else:
+            from .client import PingClient
+
+            self.client = PingClient(_CORE_KEY, options)
+        self._handles: Dict[str, PingHandle] = {}
+        self._lock = threading.Lock()
+        forksafe.track(self)
+
+    def get(self, job_key: str) -> PingHandle:
+        handle = self._handles.get(job_key)
+        if handle is None:
+            with self._lock:
+                handle = self._handles.get(job_key)
+                if handle is None:
+                    handle = PingHandle(self.client, job_key)
+                    self._handles[handle.job_key] = handle
+        return handle
+
+    __getitem__ = get
+
+    def __contains__(self, job_key: object) -> bool:
+        return job_key in self._handles
+
+    def __len__(self) -> int:
+        return len(self._handles)
+
+    def discard(self, job_key: str) -> None:
+        with self._lock:
+            self._handles.pop(job_key, None)
+
+    def stats(self) -> Dict[str, Any]:
+        return self.client.stats()
+
+    def bulk_ping(
+        self, items: Iterable[BulkItem], concurrency: int = 16
+    ) -> Union[List[BulkOutcome], Awaitable[List[BulkOutcome]]]:
+        # Sends every item concurrently (a thread pool, or tasks on the running loop for an asyncio
+        # registry) and returns a result or the raised SdkError per item, in input order. Items for
+        # the same job key are not ordered relative to each other; send dependent calls in
+        # separate batches.
+        batch = list(items)
+        limit = max(1, int(concurrency))
+        if self._asyncio:
+            return self._bulk_async(batch, limit)
+        if not batch:
+            return []
+
+        def send(item: BulkItem) -> BulkOutcome:
+            try:
+                return self._dispatch(item)
+            except SdkError as exc:
+                return exc
+
+        if limit == 1 or len(batch) == 1:
+            return [send(item) for item in batch]
+        from concurrent.futures import ThreadPoolExecutor
+
+        with ThreadPoolExecutor(max_workers=min(limit, len(batch)), thread_name_prefix="cronbeats-bulk") as pool:
+            return list(pool.map(send, batch))
+
+    async def _bulk_async(self, batch: Sequence[BulkItem], limit: int) -> List[BulkOutcome]:
+        import asyncio
+
+        semaphore = asyncio.Semaphore(limit)
+
+        async def send(item: BulkItem) -> BulkOutcome:
+            async with semaphore:
+                try:
+                    return await self._dispatch(item)
+                except SdkError as exc:
+                    return exc
+
+        return list(await asyncio.gather(*(send(item) for item in batch)))
+
+    def _dispatch(self, item: BulkItem) -> Any:
+        job_key, action, payload = item
+        handle = self.get(job_key)
+        if action == "progress":
+            if isinstance(payload, str):
+                return handle.progress(None, payload)
+            return handle.progress(payload)
+        if action == "end":
+            if isinstance(payload, dict):
+                payload = payload.get("status")
+            return handle.end(payload or "success")
+        if action in ("ping", "start", "success", "fail"):
+            return getattr(handle, action)()
+        raise ValidationError(f"Unknown action {action!r}.")
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        # Only the sync client has a background sender to wait for.
+        flush = getattr(self.client, "flush", None)
+        return True if flush is None else flush(timeout)
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        close = getattr(self.client, "close", None)
+        return True if close is None else close(timeout)
+
+
+def bulk_ping(
+    items: Iterable[BulkItem], concurrency: int = 16, options: Optional[Dict[str, Any]] = None
+) -> List[BulkOutcome]:
+    return PingRegistry(options).bulk_ping(items, concurrency)  # type: ignore[return-value]
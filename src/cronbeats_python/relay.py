@@ -0,0 +1,285 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import signal
+import socket
+import stat
+import sys
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple, Union
+from urllib.parse import urlsplit
+
+from .async_client import AsyncPingClient
+from .async_http import AsyncioHttpClient
+from .errors import SdkError, ValidationError
+from .http import Body, HttpClient, HttpResponse
+from .outbox import SqliteOutbox
+
+
+_UID = os.getuid() if hasattr(os, "getuid") else 0
+
+# Per user, inside a 0700 directory that user owns, so nobody else can bind the path first and
+# collect job keys, and only that user may send to it (see ``--mode``). A fixed location rather
+# than $XDG_RUNTIME_DIR, which cron does not set: jobs and the relay agree without any setup.
+DEFAULT_RELAY_DIR = f"/tmp/cronbeats-{_UID}"
+DEFAULT_RELAY_ADDRESS = f"unix:{DEFAULT_RELAY_DIR}/relay.sock"
+DEFAULT_SOCKET_MODE = 0o600
+
+Address = Union[str, Tuple[str, int]]
+
+_PATH_RE = re.compile(r"^/ping/([a-zA-Z0-9]{8})(?:/(start|end/success|end/fail|progress(?:/\d+)?))?$")
+
+
+def parse_address(spec: str) -> Tuple[int, Address]:
+    if spec.startswith("unix:"):
+        if not hasattr(socket, "AF_UNIX"):
+            raise ValidationError("Unix domain sockets are not supported on this platform.")
+        return socket.AF_UNIX, spec[len("unix:"):]
+    if spec.startswith("udp:"):
+        host, _, port = spec[len("udp:"):].rpartition(":")
+        if not host or not port.isdigit():
+            raise ValidationError(f"Invalid relay address: {spec}")
+        return socket.AF_INET, (host, int(port))
+    raise ValidationError('Relay address must start with "unix:" or "udp:".')
+
+
+class RelayHttpClient:
+    def __init__(
+        self,
+        address: str = DEFAULT_RELAY_ADDRESS,
+        fallback: Optional[HttpClient] = None,
+        owner_uid: Optional[int] = None,
+    ) -> None:
+        self.family, self.address = parse_address(address)
+        self.fallback = fallback
+        # A unix: socket is only used if this user owns it (or ``owner_uid``, for a shared relay).
+        self.owner_uid = _UID if owner_uid is None else owner_uid
+        self._sock: Optional[socket.socket] = None
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: Dict[str, str],
+        body: Optional[Body],
+        timeout_ms: int,
+    ) -> HttpResponse:
+        text = body.decode("utf-8") if isinstance(body, bytes) else body
+        datagram = json.dumps({"u": url, "b": text}, separators=(",", ":")).encode("utf-8")
+        try:
+            if self._sock is None:
+                if self.family == socket.AF_UNIX:
+                    self._check_owner()
+                self._sock = socket.socket(self.family, socket.SOCK_DGRAM)
+            # Normally returns at once; only waits if the relay has fallen behind a burst.
+            self._sock.settimeout(max(1, timeout_ms) / 1000.0)
+            self._sock.sendto(datagram, self.address)
+        except OSError as exc:
+            if self.fallback is not None:
+                return self.fallback.request(method, url, headers, body, timeout_ms)
+            raise SdkError(f"Relay unavailable: {exc}") from exc
+        return HttpResponse(status=202, body=b'{"status":"queued"}', headers={})
+
+    def _check_owner(self) -> None:
+        # Whoever bound the path receives every URL, job key included.
+        owner = os.stat(str(self.address)).st_uid
+        if owner != self.owner_uid:
+            raise PermissionError(f"{self.address} is owned by uid {owner}, expected {self.owner_uid}")
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+            self._sock = None
+
+
+Event = List[Any]  # [action, path, body]
+
+
+class Relay:
+    def __init__(
+        self,
+        allowed_base_urls: Sequence[str] = ("https://cronbeats.io",),
+        options: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.allowed_base_urls = {u.rstrip("/") for u in allowed_base_urls}
+        self.options = dict(options or {})
+        self.options.setdefault("http_client", AsyncioHttpClient())
+        self.received = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.failed = 0
+        self._clients: Dict[Tuple[str, str], AsyncPingClient] = {}
+        self._pending: Dict[Tuple[str, str], Deque[Event]] = {}
+        self._tasks: Dict[Tuple[str, str], "asyncio.Task[None]"] = {}
+
+    def submit(self, datagram: bytes) -> None:
+        try:
+            message = json.loads(datagram)
+            parts = urlsplit(message["u"])
+            body = json.loads(message["b"]) if message.get("b") else None
+        except (ValueError, KeyError, TypeError):
+            self.rejected += 1
+            return
+        base_url = f"{parts.scheme}://{parts.netloc}"
+        match = _PATH_RE.match(parts.path)
+        if base_url not in self.allowed_base_urls or match is None:
+            self.rejected += 1
+            return
+
+        self.received += 1
+        job = (base_url, match.group(1))
+        action = (match.group(2) or "ping").split("/", 1)[0]
+        queue = self._pending.setdefault(job, deque())
+        if action == "progress" and queue and queue[-1][0] == "progress":
+            queue[-1][1] = parts.path
+            queue[-1][2] = body
+            self.coalesced += 1
+        else:
+            queue.append([action, parts.path, body])
+
+        task = self._tasks.get(job)
+        if task is None or task.done():
+            task = asyncio.get_running_loop().create_task(self._drain(job, queue))
+            task.add_done_callback(lambda done, job=job: self._task_done(job, done))
+            self._tasks[job] = task
+
+    async def join(self) -> None:
+        while self._tasks:
+            await asyncio.gather(*list(self._tasks.values()), return_exceptions=True)
+
+    async def _drain(self, job: Tuple[str, str], queue: Deque[Event]) -> None:
+        client = self._clients.get(job)
+        if client is None:
+            client = AsyncPingClient(job[1], {**self.options, "base_url": job[0]})
+            self._clients[job] = client
+        while queue:
+            action, path, body = queue.popleft()
+            try:
+                await client._request(client._state, action, path, body)
+            except SdkError:
+                self.failed += 1
+        # No await since the emptiness check, so nothing can have been queued in between.
+        if self._pending.get(job) is queue:
+            del self._pending[job]
+
+    def _task_done(self, job: Tuple[str, str], task: "asyncio.Task[None]") -> None:
+        if self._tasks.get(job) is task:
+            del self._tasks[job]
+
+
+class _RelayProtocol(asyncio.DatagramProtocol):
+    def __init__(self, relay: Relay) -> None:
+        self.relay = relay
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        self.relay.submit(data)
+
+
+def _private_dir(path: str) -> None:
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != _UID or stat.S_IMODE(info.st_mode) & 0o077:
+        raise SdkError(f"Refusing to use {path}: expected a directory owned by uid {_UID} with mode 0700.")
+
+
+def _bind_unix(sock: socket.socket, path: str, mode: int) -> None:
+    if os.path.dirname(path) == DEFAULT_RELAY_DIR:
+        _private_dir(DEFAULT_RELAY_DIR)
+    try:
+        existing = os.lstat(path)
+    except FileNotFoundError:
+        existing = None
+    if existing is not None:
+        if not stat.S_ISSOCK(existing.st_mode):
+            raise SdkError(f"Refusing to replace {path}: not a socket.")
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try:
+            probe.connect(path)
+        except OSError:
+            # Nobody is bound to it: left behind by a relay that did not shut down cleanly.
+            os.unlink(path)
+        else:
+            raise SdkError(f"Another relay is already listening on {path}.")
+        finally:
+            probe.close()
+    # The umask keeps the socket from being reachable with wider permissions before chmod().
+    previous = os.umask(0o777 & ~mode)
+    try:
+        sock.bind(path)
+    finally:
+        os.umask(previous)
+    os.chmod(path, mode)
+
+
+async def serve(address: str, relay: Relay, stop: "asyncio.Event", mode: int = DEFAULT_SOCKET_MODE) -> None:
+    loop = asyncio.get_running_loop()
+    family, bind_address = parse_address(address)
+    sock = socket.socket(family, socket.SOCK_DGRAM)
+    try:
+        if family == socket.AF_UNIX:
+            _bind_unix(sock, str(bind_address), mode)
+        else:
+            sock.bind(bind_address)
+    except BaseException:
+        sock.close()
+        raise
+    transport, _ = await loop.create_datagram_endpoint(lambda: _RelayProtocol(relay), sock=sock)
+    try:
+        await stop.wait()
+    finally:
+        transport.close()
+        if family == socket.AF_UNIX:
+            try:
+                os.unlink(str(bind_address))
+            except OSError:
+                pass
+        await relay.join()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="cronbeats-relay", description="Local CronBeats ping relay.")
+    parser.add_argument("--listen", default=DEFAULT_RELAY_ADDRESS, help="unix:/path or udp:host:port")
+    parser.add_argument("--base-url", action="append", dest="base_urls", help="allowed upstream base URL")
+    parser.add_argument("--outbox-dir", help="spool undeliverable events to this directory")
+    parser.add_argument("--max-retries", type=int, default=4)
+    parser.add_argument("--timeout-ms", type=int, default=5000)
+    parser.add_argument(
+        "--mode",
+        type=lambda value: int(value, 8),
+        default=DEFAULT_SOCKET_MODE,
+        help="octal permissions of a unix: socket (default: 600, owner only; 660 lets a group send)",
+    )
+    args = parser.parse_args(argv)
+
+    options: Dict[str, Any] = {"max_retries": args.max_retries, "timeout_ms": args.timeout_ms}
+    if args.outbox_dir:
+        options["outbox"] = SqliteOutbox(args.outbox_dir)
+    relay = Relay(args.base_urls or ["https://cronbeats.io"], options)
+
+    async def run() -> None:
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            try:
+                loop.add_signal_handler(sig, stop.set)
+            except (NotImplementedError, RuntimeError):
+                pass
+        await serve(args.listen, relay, stop, args.mode)
+
+    try:
+        asyncio.run(run())
+    except SdkError as exc:
+        print(f"cronbeats-relay: {exc}", file=sys.stderr)
+        return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
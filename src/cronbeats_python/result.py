@@ -0,0 +1,120 @@
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Optional, Union
+
+if TYPE_CHECKING:
+    from .codec import JsonCodec
+
+# Dict keys of the original normalized result, mapped to the attribute serving each one.
+_FIELDS = {
+    "ok": "ok",
+    "action": "action",
+    "jobKey": "job_key",
+    "timestamp": "timestamp",
+    "processingTimeMs": "processing_time_ms",
+    "nextExpected": "next_expected",
+    "raw": "raw",
+}
+
+
+def decode_object(raw: Union[str, bytes], codec: Optional[JsonCodec] = None) -> Dict[str, Any]:
+    if codec is None:
+        from .codec import get_codec
+
+        codec = get_codec()
+    try:
+        decoded = codec.loads(raw)
+    except ValueError:
+        # JSONDecodeError, or undecodable bytes.
+        return {"message": "Invalid JSON response"}
+    if isinstance(decoded, dict):
+        return decoded
+    return {"message": "Invalid JSON response"}
+
+
+class PingResult(Mapping):
+    # Keeps the undecoded response body and only parses it when a field is read, so callers
+    # that ignore the result pay nothing. Reads like the dict results of releases before 0.2.0
+    # (``result["ok"]``, ``result.get("raw")``) but is not a dict: use to_dict() to serialize.
+    __slots__ = ("ok", "_action", "_job_key", "_body", "_raw", "_flags", "_codec")
+
+    def __init__(
+        self,
+        action: str,
+        job_key: str,
+        body: Optional[Union[str, bytes]] = None,
+        ok: bool = True,
+        flags: Optional[Dict[str, Any]] = None,
+        codec: Optional[JsonCodec] = None,
+    ) -> None:
+        self.ok = ok
+        self._action = action
+        self._job_key = job_key
+        self._body = body
+        self._raw: Optional[Dict[str, Any]] = None
+        self._flags = flags
+        self._codec = codec
+
+    @property
+    def raw(self) -> Dict[str, Any]:
+        raw = self._raw
+        if raw is None:
+            raw = decode_object(self._body, self._codec) if self._body else {}
+            self._raw = raw
+            self._body = None
+        return raw
+
+    @property
+    def action(self) -> str:
+        return str(self.raw.get("action", self._action))
+
+    @property
+    def job_key(self) -> str:
+        return str(self.raw.get("job_key", self._job_key))
+
+    @property
+    def timestamp(self) -> str:
+        return str(self.raw.get("timestamp", ""))
+
+    @property
+    def processing_time_ms(self) -> float:
+        try:
+            return float(self.raw.get("processing_time_ms", 0.0))
+        except (TypeError, ValueError):
+            return 0.0
+
+    @property
+    def next_expected(self) -> Optional[str]:
+        value = self.raw.get("next_expected")
+        return str(value) if value is not None else None
+
+    @property
+    def queued(self) -> bool:
+        return bool(self._flags and self._flags.get("queued"))
+
+    @property
+    def skipped(self) -> bool:
+        return bool(self._flags and self._flags.get("skipped"))
+
+    def __getitem__(self, key: str) -> Any:
+        name = _FIELDS.get(key)
+        if name is not None:
+            return getattr(self, name)
+        if self._flags and key in self._flags:
+            return self._flags[key]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from _FIELDS
+        if self._flags:
+            yield from self._flags
+
+    def __len__(self) -> int:
+        return len(_FIELDS) + (len(self._flags) if self._flags else 0)
+
+    def __repr__(self) -> str:
+        return f"PingResult({dict(self)!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self)
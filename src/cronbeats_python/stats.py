@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import threading
+from array import array
+from typing import Any, Dict, Optional
+
+from . import forksafe
+
+# Log-linear buckets in microseconds, HDR-histogram style: values below 2**SUB_BITS get one
+# bucket each, above that every power of two is split into 2**(SUB_BITS - 1) equal buckets,
+# which bounds the relative error to ~6%. Values are clamped at 2**MAX_BITS us (~134s).
+SUB_BITS = 4
+MAX_BITS = 27
+_HALF = 1 << (SUB_BITS - 1)
+_MAX_VALUE = (1 << MAX_BITS) - 1
+BUCKET_COUNT = (MAX_BITS - SUB_BITS) * _HALF + (1 << SUB_BITS)
+
+ACTIONS = ("ping", "start", "progress", "end")
+
+
+def _bucket_index(value: int) -> int:
+    if value > _MAX_VALUE:
+        value = _MAX_VALUE
+    shift = value.bit_length() - SUB_BITS
+    if shift <= 0:
+        return value
+    return shift * _HALF + (value >> shift)
+
+
+def _bucket_upper(index: int) -> int:
+    if index < (1 << SUB_BITS):
+        return index
+    shift = index // _HALF - 1
+    mantissa = index % _HALF + _HALF
+    return ((mantissa + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    __slots__ = ("counts", "count", "total", "min", "max")
+
+    def __init__(self) -> None:
+        self.counts = array("Q", bytes(8 * BUCKET_COUNT))
+        self.count = 0
+        self.total = 0
+        self.min = 0
+        self.max = 0
+
+    def record(self, value_us: int) -> None:
+        if value_us < 0:
+            value_us = 0
+        self.counts[_bucket_index(value_us)] += 1
+        if self.count == 0 or value_us < self.min:
+            self.min = value_us
+        if value_us > self.max:
+            self.max = value_us
+        self.count += 1
+        self.total += value_us
+
+    def percentile(self, p: float) -> int:
+        if self.count == 0:
+            return 0
+        rank = max(1, int(self.count * p / 100.0 + 0.5))
+        seen = 0
+        for index, bucket in enumerate(self.counts):
+            seen += bucket
+            if seen >= rank:
+                return min(_bucket_upper(index), self.max)
+        return self.max
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        if other.count == 0:
+            return
+        counts = self.counts
+        for index, bucket in enumerate(other.counts):
+            if bucket:
+                counts[index] += bucket
+        self.min = other.min if self.count == 0 else min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.count += other.count
+        self.total += other.total
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "mean_ms": (self.total / self.count / 1000.0) if self.count else 0.0,
+            "p50_ms": self.percentile(50) / 1000.0,
+            "p90_ms": self.percentile(90) / 1000.0,
+            "p99_ms": self.percentile(99) / 1000.0,
+            "max_ms": self.max / 1000.0,
+        }
+
+
+class ClientStats:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.reset()
+        forksafe.track(self)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.latency = {action: LatencyHistogram() for action in ACTIONS}
+            self.requests = 0
+            self.failures = 0
+            self.attempts = 0
+            self.retries = 0
+            self.network_errors = 0
+            self.dropped = 0
+            self.throttled = 0
+            self.status_codes: Dict[int, int] = {}
+
+    def record_request(self, action: str, latency_ns: int, ok: bool) -> None:
+        with self._lock:
+            self.requests += 1
+            if not ok:
+                self.failures += 1
+            histogram = self.latency.get(action)
+            if histogram is not None:
+                histogram.record(latency_ns // 1000)
+
+    def record_attempt(self, status: Optional[int], retry: bool) -> None:
+        with self._lock:
+            self.attempts += 1
+            if retry:
+                self.retries += 1
+            if status is None:
+                self.network_errors += 1
+            else:
+                self.status_codes[status] = self.status_codes.get(status, 0) + 1
+
+    def record_dropped(self, count: int = 1) -> None:
+        with self._lock:
+            self.dropped += count
+
+    def record_throttled(self) -> None:
+        with self._lock:
+            self.throttled += 1
+
+    def merge(self, other: "ClientStats") -> None:
+        with other._lock:
+            latency = {action: LatencyHistogram() for action in ACTIONS}
+            for action, histogram in other.latency.items():
+                latency[action].merge(histogram)
+            counters = (
+                other.requests,
+                other.failures,
+                other.attempts,
+                other.retries,
+                other.network_errors,
+                other.dropped,
+                other.throttled,
+            )
+            status_codes = dict(other.status_codes)
+        with self._lock:
+            for action, histogram in latency.items():
+                self.latency[action].merge(histogram)
+            self.requests += counters[0]
+            self.failures += counters[1]
+            self.attempts += counters[2]
+            self.retries += counters[3]
+            self.network_errors += counters[4]
+            self.dropped += counters[5]
+            self.throttled += counters[6]
+            for status, count in status_codes.items():
+                self.status_codes[status] = self.status_codes.get(status, 0) + count
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "failures": self.failures,
+                "attempts": self.attempts,
+                "retries": self.retries,
+                "retry_rate": self.retries / self.attempts if self.attempts else 0.0,
+                "network_errors": self.network_errors,
+                "dropped": self.dropped,
+                "throttled": self.throttled,
+                "status_codes": dict(self.status_codes),
+                "latency": {action: histogram.summary() for action, histogram in self.latency.items()},
+            }
+
+
+GLOBAL_STATS = ClientStats()
+
+
+def global_stats() -> Dict[str, Any]:
+    return GLOBAL_STATS.snapshot()
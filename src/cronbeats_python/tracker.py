@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, AsyncIterator, Iterable, Iterator, Optional, Union
+
+from .errors import SdkError
+
+if TYPE_CHECKING:
+    from .async_client import AsyncPingClient
+    from .client import PingClient
+
+# The clock is read every ``stride`` items. The stride doubles while checks land much closer
+# together than the report interval and drops back to 1 as soon as one lands late, so a tight
+# loop pays one integer compare per item. The cap bounds how many items can pass unobserved
+# when a fast loop turns slow; at 256 the amortised clock read is still well under 1 ns/item.
+_MAX_STRIDE = 256
+
+
+def _length(iterable: Any, total: Optional[int]) -> Optional[int]:
+    if total is not None:
+        return max(int(total), 0)
+    try:
+        return len(iterable)
+    except TypeError:
+        return None
+
+
+class _TrackerBase:
+    def __init__(self, client: Any, iterable: Any, total: Optional[int], every_ms: int) -> None:
+        self.client = client
+        self.iterable = iterable
+        self.total = _length(iterable, total)
+        self.count = 0
+        self.reports = 0
+        self.error: Optional[SdkError] = None
+        self._every_s = max(int(every_ms), 0) / 1000.0
+        self._stride = 1
+        self._started = 0.0
+        self._last_check = 0.0
+        self._next_report = 0.0
+
+    def __len__(self) -> int:
+        if self.total is None:
+            raise TypeError("tracked iterable has no length")
+        return self.total
+
+    def _begin(self) -> None:
+        self._started = self._last_check = perf_counter()
+        self._next_report = self._started + self._every_s
+
+    def _due(self, now: float) -> bool:
+        gap = now - self._last_check
+        self._last_check = now
+        if gap < self._every_s / 16 and self._stride < _MAX_STRIDE:
+            self._stride <<= 1
+        elif gap > self._every_s / 4:
+            self._stride = 1
+        if now < self._next_report:
+            return False
+        self._next_report = now + self._every_s
+        return True
+
+    def _payload(self, now: float) -> "tuple[Optional[int], str]":
+        elapsed = now - self._started
+        rate = self.count / elapsed if elapsed > 0 else 0.0
+        if self.total:
+            seq = min(100, self.count * 100 // self.total)
+            return seq, f"{self.count}/{self.total} ({rate:.1f}/s)"
+        return None, f"{self.count} items ({rate:.1f}/s)"
+
+
+class Tracker(_TrackerBase):
+    # ``for row in client.track(rows):`` reports progress() at most every ``every_ms``: a
+    # percentage when the length is known (len() or ``total``), otherwise count and rate as a
+    # message-only update. A final update is sent when the iterable is exhausted. Telemetry
+    # errors are kept in ``error`` and never raised into the loop.
+    def __init__(self, client: PingClient, iterable: Iterable[Any], total: Optional[int] = None, every_ms: int = 1000) -> None:
+        super().__init__(client, iterable, total, every_ms)
+
+    def __iter__(self) -> Iterator[Any]:
+        self._begin()
+        count = self.count
+        next_check = count + self._stride
+        try:
+            for item in self.iterable:
+                yield item
+                count += 1
+                if count >= next_check:
+                    self.count = count
+                    now = perf_counter()
+                    if self._due(now):
+                        self._report(now)
+                    next_check = count + self._stride
+        finally:
+            self.count = count
+        self._report(perf_counter())
+
+    def _report(self, now: float) -> None:
+        seq, message = self._payload(now)
+        self.reports += 1
+        try:
+            self.client.progress(seq, message)
+        except SdkError as exc:
+            self.error = exc
+
+
+class AsyncTracker(_TrackerBase):
+    # ``async for row in client.track(rows):`` over a sync or async iterable.
+    def __init__(
+        self,
+        client: AsyncPingClient,
+        iterable: Union[Iterable[Any], Any],
+        total: Optional[int] = None,
+        every_ms: int = 1000,
+    ) -> None:
+        super().__init__(client, iterable, total, every_ms)
+
+    async def __aiter__(self) -> AsyncIterator[Any]:
+        self._begin()
+        count = self.count
+        next_check = count + self._stride
+        iterable = self.iterable
+        try:
+            if hasattr(iterable, "__aiter__"):
+                async for item in iterable:
+                    yield item
+                    count += 1
+                    if count >= next_check:
+                        self.count = count
+                        now = perf_counter()
+                        if self._due(now):
+                            await self._report(now)
+                        next_check = count + self._stride
+            else:
+                for item in iterable:
+                    yield item
+                    count += 1
+                    if count >= next_check:
+                        self.count = count
+                        now = perf_counter()
+                        if self._due(now):
+                            await self._report(now)
+                        next_check = count + self._stride
+        finally:
+            self.count = count
+        await self._report(perf_counter())
+
+    async def _report(self, now: float) -> None:
+        seq, message = self._payload(now)
+        self.reports += 1
+        try:
+            await self.client.progress(seq, message)
+        except SdkError as exc:
+            self.error = exc
@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from . import forksafe
+
+if TYPE_CHECKING:
+    import ssl
+
+# Process-wide caches shared by every transport: building an SSLContext loads the CA bundle
+# (milliseconds of CPU) and each new connection would otherwise re-resolve the API host.
+
+SslKey = Tuple[Optional[str], Optional[str], bool]
+AddrInfo = List[Tuple[Any, ...]]
+
+_contexts: Dict[SslKey, "ssl.SSLContext"] = {}
+_contexts_lock = threading.Lock()
+forksafe.reset_locks(globals(), "_contexts_lock")
+
+
+def shared_ssl_context(cafile: Optional[str] = None, capath: Optional[str] = None, verify: bool = True) -> ssl.SSLContext:
+    key: SslKey = (cafile, capath, verify)
+    context = _contexts.get(key)
+    if context is not None:
+        return context
+    with _contexts_lock:
+        context = _contexts.get(key)
+        if context is None:
+            import ssl
+
+            context = ssl.create_default_context(cafile=cafile, capath=capath)
+            if not verify:
+                context.check_hostname = False
+                context.verify_mode = ssl.CERT_NONE
+            _contexts[key] = context
+    return context
+
+
+class DnsCache:
+    # getaddrinfo() does not expose record TTLs, so entries live for a fixed ``ttl_s``; keep it
+    # at or below the TTL of the records being cached. Failed lookups are never cached.
+    def __init__(self, ttl_s: float = 30.0, max_entries: int = 1024) -> None:
+        self.ttl_s = float(ttl_s)
+        self.max_entries = max(1, int(max_entries))
+        self._lock = threading.Lock()
+        self._entries: Dict[Tuple[str, int], Tuple[float, AddrInfo]] = {}
+        forksafe.track(self)
+
+    def lookup(self, host: str, port: int) -> Optional[AddrInfo]:
+        entry = self._entries.get((host, port))
+        if entry is None or time.monotonic() >= entry[0]:
+            return None
+        return entry[1]
+
+    def store(self, host: str, port: int, addresses: AddrInfo) -> None:
+        if self.ttl_s <= 0 or not addresses:
+            return
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                now = time.monotonic()
+                self._entries = {k: v for k, v in self._entries.items() if v[0] > now}
+                if len(self._entries) >= self.max_entries:
+                    self._entries.clear()
+            self._entries[(host, port)] = (time.monotonic() + self.ttl_s, addresses)
+
+    def invalidate(self, host: str, port: int) -> None:
+        with self._lock:
+            self._entries.pop((host, port), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def resolve(self, host: str, port: int) -> AddrInfo:
+        addresses = self.lookup(host, port)
+        if addresses is None:
+            import socket
+
+            addresses = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            self.store(host, port, addresses)
+        return addresses
+
+    async def resolve_async(
+        self, host: str, port: int, getaddrinfo: Callable[..., Awaitable[AddrInfo]]
+    ) -> AddrInfo:
+        addresses = self.lookup(host, port)
+        if addresses is None:
+            import socket
+
+            addresses = await getaddrinfo(host, port, type=socket.SOCK_STREAM)
+            self.store(host, port, addresses)
+        return addresses
+
+
+_dns_cache: Optional[DnsCache] = None
+_dns_lock = threading.Lock()
+forksafe.reset_locks(globals(), "_dns_lock")
+
+
+def shared_dns_cache() -> DnsCache:
+    global _dns_cache
+    if _dns_cache is None:
+        with _dns_lock:
+            if _dns_cache is None:
+                _dns_cache = DnsCache()
+    return _dns_cache
@@ -0,0 +1,148 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Type, Union
+
+import pytest
+
+from cronbeats_python import PingClient, SdkError, circuit, ratelimit, stats, transport_cache
+from cronbeats_python.http import HttpResponse
+
+
+def _clear_shared_state() -> None:
+    ratelimit._limiters.clear()
+    circuit._breakers.clear()
+    circuit._budgets.clear()
+    stats.GLOBAL_STATS.reset()
+    transport_cache.shared_dns_cache().clear()
+
+
+@pytest.fixture(autouse=True)
+def reset_shared_state():
+    # Limiters, breakers and retry budgets are process-wide; isolate tests from each other.
+    _clear_shared_state()
+    yield
+    _clear_shared_state()
+
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    close_after_response = False
+
+    def do_POST(self) -> None:  # noqa: N802
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+        self.server.peers.append(self.client_address)  # type: ignore[attr-defined]
+        self.server.paths.append(self.path)  # type: ignore[attr-defined]
+        body = json.dumps({"status": "success", "path": self.path}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("X-Test", "yes")
+        if self.close_after_response:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # noqa: A002, ANN001
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), KeepAliveHandler)
+    httpd.daemon_threads = True
+    httpd.peers: List[Tuple[str, int]] = []  # type: ignore[attr-defined]
+    httpd.paths: List[str] = []  # type: ignore[attr-defined]
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def proxy_env(monkeypatch):  # noqa: ANN001, ANN201
+    # Replaces any proxy settings of the test environment with the given ones.
+    def set_env(**env: str) -> None:
+        for name in ("http_proxy", "https_proxy", "all_proxy", "no_proxy"):
+            monkeypatch.delenv(name, raising=False)
+            monkeypatch.delenv(name.upper(), raising=False)
+        for name, value in env.items():
+            monkeypatch.setenv(name, value)
+
+    return set_env
+
+
+def server_url(httpd, path: str = "/ping/abc123de") -> str:
+    host, port = httpd.server_address[:2]
+    return f"http://{host}:{port}{path}"
+
+
+class StubHttpClient:
+    # Answers from ``responses`` in order (an HttpResponse, a bare status code, or None for a
+    # network error), then with ``status``/``body``. The first ``network_failures`` calls fail
+    # outright. Only the first ``max_calls`` requests are recorded when it is set.
+    def __init__(
+        self,
+        responses: Optional[Sequence[Union[HttpResponse, int, None]]] = None,
+        network_failures: int = 0,
+        status: int = 200,
+        body: Union[str, bytes] = "{}",
+        max_calls: Optional[int] = None,
+    ) -> None:
+        self.responses = list(responses or [])
+        self.network_failures = network_failures
+        self.response = HttpResponse(status=status, body=body, headers={})
+        self.max_calls = max_calls
+        self.calls: List[Dict[str, Any]] = []
+
+    def request(self, method, url, headers, body, timeout_ms):  # noqa: ANN001
+        if self.max_calls is None or len(self.calls) < self.max_calls:
+            self.calls.append({"method": method, "url": url, "body": body, "timeout_ms": timeout_ms})
+        if self.network_failures > 0:
+            self.network_failures -= 1
+            raise SdkError("socket timeout")
+        if not self.responses:
+            return self.response
+        response = self.responses.pop(0)
+        if response is None:
+            raise SdkError("socket timeout")
+        if isinstance(response, int):
+            return HttpResponse(status=response, body="{}", headers={})
+        return response
+
+    @property
+    def urls(self) -> List[str]:
+        return [call["url"] for call in self.calls]
+
+    @property
+    def bodies(self) -> List[Any]:
+        return [call["body"] for call in self.calls]
+
+
+class AsyncStubHttpClient(StubHttpClient):
+    async def request(self, method, url, headers, body, timeout_ms):  # noqa: ANN001
+        await asyncio.sleep(0)
+        return StubHttpClient.request(self, method, url, headers, body, timeout_ms)
+
+
+def _fast_client(stub: StubHttpClient, **options: Any) -> PingClient:
+    # Retries without backoff, so failure-path tests stay quick.
+    return PingClient("abc123de", {"http_client": stub, "retry_backoff_ms": 0, "retry_jitter_ms": 0, **options})
+
+
+@pytest.fixture
+def stub_http_client() -> Type[StubHttpClient]:
+    return StubHttpClient
+
+
+@pytest.fixture
+def async_stub_http_client() -> Type[AsyncStubHttpClient]:
+    return AsyncStubHttpClient
+
+
+@pytest.fixture
+def fast_client() -> Callable[..., PingClient]:
+    return _fast_client
@@ -0,0 +1,138 @@
+import asyncio
+import json
+import time
+from typing import List
+
+import pytest
+
+from cronbeats_python import ApiError, AsyncPingClient, SdkError
+from cronbeats_python.async_http import AsyncioHttpClient
+from cronbeats_python.http import HttpResponse
+
+from conftest import server_url
+
+
+def test_async_progress_builds_same_request_as_sync_client(async_stub_http_client) -> None:
+    stub = async_stub_http_client()
+    client = AsyncPingClient("abc123de", {"http_client": stub})
+    res = asyncio.run(client.progress(40, "Halfway"))
+    assert res["ok"] is True
+    assert res["action"] == "progress"
+    assert stub.calls[0]["url"] == "https://cronbeats.io/ping/abc123de/progress/40"
+    assert json.loads(stub.calls[0]["body"] or "{}") == {"message": "Halfway"}
+
+
+def test_async_retry_does_not_block_event_loop(monkeypatch, async_stub_http_client) -> None:
+    def fail_sleep(_seconds: float) -> None:
+        raise AssertionError("time.sleep called from async client")
+
+    monkeypatch.setattr("time.sleep", fail_sleep)
+    stub = async_stub_http_client(network_failures=1)
+    client = AsyncPingClient(
+        "abc123de",
+        {"http_client": stub, "max_retries": 2, "retry_backoff_ms": 1, "retry_jitter_ms": 0},
+    )
+    res = asyncio.run(client.success())
+    assert res["ok"] is True
+    assert len(stub.calls) == 2
+    assert stub.calls[1]["url"].endswith("/end/success")
+
+
+def test_async_404_maps_to_not_found(async_stub_http_client) -> None:
+    stub = async_stub_http_client(
+        responses=[HttpResponse(status=404, body=json.dumps({"message": "Job not found"}), headers={})]
+    )
+    client = AsyncPingClient("abc123de", {"http_client": stub, "max_retries": 0})
+    with pytest.raises(ApiError) as exc:
+        asyncio.run(client.ping())
+    assert exc.value.code == "NOT_FOUND"
+
+
+def test_asyncio_transport_reuses_connections_for_concurrent_pings(server) -> None:
+    transport = AsyncioHttpClient(max_connections_per_host=2)
+
+    async def run() -> List[HttpResponse]:
+        results = await asyncio.gather(
+            *(transport.request("POST", server_url(server), {"Accept": "application/json"}, None, 2000) for _ in range(10))
+        )
+        await transport.aclose()
+        return results
+
+    results = asyncio.run(run())
+    assert all(r.status == 200 for r in results)
+    assert json.loads(results[0].body)["path"] == "/ping/abc123de"
+    assert results[0].headers["x-test"] == "yes"
+    assert len(set(server.peers)) <= 2
+
+
+def test_waiting_for_a_connection_slot_is_bounded_by_the_timeout() -> None:
+    transport = AsyncioHttpClient(max_connections_per_host=1)
+
+    async def hang(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await asyncio.sleep(5)
+        writer.close()
+
+    async def run() -> float:
+        httpd = await asyncio.start_server(hang, "127.0.0.1", 0)
+        host, port = httpd.sockets[0].getsockname()[:2]
+        url = f"http://{host}:{port}/ping/abc123de"
+        holder = asyncio.ensure_future(transport.request("POST", url, {}, None, 3000))
+        await asyncio.sleep(0.05)
+        started = time.monotonic()
+        try:
+            with pytest.raises(SdkError, match="timed out"):
+                await transport.request("POST", url, {}, None, 100)
+            return time.monotonic() - started
+        finally:
+            holder.cancel()
+            httpd.close()
+
+    assert asyncio.run(run()) < 1.0
+
+
+def test_asyncio_transport_uses_http_proxy_from_environment(server, proxy_env) -> None:
+    proxy_env(http_proxy=server_url(server, ""))
+    transport = AsyncioHttpClient()
+
+    async def run() -> HttpResponse:
+        try:
+            return await transport.request("POST", "http://cronbeats.invalid/ping/abc123de", {}, None, 2000)
+        finally:
+            await transport.aclose()
+
+    assert asyncio.run(run()).status == 200
+    assert server.paths == ["http://cronbeats.invalid/ping/abc123de"]
+
+
+def test_asyncio_transport_tunnels_https_through_connect_proxy(proxy_env) -> None:
+    seen: List[bytes] = []
+
+    async def proxy(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        seen.append(await reader.readuntil(b"\r\n\r\n"))
+        if len(seen) == 1:
+            writer.write(b"HTTP/1.1 200 Connection established\r\n\r\n")
+            await writer.drain()
+            # The client starts TLS with the real host inside the tunnel: a handshake record.
+            seen.append(await reader.read(1))
+        else:
+            writer.write(b"HTTP/1.1 407 Proxy Authentication Required\r\nContent-Length: 0\r\n\r\n")
+            await writer.drain()
+        writer.close()
+
+    async def run(url: str) -> None:
+        httpd = await asyncio.start_server(proxy, "127.0.0.1", 0)
+        host, port = httpd.sockets[0].getsockname()[:2]
+        proxy_env(https_proxy=f"http://user:p%40ss@{host}:{port}")
+        try:
+            for _ in range(2):
+                with pytest.raises(SdkError) as exc:
+                    await AsyncioHttpClient().request("POST", url, {}, None, 2000)
+        finally:
+            httpd.close()
+        assert "407" in str(exc.value)
+
+    asyncio.run(run("https://cronbeats.invalid/ping/abc123de"))
+    assert seen[0].startswith(b"CONNECT cronbeats.invalid:443 HTTP/1.1\r\n")
+    assert b"Proxy-Authorization: Basic dXNlcjpwQHNz\r\n" in seen[0]
+    assert seen[1] == b"\x16"
+    assert seen[2].startswith(b"CONNECT cronbeats.invalid:443 ")
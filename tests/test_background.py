@@ -0,0 +1,145 @@
+import json
+import threading
+import time
+from typing import List
+
+import pytest
+
+from cronbeats_python import PingClient, SdkError
+from cronbeats_python.background import BackgroundSender
+from cronbeats_python.http import HttpResponse
+
+
+class GatedHttpClient:
+    def __init__(self) -> None:
+        self.gate = threading.Event()
+        self.urls: List[str] = []
+
+    def request(self, method, url, headers, body, timeout_ms):  # noqa: ANN001
+        self.gate.wait(5)
+        self.urls.append(url)
+        return HttpResponse(status=200, body=json.dumps({}), headers={})
+
+
+def _client(stub: GatedHttpClient, **options) -> PingClient:
+    return PingClient("abc123de", {"http_client": stub, "background": True, **options})
+
+
+def test_background_calls_return_before_delivery() -> None:
+    stub = GatedHttpClient()
+    client = _client(stub)
+    started = time.monotonic()
+    res = client.start()
+    assert time.monotonic() - started < 0.5
+    assert res["ok"] is True
+    assert res["queued"] is True
+    assert stub.urls == []
+
+    stub.gate.set()
+    assert client.flush(2) is True
+    assert stub.urls == ["https://cronbeats.io/ping/abc123de/start"]
+    client.close()
+
+
+def test_flush_times_out_while_sender_is_stuck() -> None:
+    stub = GatedHttpClient()
+    client = _client(stub)
+    client.ping()
+    assert client.flush(0.05) is False
+    stub.gate.set()
+    assert client.close(2) is True
+
+
+def test_drop_newest_rejects_when_queue_full() -> None:
+    stub = GatedHttpClient()
+    client = _client(stub, queue_size=1, overflow="drop_newest", coalesce_progress=False)
+    client.progress(1)
+    time.sleep(0.05)  # let the sender pick up the first event
+    client.progress(2)
+    res = client.progress(3)
+    assert res["ok"] is False
+    stub.gate.set()
+    client.close(2)
+    assert [u.rsplit("/", 1)[1] for u in stub.urls] == ["1", "2"]
+    assert client.sender is not None and client.sender.dropped == 1
+
+
+def test_drop_oldest_keeps_latest_events() -> None:
+    stub = GatedHttpClient()
+    client = _client(stub, queue_size=2, overflow="drop_oldest", coalesce_progress=False)
+    client.progress(1)
+    time.sleep(0.05)
+    for seq in (2, 3, 4):
+        client.progress(seq)
+    stub.gate.set()
+    client.close(2)
+    assert [u.rsplit("/", 1)[1] for u in stub.urls] == ["1", "3", "4"]
+
+
+def test_block_policy_waits_for_space() -> None:
+    stub = GatedHttpClient()
+    client = _client(stub, queue_size=1, overflow="block", coalesce_progress=False)
+    client.progress(1)
+    time.sleep(0.05)
+    client.progress(2)
+    threading.Timer(0.1, stub.gate.set).start()
+    started = time.monotonic()
+    client.progress(3)
+    assert time.monotonic() - started >= 0.05
+    client.close(2)
+    assert len(stub.urls) == 3
+
+
+def test_submit_after_close_raises() -> None:
+    stub = GatedHttpClient()
+    stub.gate.set()
+    client = _client(stub)
+    client.close()
+    with pytest.raises(SdkError):
+        client.ping()
+
+
+def test_sender_can_be_shared_between_clients() -> None:
+    stub = GatedHttpClient()
+    stub.gate.set()
+    sender = BackgroundSender(queue_size=10)
+    a = PingClient("abc123de", {"http_client": stub, "sender": sender})
+    b = PingClient("zzz999yy", {"http_client": stub, "sender": sender})
+    a.start()
+    b.start()
+    assert sender.flush(2) is True
+    assert stub.urls == [
+        "https://cronbeats.io/ping/abc123de/start",
+        "https://cronbeats.io/ping/zzz999yy/start",
+    ]
+
+
+def test_pending_progress_is_coalesced_latest_wins() -> None:
+    stub = GatedHttpClient()
+    client = _client(stub)
+    client.start()
+    time.sleep(0.05)  # sender is now blocked delivering start
+    for seq in range(1, 51):
+        client.progress(seq, f"record {seq}")
+    client.success()
+    stub.gate.set()
+    client.close(2)
+    assert stub.urls == [
+        "https://cronbeats.io/ping/abc123de/start",
+        "https://cronbeats.io/ping/abc123de/progress/50",
+        "https://cronbeats.io/ping/abc123de/end/success",
+    ]
+    assert client.sender is not None and client.sender.coalesced == 49
+
+
+def test_progress_after_end_is_not_merged_into_earlier_update() -> None:
+    stub = GatedHttpClient()
+    client = _client(stub)
+    client.ping()
+    time.sleep(0.05)
+    client.progress(10)
+    client.success()
+    client.progress(20)
+    stub.gate.set()
+    client.close(2)
+    assert [u.split("/ping/abc123de")[1] for u in stub.urls] == ["", "/progress/10", "/end/success", "/progress/20"]
@@ -0,0 +1,68 @@
+import pytest
+
+from cronbeats_python import ApiError
+from cronbeats_python.circuit import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, RetryBudget
+from cronbeats_python.http import HttpResponse
+
+
+def test_breaker_opens_after_consecutive_failures_and_fails_fast(stub_http_client, fast_client) -> None:
+    stub = stub_http_client(network_failures=100)
+    breaker = CircuitBreaker(failure_threshold=3, reset_timeout_s=60)
+    client = fast_client(stub, circuit_breaker=breaker, max_retries=0)
+    for _ in range(3):
+        with pytest.raises(ApiError):
+            client.ping()
+    assert breaker.state == OPEN
+
+    with pytest.raises(ApiError) as exc:
+        client.ping()
+    assert exc.value.code == "CIRCUIT_OPEN"
+    assert len(stub.calls) == 3
+
+
+def test_breaker_half_opens_with_a_single_probe(monkeypatch) -> None:
+    now = [1000.0]
+    monkeypatch.setattr("cronbeats_python.circuit.time.monotonic", lambda: now[0])
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_s=10)
+    breaker.record_failure()
+    assert breaker.allow() is False
+
+    now[0] += 10
+    assert breaker.allow() is True
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow() is False
+
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    now[0] += 10
+    assert breaker.allow() is True
+    breaker.record_success()
+    assert breaker.state == CLOSED
+
+
+def test_client_errors_do_not_trip_breaker(stub_http_client, fast_client) -> None:
+    breaker = CircuitBreaker(failure_threshold=1)
+    stub = stub_http_client(responses=[HttpResponse(status=404, body="{}", headers={})])
+    with pytest.raises(ApiError):
+        fast_client(stub, circuit_breaker=breaker).ping()
+    assert breaker.state == CLOSED
+
+
+def test_open_breaker_diverts_to_outbox(tmp_path, stub_http_client, fast_client) -> None:
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout_s=60)
+    breaker.record_failure()
+    client = fast_client(stub_http_client(), circuit_breaker=breaker, outbox_dir=str(tmp_path))
+    with pytest.raises(ApiError):
+        client.success()
+    assert client.outbox is not None and len(client.outbox) == 1
+
+
+def test_retry_budget_caps_retries_to_share_of_requests(stub_http_client, fast_client) -> None:
+    budget = RetryBudget(ratio=0.1, min_retries=2)
+    stub = stub_http_client(network_failures=1000)
+    client = fast_client(stub, retry_budget=budget, circuit_breaker=None, max_retries=5)
+    for _ in range(10):
+        with pytest.raises(ApiError):
+            client.ping()
+    # 10 requests earn 2 + 0.1 * 10 = 3 retries in total, not 10 * 5.
+    assert len(stub.calls) == 10 + 3
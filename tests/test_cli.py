@@ -0,0 +1,84 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import server_url
+
+IMPORT_BUDGET_US = 50_000
+LAZY_MODULES = ("json", "random", "urllib.request", "urllib.parse", "http.client", "ssl", "asyncio", "sqlite3")
+
+
+def _cli(*args: str) -> subprocess.CompletedProcess:
+    return subprocess.run(
+        [sys.executable, "-m", "cronbeats_python.cli", *args],
+        capture_output=True,
+        text=True,
+        timeout=30,
+    )
+
+
+def test_cli_import_is_lazy_and_within_budget() -> None:
+    code = (
+        "import sys, cronbeats_python.cli;"
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    timings = []
+    for _ in range(3):
+        res = subprocess.run([sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True)
+        assert res.stdout.strip() == ""
+        cumulative = 0
+        for line in res.stderr.splitlines():
+            parts = [p.strip() for p in line.split("|")]
+            if len(parts) == 3 and parts[2] == "cronbeats_python.cli":
+                cumulative = int(parts[1])
+        timings.append(cumulative)
+    assert min(timings) < IMPORT_BUDGET_US
+
+
+def test_run_reports_success_and_exits_with_child_status(server) -> None:
+    res = _cli("run", "--base-url", server_url(server, ""), "abc123de", "--", sys.executable, "-c", "print('hi')")
+    assert res.returncode == 0
+    assert res.stdout.strip() == "hi"
+    assert server.paths == ["/ping/abc123de/start", "/ping/abc123de/end/success"]
+
+
+def test_run_reports_fail_on_nonzero_exit(server) -> None:
+    res = _cli("run", "--base-url", server_url(server, ""), "abc123de", "--", sys.executable, "-c", "raise SystemExit(3)")
+    assert res.returncode == 3
+    assert server.paths == ["/ping/abc123de/start", "/ping/abc123de/end/fail"]
+
+
+def test_unreachable_api_does_not_change_exit_code() -> None:
+    res = _cli("run", "--base-url", "http://127.0.0.1:1", "--max-retries", "0", "abc123de", "--", sys.executable, "-c", "")
+    assert res.returncode == 0
+    assert "start ping failed" in res.stderr
+
+
+def test_usage_errors() -> None:
+    assert _cli("run", "abc123de").returncode == 2
+    assert _cli("bogus").returncode == 2
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/status"), reason="needs /proc")
+def test_child_gets_default_sigpipe_and_sigxfsz(server) -> None:
+    res = _cli("run", "--base-url", server_url(server, ""), "abc123de", "--", "grep", "SigIgn", "/proc/self/status")
+    assert res.returncode == 0
+    ignored = int(res.stdout.split()[-1], 16)
+    for signum in (13, 25):  # SIGPIPE, SIGXFSZ
+        assert not ignored & (1 << (signum - 1))
+
+
+@pytest.mark.skipif(
+    not (hasattr(os, "posix_spawnp") and os.path.exists("/proc/self/status")), reason="needs posix_spawnp and /proc"
+)
+def test_spawn_falls_back_to_signal_without_the_private_module(monkeypatch, tmp_path) -> None:
+    from cronbeats_python import cli
+
+    monkeypatch.setitem(sys.modules, "_signal", None)
+    out = tmp_path / "status"
+    pid, proc = cli._spawn(["sh", "-c", f"grep SigIgn /proc/self/status > {out}"])
+    assert cli._wait(pid, proc) == 0
+    ignored = int(out.read_text().split()[-1], 16)
+    assert not ignored & (1 << (13 - 1))
@@ -0,0 +1,77 @@
+import importlib.util
+import json
+
+import pytest
+
+from cronbeats_python import ApiError, PingClient, SdkError
+from cronbeats_python.codec import StdlibJsonCodec, get_codec
+from cronbeats_python.http import HttpResponse
+
+
+class RecordingCodec:
+    name = "recording"
+
+    def __init__(self) -> None:
+        self.dumped = []
+        self.loaded = []
+
+    def dumps(self, obj):  # noqa: ANN001
+        self.dumped.append(obj)
+        return json.dumps(obj).encode()
+
+    def loads(self, raw):  # noqa: ANN001
+        self.loaded.append(raw)
+        return json.loads(raw)
+
+
+class SequenceHttpClient:
+    def __init__(self, *responses: HttpResponse) -> None:
+        self.responses = list(responses)
+        self.bodies = []
+
+    def request(self, method, url, headers, body, timeout_ms):  # noqa: ANN001
+        self.bodies.append(body)
+        return self.responses.pop(0)
+
+
+def test_auto_prefers_orjson_when_installed() -> None:
+    expected = "orjson" if importlib.util.find_spec("orjson") else "json"
+    assert get_codec().name == expected
+    assert get_codec("auto") is get_codec()
+
+
+def test_stdlib_codec_round_trips_compact_bytes() -> None:
+    codec = get_codec("json")
+    assert isinstance(codec, StdlibJsonCodec)
+    assert codec.dumps({"message": "hi"}) == b'{"message":"hi"}'
+    assert codec.loads(b'{"a":1}') == {"a": 1}
+    with pytest.raises(ValueError):
+        codec.loads(b"{")
+
+
+def test_unknown_or_missing_codec_raises() -> None:
+    with pytest.raises(SdkError):
+        get_codec("yaml")
+    if importlib.util.find_spec("ujson") is None:
+        with pytest.raises(SdkError):
+            PingClient("abc123de", {"json_codec": "ujson"})
+
+
+def test_client_encodes_and_decodes_through_configured_codec() -> None:
+    codec = RecordingCodec()
+    stub = SequenceHttpClient(
+        HttpResponse(status=200, body=b'{"action":"progress","timestamp":"now"}', headers={}),
+        HttpResponse(status=404, body=b'{"message":"Job not found"}', headers={}),
+    )
+    client = PingClient("abc123de", {"http_client": stub, "json_codec": codec, "max_retries": 0})
+
+    result = client.progress(10, "ten")
+    assert stub.bodies[0] == b'{"message": "ten"}'
+    assert result["timestamp"] == "now"
+    with pytest.raises(ApiError) as exc:
+        client.ping()
+
+    assert codec.dumped == [{"message": "ten"}]
+    assert len(codec.loaded) == 2
+    assert exc.value.code == "NOT_FOUND"
+    assert str(exc.value) == "Job not found"
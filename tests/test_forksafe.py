@@ -0,0 +1,106 @@
+import os
+import threading
+import time
+from typing import Callable
+
+import pytest
+from conftest import server_url
+
+from cronbeats_python import PingClient
+from cronbeats_python import client as client_module
+from cronbeats_python.background import BackgroundSender
+from cronbeats_python.http import PooledHttpClient
+
+pytestmark = pytest.mark.skipif(not hasattr(os, "fork"), reason="requires os.fork")
+
+
+def _in_child(body: Callable[[], bool], timeout: float = 10.0) -> int:
+    pid = os.fork()
+    if pid == 0:
+        code = 1
+        try:
+            code = 0 if body() else 3
+        except BaseException:
+            code = 2
+        finally:
+            os._exit(code)
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        done, status = os.waitpid(pid, os.WNOHANG)
+        if done:
+            return os.waitstatus_to_exitcode(status)
+        time.sleep(0.01)
+    os.kill(pid, 9)
+    os.waitpid(pid, 0)
+    return -1
+
+
+def test_child_does_not_reuse_parent_connections(server) -> None:
+    transport = PooledHttpClient()
+    client = PingClient("abc123de", {"base_url": server_url(server, ""), "http_client": transport})
+    client.ping()
+    parent_socket = transport._idle[next(iter(transport._idle))][0][1].sock
+
+    def child() -> bool:
+        assert transport._idle == {}
+        client.ping()
+        fresh = transport._idle[next(iter(transport._idle))][0][1].sock
+        return fresh is not parent_socket
+
+    assert _in_child(child) == 0
+    client.ping()  # the parent's pooled socket is still intact
+    assert len(set(server.peers)) == 2
+    assert server.peers[0] == server.peers[-1]
+
+
+def test_fork_under_load_with_background_sender_and_held_locks(server) -> None:
+    transport = PooledHttpClient()
+    sender = BackgroundSender(queue_size=10000)
+    client = PingClient("abc123de", {"base_url": server_url(server, ""), "http_client": transport, "sender": sender})
+    stop = threading.Event()
+
+    def hammer() -> None:
+        while not stop.is_set():
+            client.progress(50, "parent")
+
+    workers = [threading.Thread(target=hammer) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    try:
+        time.sleep(0.05)
+        # Locks held at fork time would deadlock the child without the reset.
+        with client._stats._lock, transport._lock:
+            pid_codes = []
+
+            def child() -> bool:
+                assert sender._unfinished == 0 and not sender._queue
+                for seq in range(5):
+                    client.progress(seq, "child")
+                client.success()
+                return client.flush(5) and sender.failed == 0
+
+            for _ in range(3):
+                pid_codes.append(_in_child(child))
+    finally:
+        stop.set()
+        for worker in workers:
+            worker.join()
+
+    assert pid_codes == [0, 0, 0]
+    assert client.flush(5)
+    assert server.paths.count("/ping/abc123de/end/success") == 3
+
+
+def test_jitter_rng_is_reseeded_in_child() -> None:
+    rng = client_module._jitter_random()
+    read_end, write_end = os.pipe()
+
+    def child() -> bool:
+        os.write(write_end, repr(rng.random()).encode())
+        return True
+
+    assert _in_child(child) == 0
+    os.close(write_end)
+    child_value = float(os.read(read_end, 64))
+    os.close(read_end)
+    assert child_value != rng.random()
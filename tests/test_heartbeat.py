@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+from collections import Counter
+
+from cronbeats_python import HeartbeatScheduler
+from cronbeats_python.http import HttpResponse
+
+
+class CountingAsyncHttpClient:
+    def __init__(self, delay: float = 0.0) -> None:
+        self.delay = delay
+        self.pings: Counter = Counter()
+        self.threads = set()
+
+    async def request(self, method, url, headers, body, timeout_ms):  # noqa: ANN001
+        self.threads.add(threading.get_ident())
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.pings[url.rsplit("/", 1)[-1]] += 1
+        return HttpResponse(status=200, body=b"", headers={})
+
+
+def _wait_for(predicate, timeout: float = 5.0) -> bool:  # noqa: ANN001
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def test_keys_are_pinged_periodically_from_one_thread() -> None:
+    stub = CountingAsyncHttpClient()
+    scheduler = HeartbeatScheduler({"http_client": stub}, interval_s=0.05, jitter=0.2)
+    for key in ("abc123de", "zyx987wv", "qwe456rt"):
+        scheduler.add(key)
+
+    assert _wait_for(lambda: min(stub.pings[k] for k in ("abc123de", "zyx987wv", "qwe456rt")) >= 3)
+    assert len(stub.threads) == 1
+    assert scheduler.stop(2)
+    count = sum(stub.pings.values())
+    time.sleep(0.1)
+    assert sum(stub.pings.values()) == count
+    assert scheduler.sent == count
+
+
+def test_pause_and_resume() -> None:
+    stub = CountingAsyncHttpClient()
+    scheduler = HeartbeatScheduler({"http_client": stub}, interval_s=0.03)
+    scheduler.add("abc123de")
+    scheduler.add("zyx987wv")
+    assert _wait_for(lambda: stub.pings["abc123de"] >= 1)
+
+    scheduler.pause("abc123de")
+    time.sleep(0.05)
+    paused_count = stub.pings["abc123de"]
+    time.sleep(0.15)
+    assert stub.pings["abc123de"] == paused_count
+    assert stub.pings["zyx987wv"] >= 3
+
+    scheduler.resume("abc123de")
+    assert _wait_for(lambda: stub.pings["abc123de"] > paused_count, timeout=0.5)
+    scheduler.remove("zyx987wv")
+    assert _wait_for(lambda: "zyx987wv" not in scheduler)
+    assert scheduler.stop(2)
+
+
+def test_slow_pings_are_skipped_not_queued() -> None:
+    stub = CountingAsyncHttpClient(delay=0.2)
+    scheduler = HeartbeatScheduler({"http_client": stub}, interval_s=0.02, jitter=0.0)
+    scheduler.add("abc123de")
+    time.sleep(0.3)
+    assert scheduler.stop(2)
+    assert scheduler.skipped >= 3
+    assert stub.pings["abc123de"] <= 2
+
+
+def test_ten_thousand_heartbeats_on_one_thread() -> None:
+    stub = CountingAsyncHttpClient()
+    scheduler = HeartbeatScheduler({"http_client": stub}, interval_s=2.0, max_in_flight=200)
+    keys = [f"hb{index:06d}" for index in range(10000)]
+    before = threading.active_count()
+    for key in keys:
+        scheduler.add(key)
+
+    assert threading.active_count() == before + 1
+    assert _wait_for(lambda: len(stub.pings) == len(keys), timeout=10.0)
+    assert len(stub.threads) == 1
+    assert scheduler.failed == 0
+    assert scheduler.stop(5)
@@ -0,0 +1,78 @@
+import os
+
+import pytest
+
+from cronbeats_python import SdkError
+from cronbeats_python.http import PooledHttpClient
+
+from conftest import KeepAliveHandler, server_url as _url
+
+
+def test_connections_are_reused_across_requests(server) -> None:
+    client = PooledHttpClient()
+    for _ in range(3):
+        res = client.request("POST", _url(server), {"Accept": "application/json"}, None, 2000)
+        assert res.status == 200
+        assert res.headers["x-test"] == "yes"
+    assert len(set(server.peers)) == 1
+    client.close()
+
+
+def test_connections_are_reused_with_high_numbered_fds(server) -> None:
+    resource = pytest.importorskip("resource")
+    if resource.getrlimit(resource.RLIMIT_NOFILE)[0] < 1200:
+        pytest.skip("needs more than 1100 open files")
+    # Push the next sockets past FD_SETSIZE, where select.select() refuses them.
+    padding = [os.open(os.devnull, os.O_RDONLY) for _ in range(1100)]
+    try:
+        client = PooledHttpClient()
+        for _ in range(5):
+            assert client.request("POST", _url(server), {}, None, 2000).status == 200
+        assert len(set(server.peers)) == 1
+        client.close()
+    finally:
+        for fd in padding:
+            os.close(fd)
+
+
+def test_requests_go_through_http_proxy_from_environment(server, proxy_env) -> None:
+    proxy_env(http_proxy=_url(server, ""))
+    client = PooledHttpClient()
+    res = client.request("POST", "http://cronbeats.invalid/ping/abc123de", {}, None, 2000)
+    assert res.status == 200
+    # A forward proxy receives the absolute URL as the request target.
+    assert server.paths == ["http://cronbeats.invalid/ping/abc123de"]
+
+
+def test_no_proxy_hosts_are_pooled_directly(server, proxy_env) -> None:
+    proxy_env(http_proxy="http://127.0.0.1:1", no_proxy="127.0.0.1")
+    client = PooledHttpClient()
+    for _ in range(2):
+        assert client.request("POST", _url(server), {}, None, 2000).status == 200
+    assert server.paths == ["/ping/abc123de", "/ping/abc123de"]
+    assert len(set(server.peers)) == 1
+    client.close()
+
+
+def test_reconnects_when_server_closes_connection(server, monkeypatch) -> None:
+    monkeypatch.setattr(KeepAliveHandler, "close_after_response", True)
+    client = PooledHttpClient()
+    for _ in range(2):
+        res = client.request("POST", _url(server), {}, '{"message":"x"}', 2000)
+        assert res.status == 200
+    assert len(set(server.peers)) == 2
+    client.close()
+
+
+def test_idle_connections_are_reaped(server) -> None:
+    client = PooledHttpClient(idle_timeout_s=0.0)
+    client.request("POST", _url(server), {}, None, 2000)
+    client.request("POST", _url(server), {}, None, 2000)
+    assert len(set(server.peers)) == 2
+    client.close()
+
+
+def test_connection_refused_raises_sdk_error() -> None:
+    client = PooledHttpClient()
+    with pytest.raises(SdkError):
+        client.request("POST", "http://127.0.0.1:1/ping/abc123de", {}, None, 500)
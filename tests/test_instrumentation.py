@@ -0,0 +1,75 @@
+import json
+from typing import List
+
+import pytest
+
+from cronbeats_python import ApiError, PingClient
+from cronbeats_python.http import HttpResponse, PooledHttpClient
+from cronbeats_python.instrumentation import Instrumentation, RequestEvent
+
+from conftest import server_url
+
+
+def test_hook_receives_attempts_with_retry_reasons(stub_http_client) -> None:
+    events: List[RequestEvent] = []
+    stub = stub_http_client(
+        responses=[
+            HttpResponse(status=503, body="{}", headers={}),
+            HttpResponse(status=200, body=json.dumps({"action": "progress"}), headers={}),
+        ],
+        network_failures=1,
+    )
+    client = PingClient(
+        "abc123de",
+        {
+            "http_client": stub,
+            "max_retries": 2,
+            "retry_backoff_ms": 0,
+            "retry_jitter_ms": 0,
+            "on_request_complete": events.append,
+        },
+    )
+    client.progress(10, "ten")
+
+    (event,) = events
+    assert event.action == "progress"
+    assert event.outcome == "ok"
+    assert event.retries == 2
+    assert [a.retry_reason for a in event.attempts] == ["NETWORK_ERROR", "SERVER_ERROR", None]
+    assert [a.status for a in event.attempts] == [None, 503, 200]
+    assert event.attempts[0].error == "socket timeout"
+    assert event.total_ns >= sum(a.duration_ns for a in event.attempts)
+    assert event.encode_ns > 0
+
+
+def test_failed_call_reports_error_code_and_hook_errors_are_ignored(stub_http_client) -> None:
+    class Exploding(Instrumentation):
+        def __init__(self) -> None:
+            self.outcomes: List[str] = []
+
+        def on_request_complete(self, event: RequestEvent) -> None:
+            self.outcomes.append(event.outcome)
+            raise RuntimeError("boom")
+
+    instrumentation = Exploding()
+    stub = stub_http_client(responses=[HttpResponse(status=404, body="{}", headers={})])
+    client = PingClient("abc123de", {"http_client": stub, "instrumentation": instrumentation})
+    with pytest.raises(ApiError):
+        client.ping()
+    assert instrumentation.outcomes == ["NOT_FOUND"]
+
+
+def test_pooled_transport_reports_connection_phases(server) -> None:
+    events: List[RequestEvent] = []
+    client = PingClient(
+        "abc123de",
+        {"base_url": server_url(server, ""), "http_client": PooledHttpClient(), "on_request_complete": events.append},
+    )
+    client.ping()
+    client.ping()
+    first, second = (e.attempts[0] for e in events)
+    assert first.reused_connection is False
+    assert first.dns_ns is not None and first.connect_ns is not None and first.tls_ns == 0
+    assert first.first_byte_ns is not None and first.first_byte_ns > 0
+    assert second.reused_connection is True
+    assert second.connect_ns is None
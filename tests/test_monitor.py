@@ -0,0 +1,189 @@
+import asyncio
+import json
+import threading
+import time
+from typing import List
+
+import pytest
+
+from cronbeats_python import AsyncPingClient, PingClient, ValidationError, monitor
+from cronbeats_python.http import HttpResponse
+
+
+class SlowStartHttpClient:
+    def __init__(self, start_delay: float = 0.0) -> None:
+        self.start_delay = start_delay
+        self.calls: List[tuple] = []
+        self.start_done = threading.Event()
+
+    def request(self, method, url, headers, body, timeout_ms):  # noqa: ANN001
+        if url.endswith("/start"):
+            time.sleep(self.start_delay)
+            self.start_done.set()
+        self.calls.append((url.split("/ping/abc123de", 1)[1], json.loads(body) if body else None))
+        return HttpResponse(status=200, body=b"{}", headers={})
+
+
+class AsyncSlowStartHttpClient(SlowStartHttpClient):
+    async def request(self, method, url, headers, body, timeout_ms):  # noqa: ANN001
+        if url.endswith("/start"):
+            await asyncio.sleep(self.start_delay)
+        return SlowStartHttpClient.request(self, method, url, headers, body, timeout_ms)
+
+
+def test_run_does_not_block_on_start_and_reports_duration() -> None:
+    stub = SlowStartHttpClient(start_delay=0.2)
+    client = PingClient("abc123de", {"http_client": stub})
+
+    entered = time.monotonic()
+    with client.run() as run:
+        assert time.monotonic() - entered < 0.1
+        assert not stub.start_done.is_set()
+
+    assert [path for path, _ in stub.calls] == ["/start", "/end/success"]
+    assert stub.calls[1][1]["duration_ms"] == pytest.approx(run.duration_ms, abs=0.01)
+    assert run.error is None
+
+
+def test_system_exit_with_zero_or_none_is_success() -> None:
+    stub = SlowStartHttpClient()
+
+    @monitor("abc123de", {"http_client": stub})
+    def job(code: object) -> None:
+        raise SystemExit(code)
+
+    for code in (None, 0, 2, "boom"):
+        with pytest.raises(SystemExit):
+            job(code)
+    ends = [path for path, _ in stub.calls if path.startswith("/end")]
+    assert ends == ["/end/success", "/end/success", "/end/fail", "/end/fail"]
+
+
+def test_decorator_reports_failure_and_reraises() -> None:
+    stub = SlowStartHttpClient()
+
+    @monitor("abc123de", {"http_client": stub})
+    def job(value: int) -> int:
+        if value < 0:
+            raise ValueError("negative")
+        return value * 2
+
+    assert job(21) == 42
+    with pytest.raises(ValueError):
+        job(-1)
+    assert [path for path, _ in stub.calls] == ["/start", "/end/success", "/start", "/end/fail"]
+    assert job.__name__ == "job"
+
+
+def test_telemetry_errors_never_reach_the_job() -> None:
+    class DownHttpClient:
+        def request(self, method, url, headers, body, timeout_ms):  # noqa: ANN001
+            return HttpResponse(status=404, body=b'{"message":"Job not found"}', headers={})
+
+    client = PingClient("abc123de", {"http_client": DownHttpClient()})
+    with client.run() as run:
+        pass
+    assert run.error is not None and run.error.code == "NOT_FOUND"
+
+
+def test_malformed_key_is_rejected_when_decorating() -> None:
+    with pytest.raises(ValidationError):
+
+        @monitor("bad-key")
+        def job() -> None:
+            pass
+
+
+def test_generator_is_monitored_until_exhausted_or_closed() -> None:
+    stub = SlowStartHttpClient()
+
+    @monitor(PingClient("abc123de", {"http_client": stub}))
+    def rows():
+        yield 1
+        yield 2
+        return "done"
+
+    assert list(rows()) == [1, 2]
+    assert [path for path, _ in stub.calls] == ["/start", "/end/success"]
+
+    gen = rows()
+    next(gen)
+    gen.close()
+    assert [path for path, _ in stub.calls][-1] == "/end/success"
+
+
+def test_async_function_and_async_generator() -> None:
+    stub = AsyncSlowStartHttpClient(start_delay=0.1)
+    client = AsyncPingClient("abc123de", {"http_client": stub})
+
+    @monitor(client)
+    async def job() -> str:
+        await asyncio.sleep(0)
+        raise RuntimeError("boom")
+
+    @monitor(client)
+    async def stream():
+        yield "a"
+        yield "b"
+
+    async def run() -> List[str]:
+        with pytest.raises(RuntimeError):
+            await job()
+        async with client.run() as ctx:
+            pass
+        assert ctx.duration_ms is not None
+        return [item async for item in stream()]
+
+    assert asyncio.run(run()) == ["a", "b"]
+    assert [path for path, _ in stub.calls] == [
+        "/start",
+        "/end/fail",
+        "/start",
+        "/end/success",
+        "/start",
+        "/end/success",
+    ]
+
+
+def test_deferred_start_is_skipped_for_short_jobs() -> None:
+    stub = SlowStartHttpClient()
+    client = PingClient("abc123de", {"http_client": stub, "defer_start_ms": 200})
+
+    result = client.start()
+    assert result["deferred"] is True
+    client.success()
+    time.sleep(0.25)
+
+    assert [path for path, _ in stub.calls] == ["/end/success"]
+    body = stub.calls[0][1]
+    assert body["started_at"] == pytest.approx(time.time(), abs=2)
+    assert 0 <= body["duration_ms"] < 200
+
+
+def test_deferred_start_fires_for_long_jobs() -> None:
+    stub = SlowStartHttpClient()
+
+    @monitor("abc123de", {"http_client": stub, "defer_start_ms": 50})
+    def job() -> None:
+        time.sleep(0.15)
+
+    job()
+    assert [path for path, _ in stub.calls] == ["/start", "/end/success"]
+    assert "started_at" in stub.calls[0][1]
+    assert stub.calls[1][1]["started_at"] == stub.calls[0][1]["started_at"]
+    assert stub.calls[1][1]["duration_ms"] >= 150
+
+
+def test_async_deferred_start() -> None:
+    stub = AsyncSlowStartHttpClient()
+    client = AsyncPingClient("abc123de", {"http_client": stub, "defer_start_ms": 50})
+
+    async def run() -> None:
+        async with client.run():
+            pass
+        await client.start()
+        await asyncio.sleep(0.1)
+        await client.fail()
+
+    asyncio.run(run())
+    assert [path for path, _ in stub.calls] == ["/end/success", "/start", "/end/fail"]
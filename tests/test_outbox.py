@@ -0,0 +1,194 @@
+import asyncio
+import json
+import threading
+import time
+
+import pytest
+
+from cronbeats_python import ApiError, AsyncPingClient, PingClient
+from cronbeats_python.http import HttpResponse
+from cronbeats_python.outbox import SqliteOutbox
+
+
+def _client(stub, tmp_path, **options) -> PingClient:
+    return PingClient(
+        "abc123de",
+        {"http_client": stub, "outbox_dir": str(tmp_path), "max_retries": 0, **options},
+    )
+
+
+def test_undeliverable_event_is_spooled_and_replayed_before_next_event(tmp_path, stub_http_client) -> None:
+    stub = stub_http_client(network_failures=1)
+    client = _client(stub, tmp_path)
+    with pytest.raises(ApiError) as exc:
+        client.progress(40, "Halfway")
+    assert exc.value.code == "NETWORK_ERROR"
+    assert client.outbox is not None and len(client.outbox) == 1
+
+    client.success()
+    assert len(client.outbox) == 0
+    assert stub.calls[-1]["url"] == "https://cronbeats.io/ping/abc123de/end/success"
+    replayed = stub.calls[-2]
+    assert replayed["url"] == "https://cronbeats.io/ping/abc123de/progress/40"
+    sent = json.loads(replayed["body"] or "{}")
+    assert sent["message"] == "Halfway"
+    assert isinstance(sent["client_timestamp"], float)
+
+
+def test_spool_survives_process_restart_and_explicit_drain(tmp_path, stub_http_client) -> None:
+    failing = stub_http_client(responses=[HttpResponse(status=503, body="{}", headers={})])
+    with pytest.raises(ApiError):
+        _client(failing, tmp_path).start()
+
+    stub = stub_http_client()
+    client = _client(stub, tmp_path)
+    assert client.drain_outbox() == 1
+    assert stub.calls[0]["url"] == "https://cronbeats.io/ping/abc123de/start"
+
+
+def test_non_retryable_errors_are_not_spooled(tmp_path, stub_http_client) -> None:
+    stub = stub_http_client(responses=[HttpResponse(status=404, body="{}", headers={})])
+    client = _client(stub, tmp_path)
+    with pytest.raises(ApiError):
+        client.ping()
+    assert client.outbox is not None and len(client.outbox) == 0
+
+
+def test_failed_replay_keeps_remaining_events_in_order(tmp_path, stub_http_client) -> None:
+    outbox = SqliteOutbox(str(tmp_path))
+    for seq in (1, 2, 3):
+        outbox.append("https://cronbeats.io", "abc123de", "progress", f"/ping/abc123de/progress/{seq}", {}, 1.0)
+
+    stub = stub_http_client(
+        responses=[
+            HttpResponse(status=200, body="{}", headers={}),
+            HttpResponse(status=500, body="{}", headers={}),
+        ]
+    )
+    client = PingClient("abc123de", {"http_client": stub, "outbox": outbox, "max_retries": 0})
+    assert client.drain_outbox() == 1
+    assert len(outbox) == 2
+    assert [e.path.rsplit("/", 1)[1] for e in outbox.claim()] == ["2", "3"]
+
+
+def _paths(stub) -> list:
+    return [call["url"].split("/ping/abc123de", 1)[1] for call in stub.calls]
+
+
+def test_outage_does_not_reorder_a_jobs_lifecycle(tmp_path, stub_http_client) -> None:
+    stub = stub_http_client(network_failures=2)
+    client = _client(stub, tmp_path, circuit_breaker=None, retry_budget=None)
+    with pytest.raises(ApiError):
+        client.start()
+    with pytest.raises(ApiError):
+        client.progress(50)
+
+    stub.calls.clear()
+    client.success()
+    assert _paths(stub) == ["/start", "/progress/50", "/end/success"]
+    assert client.outbox is not None and len(client.outbox) == 0
+
+
+def test_new_event_queues_behind_spooled_events_while_still_down(tmp_path, stub_http_client) -> None:
+    stub = stub_http_client(network_failures=3)
+    client = _client(stub, tmp_path, circuit_breaker=None, retry_budget=None)
+    with pytest.raises(ApiError):
+        client.start()
+
+    stub.calls.clear()
+    with pytest.raises(ApiError):
+        client.progress(50)
+    # Only the replay was attempted; progress was spooled behind start without being sent.
+    assert _paths(stub) == ["/start"]
+    assert client.outbox is not None
+    assert [event.action for event in client.outbox.claim()] == ["start", "progress"]
+
+
+def test_spooled_lifecycle_is_kept_and_replayed_in_order(tmp_path, stub_http_client) -> None:
+    stub = stub_http_client(network_failures=3)
+    client = _client(stub, tmp_path, circuit_breaker=None, retry_budget=None)
+    for call in (client.start, lambda: client.progress(50), client.success):
+        with pytest.raises(ApiError):
+            call()
+
+    stub.calls.clear()
+    client.ping()
+    assert _paths(stub) == ["/start", "/progress/50", "/end/success", ""]
+
+
+def _spool_start(tmp_path) -> None:
+    SqliteOutbox(str(tmp_path)).append("https://cronbeats.io", "abc123de", "start", "/ping/abc123de/start", {}, 1.0)
+
+
+def test_async_client_runs_outbox_io_off_the_event_loop(tmp_path, monkeypatch, async_stub_http_client) -> None:
+    _spool_start(tmp_path)
+    threads = set()
+    for name in ("claim", "restore", "has_pending", "append"):
+        original = getattr(SqliteOutbox, name)
+
+        def recorded(self, *args, _original=original):  # noqa: ANN001, ANN002
+            threads.add(threading.get_ident())
+            return _original(self, *args)
+
+        monkeypatch.setattr(SqliteOutbox, name, recorded)
+
+    stub = async_stub_http_client()
+    client = AsyncPingClient("abc123de", {"http_client": stub, "outbox_dir": str(tmp_path), "max_retries": 0})
+    asyncio.run(client.ping())
+
+    assert [call["url"] for call in stub.calls] == [
+        "https://cronbeats.io/ping/abc123de/start",
+        "https://cronbeats.io/ping/abc123de",
+    ]
+    assert threads and threading.get_ident() not in threads
+
+
+def test_cancelled_async_replay_puts_events_back(tmp_path) -> None:
+    _spool_start(tmp_path)
+
+    class HangingHttpClient:
+        async def request(self, method, url, headers, body, timeout_ms):  # noqa: ANN001
+            await asyncio.sleep(10)
+
+    client = AsyncPingClient(
+        "abc123de", {"http_client": HangingHttpClient(), "outbox_dir": str(tmp_path), "max_retries": 0}
+    )
+
+    async def run() -> None:
+        task = asyncio.ensure_future(client.drain_outbox())
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(run())
+    assert client.outbox is not None
+    assert [event.action for event in client.outbox.claim()] == ["start"]
+
+
+def test_cancel_during_async_spool_write_stays_a_cancellation(tmp_path, monkeypatch, async_stub_http_client) -> None:
+    writing = threading.Event()
+    original = SqliteOutbox.append
+
+    def slow_append(self, *args):  # noqa: ANN001, ANN002
+        writing.set()
+        time.sleep(0.2)
+        return original(self, *args)
+
+    monkeypatch.setattr(SqliteOutbox, "append", slow_append)
+    client = AsyncPingClient(
+        "abc123de",
+        {"http_client": async_stub_http_client(network_failures=1), "outbox_dir": str(tmp_path), "max_retries": 0},
+    )
+
+    async def run() -> "asyncio.Task[object]":
+        task = asyncio.ensure_future(client.success())
+        while not writing.is_set():
+            await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.wait((task,))
+        return task
+
+    task = asyncio.run(run())
+    assert task.cancelled()
+    assert client.outbox is not None and len(client.outbox) == 1
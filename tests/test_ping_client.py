@@ -1,35 +1,18 @@
 import json
-from typing import Dict, List, Optional
-
+import time
 import pytest
 
-from cronbeats_python import ApiError, PingClient, SdkError, ValidationError
+from cronbeats_python import ApiError, PingClient, ValidationError
 from cronbeats_python.http import HttpResponse
 
 
-class StubHttpClient:
-    def __init__(self, responses: Optional[List[HttpResponse]] = None, network_failures: int = 0) -> None:
-        self.responses = responses or []
-        self.network_failures = network_failures
-        self.calls: List[Dict[str, Optional[str]]] = []
-
-    def request(self, method, url, headers, body, timeout_ms):  # noqa: ANN001
-        self.calls.append({"method": method, "url": url, "body": body})
-        if self.network_failures > 0:
-            self.network_failures -= 1
-            raise SdkError("socket timeout")
-        if not self.responses:
-            return HttpResponse(status=200, body=json.dumps({}), headers={})
-        return self.responses.pop(0)
-
-
 def test_invalid_job_key_raises_validation_error() -> None:
     with pytest.raises(ValidationError):
         PingClient("invalid-key")
 
 
-def test_success_response_is_normalized() -> None:
-    stub = StubHttpClient(
+def test_success_response_is_normalized(stub_http_client) -> None:
+    stub = stub_http_client(
         responses=[
             HttpResponse(
                 status=200,
@@ -55,8 +38,8 @@ def test_success_response_is_normalized() -> None:
     assert res["processingTimeMs"] == 8.25
 
 
-def test_404_maps_to_not_found() -> None:
-    stub = StubHttpClient(
+def test_404_maps_to_not_found(stub_http_client) -> None:
+    stub = stub_http_client(
         responses=[
             HttpResponse(status=404, body=json.dumps({"status": "error", "message": "Job not found"}), headers={})
         ]
@@ -69,8 +52,8 @@ def test_404_maps_to_not_found() -> None:
     assert exc.value.http_status == 404
 
 
-def test_retry_on_429_then_success() -> None:
-    stub = StubHttpClient(
+def test_retry_on_429_then_success(stub_http_client) -> None:
+    stub = stub_http_client(
         responses=[
             HttpResponse(
                 status=429,
@@ -107,8 +90,8 @@ def test_retry_on_429_then_success() -> None:
     assert len(stub.calls) == 2
 
 
-def test_no_retry_on_400() -> None:
-    stub = StubHttpClient(
+def test_no_retry_on_400(stub_http_client) -> None:
+    stub = stub_http_client(
         responses=[
             HttpResponse(status=400, body=json.dumps({"status": "error", "message": "Invalid request"}), headers={})
         ]
@@ -121,8 +104,8 @@ def test_no_retry_on_400() -> None:
     assert len(stub.calls) == 1
 
 
-def test_retry_on_network_error_then_success() -> None:
-    stub = StubHttpClient(
+def test_retry_on_network_error_then_success(stub_http_client) -> None:
+    stub = stub_http_client(
         responses=[
             HttpResponse(
                 status=200,
@@ -155,8 +138,8 @@ def test_retry_on_network_error_then_success() -> None:
     assert len(stub.calls) == 2
 
 
-def test_progress_normalization_and_message_truncation() -> None:
-    stub = StubHttpClient(
+def test_progress_normalization_and_message_truncation(stub_http_client) -> None:
+    stub = stub_http_client(
         responses=[
             HttpResponse(
                 status=200,
@@ -180,3 +163,109 @@ def test_progress_normalization_and_message_truncation() -> None:
     assert stub.calls[0]["url"].endswith("/ping/abc123de/progress/50")
     sent = json.loads(stub.calls[0]["body"] or "{}")
     assert len(sent["message"]) == 255
+
+
+def test_progress_throttle_skips_frequent_updates_but_keeps_boundaries(stub_http_client) -> None:
+    stub = stub_http_client()
+    client = PingClient("abc123de", {"http_client": stub, "progress_min_interval_ms": 60_000})
+    for seq in range(0, 101):
+        client.progress(seq, f"{seq}%")
+    sent = [call["url"].rsplit("/", 1)[1] for call in stub.calls]
+    assert sent == ["0", "100"]
+
+
+def test_progress_throttle_passes_changed_messages(stub_http_client) -> None:
+    stub = stub_http_client()
+    client = PingClient("abc123de", {"http_client": stub, "progress_min_interval_ms": 60_000})
+    client.progress(None, "Connecting...")
+    res = client.progress(None, "Connecting...")
+    client.progress(None, "Syncing...")
+    assert res["skipped"] is True
+    assert [json.loads(call["body"] or "{}")["message"] for call in stub.calls] == ["Connecting...", "Syncing..."]
+
+
+def test_progress_min_delta(stub_http_client) -> None:
+    stub = stub_http_client()
+    client = PingClient("abc123de", {"http_client": stub, "progress_min_delta": 10})
+    for seq in (3, 5, 12, 13, 22, 99):
+        client.progress(seq)
+    sent = [call["url"].rsplit("/", 1)[1] for call in stub.calls]
+    assert sent == ["3", "13", "99"]
+
+
+def test_deadline_bounds_retries_and_backoff(stub_http_client) -> None:
+    stub = stub_http_client(network_failures=10)
+    client = PingClient(
+        "abc123de",
+        {"http_client": stub, "max_retries": 5, "retry_backoff_ms": 1000, "retry_jitter_ms": 0, "deadline_ms": 300},
+    )
+    started = time.monotonic()
+    with pytest.raises(ApiError) as exc:
+        client.ping()
+    assert time.monotonic() - started < 0.3
+    assert exc.value.code == "NETWORK_ERROR"
+    assert len(stub.calls) == 1
+
+
+def test_attempt_timeout_shrinks_to_remaining_deadline(stub_http_client) -> None:
+    stub = stub_http_client()
+    client = PingClient("abc123de", {"http_client": stub, "timeout_ms": 5000})
+    client.ping()
+    client.ping(deadline_ms=200)
+    assert stub.calls[0]["timeout_ms"] == 5000
+    assert 0 < stub.calls[1]["timeout_ms"] <= 200
+
+
+def test_per_call_deadline_overrides_client_default(stub_http_client) -> None:
+    stub = stub_http_client(network_failures=1)
+    client = PingClient(
+        "abc123de",
+        {"http_client": stub, "retry_backoff_ms": 50, "retry_jitter_ms": 0, "deadline_ms": 10},
+    )
+    assert client.success(deadline_ms=2000)["ok"] is True
+    assert len(stub.calls) == 2
+
+
+def test_deadline_exceeded_while_rate_limited(stub_http_client) -> None:
+    from cronbeats_python.ratelimit import TokenBucketLimiter
+
+    limiter = TokenBucketLimiter()
+    limiter.observe(429, {"retry-after": "10"})
+    client = PingClient("abc123de", {"http_client": stub_http_client(), "rate_limiter": limiter})
+    with pytest.raises(ApiError) as exc:
+        client.ping(deadline_ms=100)
+    assert exc.value.code == "DEADLINE_EXCEEDED"
+
+
+def test_request_bodies_are_bytes_and_empty_bodies_skip_encoding(stub_http_client) -> None:
+    stub = stub_http_client(body=b"", max_calls=10)
+    client = PingClient("abc123de", {"http_client": stub})
+    result = client.ping()
+    client.progress(5, "half")
+
+    assert result["ok"] is True
+    assert stub.bodies[0] is None
+    assert stub.bodies[1] == b'{"message":"half"}'
+
+
+def test_progress_hot_path_does_not_accumulate_allocations(stub_http_client) -> None:
+    import tracemalloc
+
+    stub = stub_http_client(body=b'{"status":"success","action":"progress"}', max_calls=10)
+    client = PingClient("abc123de", {"http_client": stub})
+    for _ in range(200):
+        client.progress(50, "working")
+
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for _ in range(5000):
+            client.progress(50, "working")
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # Nothing may be retained per call, and each call's transient working set stays small.
+    assert current - baseline < 4096
+    assert peak - baseline < 16384
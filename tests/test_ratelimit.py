@@ -0,0 +1,98 @@
+import json
+import time
+
+import pytest
+
+from cronbeats_python import ApiError, PingClient
+from cronbeats_python.http import HttpResponse
+from cronbeats_python.ratelimit import TokenBucketLimiter, parse_retry_after, shared_limiter
+
+
+def test_parse_retry_after_seconds_and_http_date() -> None:
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("garbage") is None
+    assert parse_retry_after(None) is None
+    delay = parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT", now=1445412470.0)
+    assert delay == pytest.approx(10.0)
+
+
+def test_429_waits_for_retry_after(monkeypatch, stub_http_client) -> None:
+    sleeps = []
+    monkeypatch.setattr("time.sleep", sleeps.append)
+    stub = stub_http_client(
+        responses=[
+            HttpResponse(status=429, body="{}", headers={"retry-after": "2"}),
+            HttpResponse(status=200, body=json.dumps({"action": "ping"}), headers={}),
+        ]
+    )
+    client = PingClient("abc123de", {"http_client": stub, "retry_backoff_ms": 1, "retry_jitter_ms": 0})
+    assert client.ping()["ok"] is True
+    assert sleeps[0] == pytest.approx(2.0)
+
+
+def test_retry_after_beyond_limit_fails_fast(stub_http_client) -> None:
+    stub = stub_http_client(responses=[HttpResponse(status=429, body="{}", headers={"retry-after": "600"})])
+    client = PingClient("abc123de", {"http_client": stub, "max_retries": 2})
+    with pytest.raises(ApiError) as exc:
+        client.ping()
+    assert exc.value.code == "RATE_LIMITED"
+    assert len(stub.calls) == 1
+
+
+def test_retry_after_is_shared_by_clients_for_same_base_url(monkeypatch, stub_http_client) -> None:
+    stub = stub_http_client(
+        responses=[HttpResponse(status=429, body="{}", headers={"retry-after": "5"})],
+    )
+    first = PingClient("abc123de", {"http_client": stub, "max_retries": 0})
+    with pytest.raises(ApiError):
+        first.ping()
+
+    sleeps = []
+    monkeypatch.setattr("time.sleep", sleeps.append)
+    PingClient("zzz999yy", {"http_client": stub}).ping()
+    assert sleeps and sleeps[0] == pytest.approx(5.0, abs=0.5)
+    assert shared_limiter("https://cronbeats.io") is first.rate_limiter
+
+
+def test_long_retry_after_does_not_block_other_clients(monkeypatch, tmp_path, stub_http_client) -> None:
+    stub = stub_http_client(responses=[HttpResponse(status=429, body="{}", headers={"retry-after": "3600"})])
+    with pytest.raises(ApiError):
+        PingClient("abc123de", {"http_client": stub, "max_retries": 0}).ping()
+    # The shared bucket holds back for at most max_retry_after_ms (30s by default), not an hour.
+    assert shared_limiter("https://cronbeats.io").reserve() <= 30.0
+
+    sleeps = []
+    monkeypatch.setattr("time.sleep", sleeps.append)
+    other = PingClient(
+        "zzz999yy",
+        {"http_client": stub, "max_retry_after_ms": 1000, "outbox_dir": str(tmp_path)},
+    )
+    with pytest.raises(ApiError) as exc:
+        other.progress(50)
+    assert exc.value.code == "RATE_LIMITED"
+    assert sleeps == []
+    assert len(stub.calls) == 1
+    assert other.outbox is not None and len(other.outbox) == 1
+
+
+def test_rate_limit_headers_pace_requests() -> None:
+    limiter = TokenBucketLimiter(burst=2)
+    assert limiter.reserve() == 0.0
+    limiter.observe(200, {"x-ratelimit-limit": "100", "x-ratelimit-remaining": "10", "x-ratelimit-reset": "10"})
+    # 10 requests left in 10s: a token per second after the burst is used.
+    delays = [limiter.reserve() for _ in range(4)]
+    assert delays[0] == 0.0
+    assert delays[-1] > 1.0
+
+
+def test_exhausted_quota_blocks_until_reset() -> None:
+    limiter = TokenBucketLimiter()
+    limiter.observe(200, {"x-ratelimit-remaining": "0", "x-ratelimit-reset": str(time.time() + 3)})
+    assert limiter.reserve() == pytest.approx(3.0, abs=0.5)
+
+
+def test_limiter_can_be_disabled(stub_http_client) -> None:
+    stub = stub_http_client()
+    client = PingClient("abc123de", {"http_client": stub, "rate_limiter": None})
+    assert client.rate_limiter is None
+    assert client.ping()["ok"] is True
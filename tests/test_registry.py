@@ -0,0 +1,151 @@
+import asyncio
+import json
+import sys
+import tracemalloc
+
+import pytest
+
+from cronbeats_python import PingClient, PingRegistry, ValidationError
+from cronbeats_python.http import HttpResponse
+from cronbeats_python.registry import PingHandle
+
+
+def test_handles_share_transport_and_use_their_own_key(stub_http_client) -> None:
+    stub = stub_http_client()
+    registry = PingRegistry({"http_client": stub, "base_url": "https://example.test"})
+    first = registry.get("abc123de")
+    second = registry["zyx987wv"]
+
+    first.start()
+    second.progress(40, "forty")
+    result = first.end("FAIL")
+    second.success()
+
+    assert registry.get("abc123de") is first
+    assert len(registry) == 2
+    assert result["jobKey"] == "abc123de"
+    assert stub.urls == [
+        "https://example.test/ping/abc123de/start",
+        "https://example.test/ping/zyx987wv/progress/40",
+        "https://example.test/ping/abc123de/end/fail",
+        "https://example.test/ping/zyx987wv/end/success",
+    ]
+    assert registry.stats()["requests"] == 4
+
+
+def test_handles_validate_keys_and_keep_separate_throttle_state(stub_http_client) -> None:
+    stub = stub_http_client()
+    registry = PingRegistry({"http_client": stub, "progress_min_interval_ms": 60000})
+    with pytest.raises(ValidationError):
+        registry.get("bad")
+    with pytest.raises(ValidationError):
+        registry.get("abc123de").end("maybe")
+
+    registry.get("abc123de").progress(10)
+    registry.get("zyx987wv").progress(10)
+    assert registry.get("abc123de").progress(20)["skipped"] is True
+    assert len(stub.urls) == 2
+
+
+def test_for_key_works_on_existing_clients(stub_http_client) -> None:
+    stub = stub_http_client()
+    handle = PingClient("abc123de", {"http_client": stub}).for_key("qwe456rt")
+    handle.ping()
+    assert stub.urls == ["https://cronbeats.io/ping/qwe456rt"]
+
+
+def test_async_registry_handles(async_stub_http_client) -> None:
+    stub = async_stub_http_client()
+    registry = PingRegistry({"http_client": stub}, asyncio=True)
+
+    async def run() -> None:
+        await registry.get("abc123de").start()
+        await registry.get("zyx987wv").fail()
+
+    asyncio.run(run())
+    assert stub.urls == [
+        "https://cronbeats.io/ping/abc123de/start",
+        "https://cronbeats.io/ping/zyx987wv/end/fail",
+    ]
+
+
+def test_per_key_memory_stays_small(stub_http_client) -> None:
+    registry = PingRegistry({"http_client": stub_http_client()})
+    keys = [f"k{index:07d}" for index in range(5000)]
+
+    tracemalloc.start()
+    try:
+        before, _ = tracemalloc.get_traced_memory()
+        for key in keys:
+            registry.get(key)
+        after, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    # Handle, its _JobState, the interned ping path and the registry's dict slot; the key string
+    # itself is the caller's.
+    assert (after - before) / len(keys) < 400
+
+
+def test_handle_paths_derive_from_interned_ping_path_and_methods_are_not_rebound(stub_http_client) -> None:
+    registry = PingRegistry({"http_client": stub_http_client()})
+    handle = registry.get("abc12345")
+
+    assert handle._state.ping_path is sys.intern("/ping/abc12345")
+    assert handle._state.end_path(" FAIL ") == "/ping/abc12345/end/fail"
+    with pytest.raises(ValidationError):
+        handle._state.end_path("done")
+    assert handle.start.__func__ is PingHandle.start
+
+
+class SlowHttpClient:
+    def __init__(self, delay: float, missing: str = "") -> None:
+        self.delay = delay
+        self.missing = missing
+
+    def request(self, method, url, headers, body, timeout_ms):  # noqa: ANN001
+        import time
+
+        time.sleep(self.delay)
+        if self.missing and self.missing in url:
+            return HttpResponse(status=404, body=json.dumps({"message": "Job not found"}), headers={})
+        return HttpResponse(status=200, body=json.dumps({"action": url.rsplit("/", 1)[-1]}), headers={})
+
+
+def test_bulk_ping_runs_concurrently_and_keeps_input_order() -> None:
+    import time
+
+    from cronbeats_python import ApiError, bulk_ping
+
+    items = [(f"job{index:05d}", "success", None) for index in range(40)]
+    items[7] = ("job00007", "progress", {"seq": 70, "message": "seventy"})
+    items[9] = ("missing9", "ping", None)
+    items[11] = ("bad", "ping", None)
+
+    started = time.monotonic()
+    results = bulk_ping(
+        items, concurrency=40, options={"http_client": SlowHttpClient(0.05, "missing9"), "max_retries": 0}
+    )
+    elapsed = time.monotonic() - started
+
+    assert elapsed < 40 * 0.05 / 4
+    assert len(results) == 40
+    assert results[0]["ok"] is True and results[0]["jobKey"] == "job00000"
+    assert results[7]["action"] == "70"
+    assert isinstance(results[9], ApiError) and results[9].code == "NOT_FOUND"
+    assert isinstance(results[11], ValidationError)
+
+
+def test_async_registry_bulk_ping(async_stub_http_client) -> None:
+    stub = async_stub_http_client()
+    registry = PingRegistry({"http_client": stub}, asyncio=True)
+    results = asyncio.run(
+        registry.bulk_ping([("abc123de", "start", None), ("zyx987wv", "end", "fail"), ("abc123de", "walk", None)])
+    )
+
+    assert [r["jobKey"] for r in results[:2]] == ["abc123de", "zyx987wv"]
+    assert isinstance(results[2], ValidationError)
+    assert sorted(stub.urls) == [
+        "https://cronbeats.io/ping/abc123de/start",
+        "https://cronbeats.io/ping/zyx987wv/end/fail",
+    ]
@@ -0,0 +1,161 @@
+import asyncio
+import json
+import os
+import socket
+import stat
+import threading
+import time
+
+import pytest
+
+from cronbeats_python import PingClient, SdkError
+from cronbeats_python import relay as relay_module
+from cronbeats_python.relay import DEFAULT_RELAY_ADDRESS, DEFAULT_RELAY_DIR, Relay, RelayHttpClient, serve
+
+from conftest import server_url
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix domain sockets")
+
+
+def _start_relay(address: str, relay: Relay, **kwargs):  # noqa: ANN003, ANN202
+    # Runs serve() on its own loop thread; returns the thread and a stop() callable.
+    ready = threading.Event()
+    loop_box = {}
+
+    async def run() -> None:
+        stop = loop_box["stop"] = asyncio.Event()
+        loop_box["loop"] = asyncio.get_running_loop()
+        asyncio.get_running_loop().call_later(0.05, ready.set)
+        await serve(address, relay, stop, **kwargs)
+
+    thread = threading.Thread(target=asyncio.run, args=(run(),))
+    thread.start()
+    assert ready.wait(5)
+
+    def stop() -> None:
+        loop_box["loop"].call_soon_threadsafe(loop_box["stop"].set)
+        thread.join(10)
+
+    return thread, stop
+
+
+def test_relay_forwards_and_coalesces_pings(server, tmp_path) -> None:
+    base_url = server_url(server, "")
+    address = f"unix:{tmp_path / 'relay.sock'}"
+    relay = Relay([base_url], {"max_retries": 0})
+    thread, stop = _start_relay(address, relay)
+
+    client = PingClient("abc123de", {"base_url": base_url, "http_client": RelayHttpClient(address)})
+    assert client.start()["ok"] is True
+    for seq in range(1, 100):
+        client.progress(seq)
+    client.success()
+    client.http_client.close()  # type: ignore[attr-defined]
+
+    deadline = time.monotonic() + 5
+    while relay.received < 101 and time.monotonic() < deadline:
+        time.sleep(0.01)
+    stop()
+    assert not thread.is_alive()
+    assert relay.received == 101
+    assert relay.failed == 0
+    # start, at least the final progress update, and end reach the server in order
+    assert len(server.peers) < 101
+    assert relay.coalesced == 101 - len(server.peers)
+
+
+def test_relay_rejects_unlisted_base_urls() -> None:
+    relay = Relay(["https://cronbeats.io"])
+    relay.submit(json.dumps({"u": "http://169.254.169.254/ping/abc123de", "b": None}).encode())
+    relay.submit(b"not json")
+    assert relay.rejected == 2
+    assert relay.received == 0
+
+
+def test_relay_client_raises_when_relay_is_down(tmp_path) -> None:
+    client = PingClient(
+        "abc123de",
+        {"http_client": RelayHttpClient(f"unix:{tmp_path / 'missing.sock'}"), "max_retries": 0},
+    )
+    with pytest.raises(SdkError):
+        client.ping()
+
+
+def test_socket_is_owner_only_by_default(tmp_path) -> None:
+    assert DEFAULT_RELAY_ADDRESS == f"unix:{DEFAULT_RELAY_DIR}/relay.sock"
+    path = tmp_path / "relay.sock"
+    thread, stop = _start_relay(f"unix:{path}", Relay())
+    try:
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o600
+    finally:
+        stop()
+
+    thread, stop = _start_relay(f"unix:{path}", Relay(), mode=0o660)
+    try:
+        assert stat.S_IMODE(os.stat(path).st_mode) == 0o660
+    finally:
+        stop()
+
+
+def test_refuses_to_take_over_a_live_socket(tmp_path) -> None:
+    address = f"unix:{tmp_path / 'relay.sock'}"
+    thread, stop = _start_relay(address, Relay())
+    try:
+        with pytest.raises(SdkError, match="already listening"):
+            asyncio.run(serve(address, Relay(), asyncio.Event()))
+        assert thread.is_alive()
+    finally:
+        stop()
+
+
+def test_stale_socket_is_replaced_but_other_files_are_not(tmp_path) -> None:
+    path = tmp_path / "relay.sock"
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    stale.bind(str(path))
+    stale.close()
+    thread, stop = _start_relay(f"unix:{path}", Relay())
+    stop()
+    assert not thread.is_alive()
+
+    regular = tmp_path / "not-a-socket"
+    regular.write_text("keep me")
+    with pytest.raises(SdkError, match="not a socket"):
+        asyncio.run(serve(f"unix:{regular}", Relay(), asyncio.Event()))
+    assert regular.read_text() == "keep me"
+
+
+def test_client_does_not_send_to_a_socket_owned_by_someone_else(tmp_path, stub_http_client) -> None:
+    path = tmp_path / "relay.sock"
+    impostor = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    impostor.bind(str(path))
+    impostor.setblocking(False)
+    fallback = stub_http_client()
+    try:
+        client = PingClient(
+            "abc123de",
+            {"http_client": RelayHttpClient(f"unix:{path}", fallback=fallback, owner_uid=os.getuid() + 1)},
+        )
+        assert client.ping()["ok"] is True
+        assert len(fallback.calls) == 1
+        with pytest.raises(BlockingIOError):
+            impostor.recv(65536)
+    finally:
+        impostor.close()
+
+
+def test_default_directory_must_be_private(tmp_path, monkeypatch) -> None:
+    shared = tmp_path / "shared"
+    shared.mkdir()
+    shared.chmod(0o777)
+    monkeypatch.setattr(relay_module, "DEFAULT_RELAY_DIR", str(shared))
+    with pytest.raises(SdkError, match="mode 0700"):
+        asyncio.run(serve(f"unix:{shared / 'relay.sock'}", Relay(), asyncio.Event()))
+    assert not (shared / "relay.sock").exists()
+
+    private = tmp_path / "private"
+    monkeypatch.setattr(relay_module, "DEFAULT_RELAY_DIR", str(private))
+    thread, stop = _start_relay(f"unix:{private / 'relay.sock'}", Relay())
+    try:
+        assert stat.S_IMODE(os.stat(private).st_mode) == 0o700
+    finally:
+        stop()
@@ -0,0 +1,77 @@
+import json
+
+from cronbeats_python import PingClient, PingResult
+
+BODY = json.dumps(
+    {
+        "status": "success",
+        "action": "end",
+        "job_key": "abc123de",
+        "timestamp": "2026-02-25 12:00:00",
+        "processing_time_ms": "3.5",
+        "next_expected": "2026-02-25 13:00:00",
+    }
+).encode()
+
+
+def test_result_parses_body_lazily() -> None:
+    result = PingResult("end", "abc123de", BODY)
+    assert result._raw is None
+
+    assert result.processing_time_ms == 3.5
+    assert result.next_expected == "2026-02-25 13:00:00"
+    assert result._body is None
+    assert result.raw["status"] == "success"
+
+
+def test_result_reads_like_the_old_normalized_dict(stub_http_client) -> None:
+    result = PingClient("abc123de", {"http_client": stub_http_client(body=BODY)}).success()
+
+    assert isinstance(result, PingResult)
+    assert result["ok"] is True
+    assert result["action"] == "end"
+    assert result["jobKey"] == "abc123de"
+    assert result["processingTimeMs"] == 3.5
+    assert result.get("missing") is None
+    assert dict(result) == {
+        "ok": True,
+        "action": "end",
+        "jobKey": "abc123de",
+        "timestamp": "2026-02-25 12:00:00",
+        "processingTimeMs": 3.5,
+        "nextExpected": "2026-02-25 13:00:00",
+        "raw": json.loads(BODY),
+    }
+
+
+def test_to_dict_is_json_serializable(stub_http_client) -> None:
+    result = PingClient("abc123de", {"http_client": stub_http_client(body=BODY)}).success()
+
+    assert not isinstance(result, dict)
+    assert json.loads(json.dumps(result.to_dict()))["nextExpected"] == "2026-02-25 13:00:00"
+
+
+def test_invalid_and_empty_bodies_fall_back_to_defaults() -> None:
+    assert PingResult("ping", "abc123de", b"not json").raw == {"message": "Invalid JSON response"}
+    empty = PingResult("ping", "abc123de", b"")
+    assert empty.action == "ping"
+    assert empty.timestamp == ""
+    assert empty.next_expected is None
+
+
+def test_local_result_flags_are_exposed() -> None:
+    result = PingResult("progress", "abc123de", ok=False, flags={"queued": False, "skipped": True})
+    assert result["ok"] is False
+    assert result["skipped"] is True and result.skipped is True
+    assert result.queued is False
+    assert "skipped" in result and len(result) == 9
+
+
+def test_return_result_false_drops_success_bodies(stub_http_client) -> None:
+    client = PingClient("abc123de", {"http_client": stub_http_client(body=BODY), "return_result": False})
+    result = client.end("fail")
+
+    assert result.ok is True
+    assert result._body is None
+    assert result.raw == {}
+    assert result.action == "end"
@@ -0,0 +1,84 @@
+import threading
+
+import pytest
+
+from cronbeats_python import ApiError, PingClient
+from cronbeats_python.background import BackgroundSender
+from cronbeats_python.http import HttpResponse
+from cronbeats_python.stats import ClientStats, LatencyHistogram, global_stats
+
+
+def test_histogram_percentiles_are_within_bucket_precision() -> None:
+    histogram = LatencyHistogram()
+    for value in range(1, 10001):
+        histogram.record(value)
+
+    assert histogram.count == 10000
+    assert histogram.min == 1 and histogram.max == 10000
+    assert abs(histogram.percentile(50) - 5000) / 5000 < 0.07
+    assert abs(histogram.percentile(99) - 9900) / 9900 < 0.07
+    assert histogram.percentile(100) == 10000
+
+
+def test_histogram_clamps_huge_values() -> None:
+    histogram = LatencyHistogram()
+    histogram.record(10**12)
+    assert histogram.count == 1
+    assert histogram.max == 10**12
+    assert histogram.percentile(50) == (1 << 27) - 1
+
+
+def test_client_stats_count_attempts_retries_and_statuses(stub_http_client, fast_client) -> None:
+    client = fast_client(stub_http_client([None, 503, 200, 404]))
+    client.ping()
+    with pytest.raises(ApiError):
+        client.start()
+
+    snapshot = client.stats()
+    assert snapshot["requests"] == 2
+    assert snapshot["failures"] == 1
+    assert snapshot["attempts"] == 4
+    assert snapshot["retries"] == 2
+    assert snapshot["network_errors"] == 1
+    assert snapshot["status_codes"] == {503: 1, 200: 1, 404: 1}
+    assert snapshot["latency"]["ping"]["count"] == 1
+    assert snapshot["latency"]["start"]["count"] == 1
+    assert snapshot["latency"]["end"]["count"] == 0
+
+
+def test_throttled_and_dropped_events_are_counted(fast_client) -> None:
+    gate = threading.Event()
+
+    class GatedHttpClient:
+        def request(self, method, url, headers, body, timeout_ms):  # noqa: ANN001
+            gate.wait(5)
+            return HttpResponse(status=200, body="{}", headers={})
+
+    sender = BackgroundSender(queue_size=1, overflow="drop_newest", coalesce_progress=False)
+    client = fast_client(GatedHttpClient(), sender=sender, progress_min_interval_ms=60000)
+    client.start()
+    client.progress(10)
+    client.progress(20)
+    for _ in range(3):
+        client.ping()
+    gate.set()
+    assert client.close(5)
+
+    snapshot = client.stats()
+    assert snapshot["throttled"] == 1
+    assert snapshot["dropped"] >= 2
+
+
+def test_global_stats_aggregate_all_clients(stub_http_client, fast_client) -> None:
+    shared = ClientStats()
+    first = fast_client(stub_http_client(), stats=shared)
+    second = PingClient("zyx987wv", {"http_client": stub_http_client(), "stats": shared})
+    first.ping()
+    second.ping()
+    fast_client(stub_http_client()).end()
+
+    assert shared.snapshot()["requests"] == 2
+    totals = global_stats()
+    assert totals["requests"] == 3
+    assert totals["latency"]["ping"]["count"] == 2
+    assert totals["latency"]["end"]["count"] == 1
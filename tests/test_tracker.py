@@ -0,0 +1,132 @@
+import asyncio
+import json
+import time
+from typing import List, Tuple
+
+from cronbeats_python import AsyncPingClient, PingClient
+
+
+def _reports(stub) -> List[Tuple[str, str]]:
+    return [(call["url"].split("/ping/abc123de", 1)[1], json.loads(call["body"])["message"]) for call in stub.calls]
+
+
+def _slow(items: List[int], delay: float):  # noqa: ANN202
+    for item in items:
+        time.sleep(delay)
+        yield item
+
+
+def test_track_reports_percentage_when_length_is_known(stub_http_client) -> None:
+    stub = stub_http_client()
+    client = PingClient("abc123de", {"http_client": stub})
+
+    tracked = client.track(list(range(1000)), every_ms=60_000)
+    assert len(tracked) == 1000
+    assert sum(tracked) == sum(range(1000))
+
+    # Only the final update: the throttle never fired inside the loop.
+    assert tracked.count == 1000
+    reports = _reports(stub)
+    assert reports == [("/progress/100", reports[0][1])]
+    assert reports[0][1].startswith("1000/1000 (")
+
+
+def test_track_throttles_by_time_and_uses_total(stub_http_client) -> None:
+    stub = stub_http_client()
+    client = PingClient("abc123de", {"http_client": stub})
+
+    items = list(client.track(_slow(list(range(40)), 0.005), total=40, every_ms=50))
+
+    assert items == list(range(40))
+    assert 2 <= len(stub.calls) <= 8
+    seqs = [int(path.rsplit("/", 1)[1]) for path, _ in _reports(stub)]
+    assert seqs == sorted(seqs) and seqs[-1] == 100
+
+
+def test_track_keeps_reporting_when_a_fast_loop_turns_slow(stub_http_client) -> None:
+    stub = stub_http_client()
+    client = PingClient("abc123de", {"http_client": stub})
+    calls_before_slow_phase = []
+
+    def phases():  # noqa: ANN202
+        yield from range(200_000)
+        calls_before_slow_phase.append(len(stub.calls))
+        yield from _slow(list(range(600)), 0.001)
+
+    tracked = client.track(phases(), every_ms=100)
+    for _ in tracked:
+        pass
+
+    # ~0.6 s of slow items at every_ms=100, minus the final report.
+    assert len(stub.calls) - 1 - calls_before_slow_phase[0] >= 3
+
+
+def test_track_unknown_length_sends_message_only_updates(stub_http_client) -> None:
+    stub = stub_http_client()
+    client = PingClient("abc123de", {"http_client": stub})
+
+    tracked = client.track((n for n in range(250)), every_ms=60_000)
+    for _ in tracked:
+        pass
+
+    path, message = _reports(stub)[-1]
+    assert path == "/progress"
+    assert message.startswith("250 items (")
+
+
+def test_track_keeps_telemetry_errors_out_of_the_loop(stub_http_client) -> None:
+    stub = stub_http_client(status=400)
+    client = PingClient("abc123de", {"http_client": stub, "max_retries": 0})
+
+    tracked = client.track(range(10), every_ms=0)
+    assert list(tracked) == list(range(10))
+    assert tracked.error is not None
+
+
+def test_track_break_sends_nothing_more(stub_http_client) -> None:
+    stub = stub_http_client()
+    client = PingClient("abc123de", {"http_client": stub})
+
+    tracked = client.track(range(100), every_ms=60_000)
+    for item in tracked:
+        if item == 9:
+            break
+
+    assert tracked.count == 9
+    assert stub.calls == []
+
+
+def test_track_per_item_overhead_is_small(stub_http_client) -> None:
+    client = PingClient("abc123de", {"http_client": stub_http_client()})
+    data = range(300_000)
+
+    def timed(iterable) -> float:  # noqa: ANN001
+        started = time.perf_counter()
+        for _ in iterable:
+            pass
+        return time.perf_counter() - started
+
+    bare = min(timed(data) for _ in range(3))
+    tracked = min(timed(client.track(data, every_ms=60_000)) for _ in range(3))
+
+    # The benchmark targets < 100 ns/item; this bound only catches an accidental per-item call.
+    assert (tracked - bare) / len(data) < 1e-6
+
+
+def test_async_track_over_sync_and_async_iterables(async_stub_http_client) -> None:
+    stub = async_stub_http_client()
+    client = AsyncPingClient("abc123de", {"http_client": stub})
+
+    async def numbers():  # noqa: ANN202
+        for n in range(50):
+            yield n
+
+    async def main() -> tuple:
+        first = [item async for item in client.track(range(20), every_ms=60_000)]
+        second = [item async for item in client.track(numbers(), every_ms=60_000)]
+        return first, second
+
+    first, second = asyncio.run(main())
+    assert first == list(range(20))
+    assert second == list(range(50))
+    assert [path for path, _ in _reports(stub)] == ["/progress/100", "/progress"]
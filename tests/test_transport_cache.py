@@ -0,0 +1,65 @@
+import asyncio
+import socket
+import time
+
+from conftest import server_url
+
+from cronbeats_python import PingClient
+from cronbeats_python.async_http import AsyncioHttpClient
+from cronbeats_python.http import PooledHttpClient
+from cronbeats_python.transport_cache import DnsCache, shared_dns_cache, shared_ssl_context
+
+
+def test_ssl_contexts_are_shared_per_configuration() -> None:
+    assert shared_ssl_context() is shared_ssl_context()
+    assert shared_ssl_context(verify=False) is not shared_ssl_context()
+    assert PooledHttpClient()._get_ssl_context() is AsyncioHttpClient()._get_ssl_context()
+
+
+def test_dns_cache_respects_ttl(monkeypatch) -> None:
+    calls = []
+    real = socket.getaddrinfo
+
+    def counting(host, port, *args, **kwargs):  # noqa: ANN001
+        calls.append(host)
+        return real(host, port, *args, **kwargs)
+
+    monkeypatch.setattr(socket, "getaddrinfo", counting)
+    cache = DnsCache(ttl_s=0.05)
+    first = cache.resolve("127.0.0.1", 80)
+    assert cache.resolve("127.0.0.1", 80) is first
+    assert len(calls) == 1
+
+    time.sleep(0.06)
+    cache.resolve("127.0.0.1", 80)
+    assert len(calls) == 2
+
+    cache.invalidate("127.0.0.1", 80)
+    cache.resolve("127.0.0.1", 80)
+    assert len(calls) == 3
+
+
+def test_clients_share_resolution_across_transports(server, monkeypatch) -> None:
+    calls = []
+    real = socket.getaddrinfo
+
+    def counting(host, port, *args, **kwargs):  # noqa: ANN001
+        calls.append(host)
+        return real(host, port, *args, **kwargs)
+
+    monkeypatch.setattr(socket, "getaddrinfo", counting)
+    base_url = server_url(server, "")
+    for job_key in ("abc123de", "zyx987wv", "qwe456rt"):
+        # Separate pools force new connections, but the address is resolved only once.
+        PingClient(job_key, {"base_url": base_url, "http_client": PooledHttpClient()}).ping()
+
+    async def run_async() -> None:
+        transport = AsyncioHttpClient()
+        from cronbeats_python import AsyncPingClient
+
+        await AsyncPingClient("abc123de", {"base_url": base_url, "http_client": transport}).ping()
+        await transport.aclose()
+
+    asyncio.run(run_async())
+    assert len(calls) == 1
+    assert shared_dns_cache().lookup("127.0.0.1", server.server_address[1]) is not None